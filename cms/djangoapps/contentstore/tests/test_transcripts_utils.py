@@ -9,6 +9,7 @@ import unittest
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 from django.utils import translation
 from mock import Mock, patch
@@ -387,6 +388,29 @@ class TestGenerateSubsFromSource(TestDownloadYoutubeSubs):
 
         self.clear_subs_content(youtube_subs)
 
+    def test_prebuild_once_all_speeds_are_saved(self):
+        youtube_subs = {
+            0.5: 'JMD_ifUUfsU',
+            1.0: 'hI10vDNYz4M',
+            2.0: 'AKqURZnYqpk'
+        }
+        srt_filedata = textwrap.dedent("""
+            1
+            00:00:10,500 --> 00:00:13,000
+            Elephant's Dream
+        """)
+        self.clear_subs_content(youtube_subs)
+
+        with patch.object(transcripts_utils.Transcript, 'prebuild') as mock_prebuild:
+            transcripts_utils.generate_subs_from_source(youtube_subs, 'srt', srt_filedata, self.course)
+
+        content_location = StaticContent.compute_location(self.course.id, 'subs_hI10vDNYz4M.srt.sjson')
+        mock_prebuild.assert_called_once_with(
+            contentstore().find(content_location).data, transcripts_utils.Transcript.SJSON
+        )
+
+        self.clear_subs_content(youtube_subs)
+
     def test_fail_bad_subs_type(self):
         youtube_subs = {
             0.5: 'JMD_ifUUfsU',
@@ -640,6 +664,42 @@ class TestTranscript(unittest.TestCase):
         with self.assertRaises(transcripts_utils.TranscriptsGenerationException):
             transcripts_utils.Transcript.convert(invalid_srt_transcript, 'srt', 'sjson')
 
+    def test_convert_sjson_speed(self):
+        """
+        Tests that the sjson transcript timings are scaled to the requested speed.
+        """
+        actual = transcripts_utils.Transcript.convert(self.sjson_transcript, 'sjson', 'sjson', speed=1.5)
+        self.assertDictEqual(
+            json.loads(actual),
+            {
+                u'start': [15750, 22500],
+                u'end': [19500, 27000],
+                u'text': [u'Elephant&#39;s Dream', u'At the left we can see...'],
+            }
+        )
+
+    def test_convert_is_cached(self):
+        """
+        Tests that converted transcripts are cached by content and prebuilt ones are not converted again.
+        """
+        cache.clear()
+        with patch.object(
+            transcripts_utils.Transcript, '_convert', wraps=transcripts_utils.Transcript._convert
+        ) as mock_convert:
+            for _ in range(2):
+                self.assertEqual(
+                    transcripts_utils.Transcript.convert(self.srt_transcript, 'srt', 'txt'), self.txt_transcript
+                )
+            self.assertEqual(mock_convert.call_count, 1)
+
+            transcripts_utils.Transcript.prebuild(self.sjson_transcript, 'sjson')
+            mock_convert.reset_mock()
+            self.assertEqual(
+                transcripts_utils.Transcript.convert(self.sjson_transcript, 'sjson', 'srt'), self.srt_transcript
+            )
+            transcripts_utils.Transcript.convert(self.sjson_transcript, 'sjson', 'sjson', speed=0.75)
+            self.assertFalse(mock_convert.called)
+
     def test_dummy_non_existent_transcript(self):
         """
         Test `Transcript.asset` raises `NotFoundError` for dummy non-existent transcript.
@@ -30,7 +30,7 @@ from student.auth import (
     has_studio_read_access,
     has_studio_write_access
 )
-from student.roles import CourseInstructorRole, CourseStaffRole, LibraryUserRole
+from student.roles import CourseInstructorRole, CourseStaffRole, LibraryUserRole, get_course_role_users
 from util.json_request import JsonResponse, JsonResponseBadRequest, expect_json
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
@@ -245,9 +245,12 @@ def manage_library_users(request, library_key_string):
         raise Http404
 
     # Segment all the users explicitly associated with this library, ensuring each user only has one role listed:
-    instructors = set(CourseInstructorRole(library_key).users_with_role())
-    staff = set(CourseStaffRole(library_key).users_with_role()) - instructors
-    users = set(LibraryUserRole(library_key).users_with_role()) - instructors - staff
+    users_by_role = get_course_role_users(
+        [library_key], [CourseInstructorRole.ROLE, CourseStaffRole.ROLE, LibraryUserRole.ROLE]
+    )
+    instructors = set(users_by_role[(library_key, CourseInstructorRole.ROLE)])
+    staff = set(users_by_role[(library_key, CourseStaffRole.ROLE)]) - instructors
+    users = set(users_by_role[(library_key, LibraryUserRole.ROLE)]) - instructors - staff
 
     formatted_users = []
     for user in instructors:
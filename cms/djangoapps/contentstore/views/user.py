@@ -13,7 +13,7 @@ from edxmako.shortcuts import render_to_response
 from student import auth
 from student.auth import STUDIO_EDIT_ROLES, STUDIO_VIEW_USERS, get_user_permissions
 from student.models import CourseEnrollment
-from student.roles import CourseInstructorRole, CourseStaffRole, LibraryUserRole
+from student.roles import CourseInstructorRole, CourseStaffRole, LibraryUserRole, get_course_role_users
 from util.json_request import JsonResponse, expect_json
 from xmodule.modulestore.django import modulestore
 
@@ -76,9 +76,10 @@ def _manage_users(request, course_key):
         raise PermissionDenied()
 
     course_module = modulestore().get_course(course_key)
-    instructors = set(CourseInstructorRole(course_key).users_with_role())
+    users_by_role = get_course_role_users([course_key], [CourseInstructorRole.ROLE, CourseStaffRole.ROLE])
+    instructors = set(users_by_role[(course_key, CourseInstructorRole.ROLE)])
     # the page only lists staff and assumes they're a superset of instructors. Do a union to ensure.
-    staff = set(CourseStaffRole(course_key).users_with_role()).union(instructors)
+    staff = set(users_by_role[(course_key, CourseStaffRole.ROLE)]).union(instructors)
 
     formatted_users = []
     for user in instructors:
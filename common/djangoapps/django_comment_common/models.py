@@ -145,13 +145,22 @@ def all_permissions_for_user_in_course(user, course_id):  # pylint: disable=inva
     if course is None:
         raise ItemNotFoundError(course_id)
 
-    all_roles = {role.name for role in Role.objects.filter(users=user, course_id=course_id)}
+    # The roles and their permissions are read together with a single
+    # (outer) join, so that roles without any permission still count.
+    role_permissions = Role.objects.filter(
+        users=user, course_id=course_id
+    ).values_list('name', 'permissions__name')
+    all_roles = set()
+    all_permissions = set()
+    for role_name, permission_name in role_permissions:
+        all_roles.add(role_name)
+        if permission_name is not None:
+            all_permissions.add(permission_name)
 
     permissions = {
-        permission.name
-        for permission
-        in Permission.objects.filter(roles__users=user, roles__course_id=course_id)
-        if not permission_blacked_out(course, all_roles, permission.name)
+        permission_name
+        for permission_name in all_permissions
+        if not permission_blacked_out(course, all_roles, permission_name)
     }
     return permissions
 
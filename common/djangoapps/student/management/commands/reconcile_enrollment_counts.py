@@ -0,0 +1,60 @@
+"""
+Command to recompute the maintained enrollment counts of courses.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from student.models import CourseEnrollmentModeCount
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the enrollment counts of the given courses from their
+    enrollments. The counts are kept up to date as enrollments are saved, so
+    this only repairs drift from enrollments changed in bulk; run it
+    periodically, e.g. nightly, for all courses.
+
+    Example usage:
+        $ ./manage.py lms reconcile_enrollment_counts --all --settings=devstack
+        $ ./manage.py lms reconcile_enrollment_counts 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    args = u'<course_id course_id ...>'
+    help = u'Recomputes the enrollment counts of one or more courses.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            'course_ids',
+            nargs='*',
+            help=u'Ids of the courses whose enrollment counts to recompute.',
+        )
+        parser.add_argument(
+            '--all',
+            dest='all_courses',
+            action='store_true',
+            help=u'Recompute the enrollment counts of all courses.',
+        )
+
+    def handle(self, *args, **options):
+        if options['all_courses']:
+            course_keys = CourseOverview.get_all_course_keys()
+        elif options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(u'Invalid course_key: {}.'.format(text_type(error)))
+        else:
+            raise CommandError(u'At least one course or --all must be specified.')
+
+        for course_key in course_keys:
+            counts = CourseEnrollmentModeCount.reconcile(course_key)
+            log.info(u'Recomputed enrollment counts of course %s: %s', text_type(course_key), counts)
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from opaque_keys.edx.django.models import CourseKeyField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0016_coursenrollment_course_on_delete_do_nothing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseEnrollmentModeCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', CourseKeyField(max_length=255, db_index=True)),
+                ('mode', models.CharField(max_length=100)),
+                ('count', models.IntegerField(default=0)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='courseenrollmentmodecount',
+            unique_together=set([('course_id', 'mode')]),
+        ),
+    ]
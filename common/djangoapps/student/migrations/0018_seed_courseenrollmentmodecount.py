@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.db.models import Count
+
+SEED_BATCH_SIZE = 1000
+
+
+def seed_enrollment_mode_counts(apps, schema_editor):
+    CourseEnrollment = apps.get_model('student', 'CourseEnrollment')
+    CourseEnrollmentModeCount = apps.get_model('student', 'CourseEnrollmentModeCount')
+    rows = CourseEnrollment.objects.filter(
+        is_active=True,
+    ).values('course_id', 'mode').order_by().annotate(count=Count('id'))
+    CourseEnrollmentModeCount.objects.all().delete()
+    CourseEnrollmentModeCount.objects.bulk_create(
+        (CourseEnrollmentModeCount(**row) for row in rows.iterator()),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+
+def remove_enrollment_mode_counts(apps, schema_editor):
+    CourseEnrollmentModeCount = apps.get_model('student', 'CourseEnrollmentModeCount')
+    CourseEnrollmentModeCount.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0017_courseenrollmentmodecount'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_enrollment_mode_counts, remove_enrollment_mode_counts),
+    ]
@@ -31,7 +31,7 @@ from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.db import IntegrityError, models, transaction
-from django.db.models import Count, Q
+from django.db.models import Count, F, Q
 from django.db.models.signals import post_save, pre_save
 from django.db.utils import ProgrammingError
 from django.dispatch import receiver
@@ -66,10 +66,10 @@ from openedx.core.djangoapps.request_cache import clear_cache, get_cache
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.djangoapps.xmodule_django.models import NoneToEmptyManager
 from openedx.core.djangolib.model_mixins import DeletableByUserValue
+from openedx.core.lib.cache_utils import LRUCache
 from track import contexts
 from util.milestones_helpers import is_entrance_exams_enabled
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
-from util.query import use_read_replica_if_available
 from edraak_marketing_email.models import UnsubscribedUser
 
 log = logging.getLogger(__name__)
@@ -119,6 +119,12 @@ TRANSITION_STATES = (
 )
 
 
+# Anonymous ids whose AnonymousUserId objects are known to be saved, so
+# that this process does not look them up again.
+ANONYMOUS_ID_CACHE_SIZE = 50000
+_saved_anonymous_ids = LRUCache(ANONYMOUS_ID_CACHE_SIZE)
+
+
 class AnonymousUserId(models.Model):
     """
     This table contains user, course_Id and anonymous_user_id
@@ -136,7 +142,7 @@ class AnonymousUserId(models.Model):
     course_id = CourseKeyField(db_index=True, max_length=255, blank=True)
 
 
-def anonymous_id_for_user(user, course_id, save=True):
+def anonymous_id_for_user(user, course_id, save=True, defer_save=False):
     """
     Return a unique id for a (user, course) pair, suitable for inserting
     into e.g. personalized survey links.
@@ -145,6 +151,11 @@ def anonymous_id_for_user(user, course_id, save=True):
 
     Keyword arguments:
     save -- Whether the id should be saved in an AnonymousUserId object.
+    defer_save -- Whether a missing AnonymousUserId object should be saved
+        by a background task instead, so that request-path callers do not
+        write to the database. Only for callers that never need to resolve
+        the id back to its user with `user_by_anonymous_id`, since the
+        object does not exist until the task runs.
     """
     # This part is for ability to get xblock instance in xblock_noauth handlers, where user is unauthenticated.
     assert user
@@ -169,23 +180,111 @@ def anonymous_id_for_user(user, course_id, save=True):
 
     user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
 
-    if save is False:
+    if save is False or _is_anonymous_id_saved(digest):
+        return digest
+
+    if defer_save:
+        # The id is only marked as saved once the task has saved it, so that
+        # this process checks again if the task is lost.
+        # importing here to avoid circular imports
+        from student.tasks import save_anonymous_user_ids
+        save_anonymous_user_ids.delay([(user.id, digest)], text_type(course_id) if course_id else None)
         return digest
 
     try:
-        AnonymousUserId.objects.get_or_create(
-            user=user,
-            course_id=course_id,
-            anonymous_user_id=digest,
-        )
+        with transaction.atomic():
+            AnonymousUserId.objects.create(
+                user=user,
+                course_id=course_id,
+                anonymous_user_id=digest,
+            )
     except IntegrityError:
         # Another thread has already created this entry, so
         # continue
         pass
 
+    _saved_anonymous_ids.set(digest, True)
     return digest
 
 
+def _is_anonymous_id_saved(anonymous_id):
+    """
+    Returns whether the AnonymousUserId object of the given id is saved,
+    checking the database only if this process does not know it yet.
+    """
+    if _saved_anonymous_ids.get(anonymous_id):
+        return True
+    if AnonymousUserId.objects.filter(anonymous_user_id=anonymous_id).exists():
+        _saved_anonymous_ids.set(anonymous_id, True)
+        return True
+    return False
+
+
+def anonymous_ids_for_users(users, course_id, save=True):
+    """
+    Return the unique ids of several users for a course, as a dict
+    mapping user ids to anonymous ids.
+
+    The AnonymousUserId objects that are missing are created together,
+    instead of one at a time as `anonymous_id_for_user` does.
+
+    Keyword arguments:
+    save -- Whether the ids should be saved in AnonymousUserId objects.
+    """
+    anonymous_ids = {
+        user.id: anonymous_id_for_user(user, course_id, save=False)
+        for user in users if not user.is_anonymous
+    }
+    if not save:
+        return anonymous_ids
+
+    save_anonymous_ids(anonymous_ids.items(), course_id)
+    return anonymous_ids
+
+
+def save_anonymous_ids(anonymous_ids, course_id):
+    """
+    Save the AnonymousUserId objects of the given (user id, anonymous id)
+    pairs for a course that are not saved yet, creating them together.
+    """
+    unsaved_ids = [
+        (user_id, anonymous_id)
+        for user_id, anonymous_id in anonymous_ids
+        if not _saved_anonymous_ids.get(anonymous_id)
+    ]
+    if not unsaved_ids:
+        return
+
+    saved_ids = set(AnonymousUserId.objects.filter(
+        anonymous_user_id__in=[anonymous_id for __, anonymous_id in unsaved_ids],
+    ).values_list('anonymous_user_id', flat=True))
+    missing_rows = [
+        AnonymousUserId(user_id=user_id, course_id=course_id, anonymous_user_id=anonymous_id)
+        for user_id, anonymous_id in unsaved_ids
+        if anonymous_id not in saved_ids
+    ]
+    if missing_rows:
+        try:
+            with transaction.atomic():
+                AnonymousUserId.objects.bulk_create(missing_rows)
+        except IntegrityError:
+            # Another thread has already created some of these entries,
+            # so create the others one at a time
+            for row in missing_rows:
+                try:
+                    with transaction.atomic():
+                        AnonymousUserId.objects.get_or_create(
+                            user_id=row.user_id,
+                            course_id=course_id,
+                            anonymous_user_id=row.anonymous_user_id,
+                        )
+                except IntegrityError:
+                    pass
+
+    for __, anonymous_id in unsaved_ids:
+        _saved_anonymous_ids.set(anonymous_id, True)
+
+
 def user_by_anonymous_id(uid):
     """
     Return user by anonymous_user_id using AnonymousUserId lookup table.
@@ -1127,6 +1226,12 @@ class AlreadyEnrolledError(CourseEnrollmentException):
     pass
 
 
+# Cache key format and timeout, in seconds, of the enrollment counts of a
+# course shown on course about pages and the instructor dashboard.
+ENROLLMENT_COUNTS_CACHE_KEY = u'student.enrollment_counts.{}'
+ENROLLMENT_COUNTS_CACHE_TIMEOUT = 60
+
+
 class CourseEnrollmentManager(models.Manager):
     """
     Custom manager for CourseEnrollment with Table-level filter methods.
@@ -1138,13 +1243,7 @@ class CourseEnrollmentManager(models.Manager):
 
         'course_id' is the course_id to return enrollments
         """
-
-        enrollment_number = super(CourseEnrollmentManager, self).get_queryset().filter(
-            course_id=course_id,
-            is_active=1
-        ).count()
-
-        return enrollment_number
+        return sum(CourseEnrollmentModeCount.get_counts(course_id).itervalues())
 
     def num_enrolled_in_exclude_admins(self, course_id):
         """
@@ -1168,10 +1267,14 @@ class CourseEnrollmentManager(models.Manager):
         admins = CourseInstructorRole(course_locator).users_with_role()
         coaches = CourseCcxCoachRole(course_locator).users_with_role()
 
-        return super(CourseEnrollmentManager, self).get_queryset().filter(
+        # The few enrollments of course team members are counted from the
+        # enrollment table and subtracted from the maintained total.
+        num_enrolled_admins = super(CourseEnrollmentManager, self).get_queryset().filter(
+            Q(user__in=staff) | Q(user__in=admins) | Q(user__in=coaches),
             course_id=course_id,
             is_active=1,
-        ).exclude(user__in=staff).exclude(user__in=admins).exclude(user__in=coaches).count()
+        ).count()
+        return self.num_enrolled_in(course_id) - num_enrolled_admins
 
     def is_course_full(self, course):
         """
@@ -1201,17 +1304,23 @@ class CourseEnrollmentManager(models.Manager):
         """
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
-        """
-        # Unfortunately, Django's "group by"-style queries look super-awkward
-        query = use_read_replica_if_available(
-            super(CourseEnrollmentManager, self).get_queryset().filter(course_id=course_id, is_active=True).values(
-                'mode').order_by().annotate(Count('mode')))
-        total = 0
-        enroll_dict = defaultdict(int)
-        for item in query:
-            enroll_dict[item['mode']] = item['mode__count']
-            total += item['mode__count']
-        enroll_dict['total'] = total
+
+        The counts are read from the maintained CourseEnrollmentModeCount rows
+        and cached for ENROLLMENT_COUNTS_CACHE_TIMEOUT seconds, so they may lag
+        behind the latest enrollments by that long.
+        """
+        cache_key = ENROLLMENT_COUNTS_CACHE_KEY.format(text_type(course_id))
+        counts = cache.get(cache_key)
+        if counts is None:
+            counts = {
+                mode: count
+                for mode, count in CourseEnrollmentModeCount.get_counts(course_id).iteritems()
+                if count
+            }
+            cache.set(cache_key, counts, ENROLLMENT_COUNTS_CACHE_TIMEOUT)
+
+        enroll_dict = defaultdict(int, counts)
+        enroll_dict['total'] = sum(counts.itervalues())
         return enroll_dict
 
     def enrolled_and_dropped_out_users(self, course_id):
@@ -1221,6 +1330,10 @@ class CourseEnrollmentManager(models.Manager):
         )
 
 
+# Number of enrollment states stored in the django cache with each multi-set
+# when the enrollment states of a whole course are loaded.
+ENROLLMENT_STATE_CACHE_CHUNK_SIZE = 1000
+
 # Named tuple for fields pertaining to the state of
 # CourseEnrollment for a user in a course.  This type
 # is used to cache the state in the request cache.
@@ -1272,8 +1385,19 @@ class CourseEnrollment(models.Model):
 
     objects = CourseEnrollmentManager()
 
-    # cache key format e.g enrollment.<username>.<course_key>.mode = 'honor'
-    COURSE_ENROLLMENT_CACHE_KEY = u"enrollment.{}.{}.mode"  # TODO Can this be removed?  It doesn't seem to be used.
+    # Cache key format of the enrollment states kept in the django cache,
+    # e.g. enrollment.<user_id>.<course_key>.<version>.mode = ('honor', True)
+    COURSE_ENROLLMENT_CACHE_KEY = u"enrollment.{}.{}.{}.mode"
+
+    # Cache key format of the current version of the enrollment states of a
+    # course. The version is dropped whenever an enrollment of the course is
+    # saved or deleted, so that states read from the database before the
+    # change, and stored after it, are kept under a version no one reads.
+    COURSE_ENROLLMENT_CACHE_VERSION_KEY = u"enrollment.{}.version"
+
+    # Number of seconds enrollment states are kept in the django cache. This
+    # bounds the staleness of changes made without the model's signals.
+    ENROLLMENT_STATE_CACHE_TIMEOUT = 60 * 5
 
     MODE_CACHE_NAMESPACE = u'CourseEnrollment.mode_and_active'
 
@@ -1288,18 +1412,39 @@ class CourseEnrollment(models.Model):
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
 
+        # The (mode, is_active) state of this enrollment as counted in the
+        # CourseEnrollmentModeCount rows, i.e. as last loaded or saved.
+        self._counted_state = (self.mode, self.is_active) if self.pk else (None, False)
+
     def __unicode__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
         ).format(self.user, self.course_id, self.created, self.is_active)
 
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
-        super(CourseEnrollment, self).save(force_insert=force_insert, force_update=force_update, using=using,
-                                           update_fields=update_fields)
+        with transaction.atomic():
+            super(CourseEnrollment, self).save(force_insert=force_insert, force_update=force_update, using=using,
+                                               update_fields=update_fields)
+            self._update_mode_counts((self.mode, self.is_active))
 
         # Delete the cached status hash, forcing the value to be recalculated the next time it is needed.
         cache.delete(self.enrollment_status_hash_cache_key(self.user))
 
+    def _update_mode_counts(self, new_state):
+        """
+        Updates the CourseEnrollmentModeCount rows of the course from the
+        counted state of this enrollment to the given (mode, is_active)
+        state.
+        """
+        (old_mode, was_active), (new_mode, is_active) = self._counted_state, new_state
+        deltas = defaultdict(int)
+        if was_active:
+            deltas[old_mode] -= 1
+        if is_active:
+            deltas[new_mode] += 1
+        CourseEnrollmentModeCount.update_counts(self.course_id, deltas)
+        self._counted_state = new_state
+
     @classmethod
     def get_or_create_enrollment(cls, user, course_key):
         """
@@ -2076,16 +2221,42 @@ class CourseEnrollment(models.Model):
         )
 
     @classmethod
-    def cache_key_name(cls, user_id, course_key):
+    def cache_key_name(cls, user_id, course_key, version):
         """Return cache key name to be used to cache current configuration.
         Args:
             user_id(int): Id of user.
             course_key(unicode): Unicode of course key
+            version(unicode): Version of the enrollment states of the course
 
         Returns:
             Unicode cache key
         """
-        return cls.COURSE_ENROLLMENT_CACHE_KEY.format(user_id, text_type(course_key))
+        return cls.COURSE_ENROLLMENT_CACHE_KEY.format(user_id, text_type(course_key), version)
+
+    @classmethod
+    def cache_version_key_name(cls, course_key):
+        """
+        Returns the cache key of the version of the enrollment states of the
+        given course.
+        """
+        return cls.COURSE_ENROLLMENT_CACHE_VERSION_KEY.format(text_type(course_key))
+
+    @classmethod
+    def _get_enrollment_state_cache_version(cls, course_key):
+        """
+        Returns the current version of the enrollment states of the given
+        course in the django cache, starting a new one if there is none.
+
+        The version must be read before the states are read from the
+        database, so that states stored after an invalidation are not read.
+        """
+        version_key = cls.cache_version_key_name(course_key)
+        version = cache.get(version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(version_key, version, cls.ENROLLMENT_STATE_CACHE_TIMEOUT):
+                version = cache.get(version_key) or version
+        return version
 
     @classmethod
     def _get_enrollment_state(cls, user, course_key):
@@ -2099,14 +2270,56 @@ class CourseEnrollment(models.Model):
             return CourseEnrollmentState(None, None)
         enrollment_state = cls._get_enrollment_in_request_cache(user, course_key)
         if not enrollment_state:
-            try:
-                record = cls.objects.get(user=user, course_id=course_key)
-                enrollment_state = CourseEnrollmentState(record.mode, record.is_active)
-            except cls.DoesNotExist:
-                enrollment_state = CourseEnrollmentState(None, None)
-            cls._update_enrollment_in_request_cache(user, course_key, enrollment_state)
+            enrollment_state = cls.get_enrollment_states([user], course_key)[user.id]
         return enrollment_state
 
+    @classmethod
+    def get_enrollment_states(cls, users, course_key):
+        """
+        Returns a dict mapping the id of each of the given users to their
+        CourseEnrollmentState in the given course.
+
+        States are looked up in the request cache, then with a single
+        multi-get in the django cache, and the remaining ones with a single
+        query. Users who are not enrolled get CourseEnrollmentState(None, None),
+        which is cached like any other state.
+        """
+        request_cache = cls._get_mode_active_request_cache()
+        enrollment_states = {}
+        missing_user_ids = set()
+        for user in users:
+            enrollment_state = request_cache.get((user.id, course_key))
+            if enrollment_state:
+                enrollment_states[user.id] = enrollment_state
+            else:
+                missing_user_ids.add(user.id)
+        if not missing_user_ids:
+            return enrollment_states
+
+        version = cls._get_enrollment_state_cache_version(course_key)
+        cache_keys = {cls.cache_key_name(user_id, course_key, version): user_id for user_id in missing_user_ids}
+        uncached_user_ids = set(missing_user_ids)
+        for cache_key, cached_state in cache.get_many(cache_keys.keys()).iteritems():
+            user_id = cache_keys[cache_key]
+            enrollment_states[user_id] = CourseEnrollmentState(*cached_state)
+            uncached_user_ids.discard(user_id)
+
+        if uncached_user_ids:
+            fetched_states = {
+                user_id: CourseEnrollmentState(mode, is_active)
+                for user_id, mode, is_active in cls.objects.filter(
+                    user_id__in=uncached_user_ids, course_id=course_key,
+                ).values_list('user_id', 'mode', 'is_active')
+            }
+            for user_id in uncached_user_ids:
+                fetched_states.setdefault(user_id, CourseEnrollmentState(None, None))
+            cls._set_enrollment_states_in_cache(fetched_states, course_key, version)
+            enrollment_states.update(fetched_states)
+
+        for user_id in missing_user_ids:
+            cls._update_enrollment(request_cache, user_id, course_key, enrollment_states[user_id])
+        return enrollment_states
+
     @classmethod
     def bulk_fetch_enrollment_states(cls, users, course_key):
         """
@@ -2116,12 +2329,44 @@ class CourseEnrollment(models.Model):
         # before populating the cache with another bulk set of data,
         # remove previously cached entries to keep memory usage low.
         clear_cache(cls.MODE_CACHE_NAMESPACE)
+        cls.get_enrollment_states(users, course_key)
+
+    @classmethod
+    def warm_enrollment_state_cache(cls, course_key):
+        """
+        Loads the enrollment states of all the users enrolled in the given
+        course with a single query, and stores them in the request cache and
+        the django cache, so that later enrollment checks for the course, in
+        this process or others, do not query the database.
+        """
+        clear_cache(cls.MODE_CACHE_NAMESPACE)
+        request_cache = cls._get_mode_active_request_cache()
+        version = cls._get_enrollment_state_cache_version(course_key)
+        enrollment_states = {}
+        records = cls.objects.filter(course_id=course_key).values_list('user_id', 'mode', 'is_active')
+        for user_id, mode, is_active in records.iterator():
+            enrollment_states[user_id] = CourseEnrollmentState(mode, is_active)
+            cls._update_enrollment(request_cache, user_id, course_key, enrollment_states[user_id])
+            if len(enrollment_states) == ENROLLMENT_STATE_CACHE_CHUNK_SIZE:
+                cls._set_enrollment_states_in_cache(enrollment_states, course_key, version)
+                enrollment_states = {}
+        cls._set_enrollment_states_in_cache(enrollment_states, course_key, version)
 
-        records = cls.objects.filter(user__in=users, course_id=course_key).select_related('user')
-        cache = cls._get_mode_active_request_cache()
-        for record in records:
-            enrollment_state = CourseEnrollmentState(record.mode, record.is_active)
-            cls._update_enrollment(cache, record.user.id, course_key, enrollment_state)
+    @classmethod
+    def _set_enrollment_states_in_cache(cls, enrollment_states, course_key, version):
+        """
+        Stores the given dict of user ids to CourseEnrollmentStates in the
+        django cache with a single multi-set, under the given version of the
+        enrollment states of the course.
+        """
+        if enrollment_states:
+            cache.set_many(
+                {
+                    cls.cache_key_name(user_id, course_key, version): tuple(enrollment_state)
+                    for user_id, enrollment_state in enrollment_states.iteritems()
+                },
+                cls.ENROLLMENT_STATE_CACHE_TIMEOUT,
+            )
 
     @classmethod
     def _get_mode_active_request_cache(cls):
@@ -2158,13 +2403,111 @@ class CourseEnrollment(models.Model):
 @receiver(models.signals.post_save, sender=CourseEnrollment)
 @receiver(models.signals.post_delete, sender=CourseEnrollment)
 def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument, invalid-name
-    """Invalidate the cache of CourseEnrollment model. """
-
-    cache_key = CourseEnrollment.cache_key_name(
-        instance.user.id,
-        text_type(instance.course_id)
+    """
+    Invalidates the cached enrollment state of the saved or deleted
+    enrollment, in the request cache and in the django cache. The version of
+    the enrollment states of the course in the django cache is dropped, and
+    dropped again once the transaction commits, so that a state read by
+    another process before the commit is never read back.
+    """
+    CourseEnrollment._get_mode_active_request_cache().pop(  # pylint: disable=protected-access
+        (instance.user_id, instance.course_id), None
     )
+    cache_key = CourseEnrollment.cache_version_key_name(instance.course_id)
     cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def update_enrollment_mode_counts_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument, invalid-name
+    """
+    Removes a deleted active enrollment from the enrollment counts of its
+    course.
+    """
+    instance._update_mode_counts((None, False))  # pylint: disable=protected-access
+
+
+class CourseEnrollmentModeCount(models.Model):
+    """
+    The number of active enrollments of a course in a given mode.
+
+    The counts are updated in the same transaction as the enrollments that
+    change them, so that enrollment counts can be read without aggregating
+    the CourseEnrollment table. The counts of existing enrollments are seeded
+    by a data migration, and can be recomputed with the
+    reconcile_enrollment_counts management command to repair any drift from
+    enrollments changed without saving the model.
+
+    .. no_pii:
+    """
+    class Meta(object):
+        unique_together = ('course_id', 'mode')
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    mode = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def get_counts(cls, course_id):
+        """
+        Returns a dict of the number of active enrollments of the given course
+        in each mode.
+        """
+        return dict(cls.objects.filter(course_id=course_id).values_list('mode', 'count'))
+
+    @classmethod
+    def update_counts(cls, course_id, deltas):
+        """
+        Adds the given dict of mode to count deltas to the counts of the
+        given course, creating the count of a mode on its first enrollment.
+        """
+        for mode, delta in deltas.iteritems():
+            if not delta or cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + delta):
+                continue
+            if delta < 0:
+                # There is nothing to decrement, the count has drifted and is
+                # left for reconcile to repair.
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(course_id=course_id, mode=mode, count=delta)
+            except IntegrityError:
+                # A concurrent first enrollment in the mode created the count.
+                cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + delta)
+
+    @classmethod
+    def reconcile(cls, course_id):
+        """
+        Recomputes the counts of the given course from its enrollments and
+        returns them.
+
+        The counts of the course are locked while they are recomputed, so
+        that enrollments saved meanwhile are applied on top of the result.
+        This is meant to be run by the reconcile_enrollment_counts command,
+        not while serving requests.
+        """
+        with transaction.atomic():
+            list(cls.objects.select_for_update().filter(course_id=course_id).values_list('id', flat=True))
+            counts = {
+                row['mode']: row['count']
+                for row in CourseEnrollment.objects.filter(
+                    course_id=course_id, is_active=True,
+                ).values('mode').order_by().annotate(count=Count('id'))
+            }
+            cls.objects.filter(course_id=course_id).exclude(mode__in=counts.keys()).update(count=0)
+            for mode, count in counts.iteritems():
+                if cls.objects.filter(course_id=course_id, mode=mode).update(count=count):
+                    continue
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(course_id=course_id, mode=mode, count=count)
+                except IntegrityError:
+                    # A concurrent first enrollment in the mode created the
+                    # count, which the next run reconciles.
+                    pass
+        cache.delete(ENROLLMENT_COUNTS_CACHE_KEY.format(text_type(course_id)))
+        return counts
 
 
 class ManualEnrollmentAudit(models.Model):
@@ -2301,6 +2644,24 @@ class CourseAccessRole(models.Model):
     class Meta(object):
         unique_together = ('user', 'org', 'course_id', 'role')
 
+    @classmethod
+    def user_roles_cache_key(cls, user_id, version):
+        """
+        Returns the django cache key of the roles of the given user, as
+        cached by student.roles.RoleCache under the given version.
+        """
+        return u'student.roles.user_roles.{}.{}'.format(user_id, version)
+
+    @classmethod
+    def user_roles_cache_version_key(cls, user_id):
+        """
+        Returns the django cache key of the version of the cached roles of
+        the given user. The version is dropped whenever a role of the user
+        changes, so that roles read from the database before the change, and
+        cached after it, are kept under a version no one reads.
+        """
+        return u'student.roles.user_roles.{}.version'.format(user_id)
+
     @property
     def _key(self):
         """
@@ -2329,6 +2690,19 @@ class CourseAccessRole(models.Model):
         return "[CourseAccessRole] user: {}   role: {}   org: {}   course: {}".format(self.user.username, self.role, self.org, self.course_id)
 
 
+@receiver(models.signals.post_save, sender=CourseAccessRole)
+@receiver(models.signals.post_delete, sender=CourseAccessRole)
+def invalidate_user_roles_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached roles of the user whose role was saved or
+    deleted, by dropping their version now and again once the transaction
+    commits.
+    """
+    cache_key = CourseAccessRole.user_roles_cache_version_key(instance.user_id)
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
 #### Helper methods for use from python manage.py shell and other classes.
 
 
@@ -2384,6 +2758,21 @@ def get_user_by_username(username):
     return user
 
 
+def get_users_by_usernames(usernames):
+    """
+    Returns a dict mapping the given usernames to their User objects, looked
+    up with a single query. Like get_user_by_username, users who were not
+    found or who requested retirement are left out.
+    """
+    if not usernames:
+        return {}
+    UserRetirementRequest = apps.get_model('user_api', 'UserRetirementRequest')
+    users = User.objects.filter(username__in=usernames).exclude(
+        id__in=UserRetirementRequest.objects.filter(user__username__in=usernames).values('user_id')
+    )
+    return {user.username: user for user in users}
+
+
 def get_user(email):
     user = User.objects.get(email=email)
     u_prof = UserProfile.objects.get(user=user)
@@ -4,10 +4,12 @@ adding users, removing users, and listing members
 """
 
 import logging
+import uuid
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from opaque_keys.edx.django.models import CourseKeyField
 
 from openedx.core.djangoapps.request_cache import get_cache
@@ -58,26 +60,56 @@ class BulkRoleCache(object):
 
 class RoleCache(object):
     """
-    A cache of the CourseAccessRoles held by a particular user
+    A cache of the CourseAccessRoles held by a particular user, indexed by
+    (role, course_id, org) so that each role check is a set lookup.
+
+    Unless they were prefetched with BulkRoleCache, the roles are read from
+    the django cache, where they are kept across requests, under a version
+    of the user's roles that is dropped whenever they change.
     """
+    CACHE_TIMEOUT = 60 * 5
+
     def __init__(self, user):
         try:
-            self._roles = BulkRoleCache.get_user_roles(user)
+            self._roles = {
+                (access_role.role, access_role.course_id, access_role.org)
+                for access_role in BulkRoleCache.get_user_roles(user)
+            }
         except KeyError:
-            self._roles = set(
-                CourseAccessRole.objects.filter(user=user).all()
-            )
+            self._roles = self._get_user_roles(user)
+
+    @classmethod
+    def _get_user_roles(cls, user):
+        """
+        Returns the set of (role, course_id, org) tuples of the given user.
+        """
+        cache_key = CourseAccessRole.user_roles_cache_key(user.id, cls._get_user_roles_version(user))
+        roles = cache.get(cache_key)
+        if roles is None:
+            roles = set(CourseAccessRole.objects.filter(user=user).values_list('role', 'course_id', 'org'))
+            cache.set(cache_key, roles, cls.CACHE_TIMEOUT)
+        return roles
+
+    @classmethod
+    def _get_user_roles_version(cls, user):
+        """
+        Returns the current version of the cached roles of the given user,
+        starting a new one if there is none. It must be read before the roles
+        are read from the database.
+        """
+        version_key = CourseAccessRole.user_roles_cache_version_key(user.id)
+        version = cache.get(version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(version_key, version, cls.CACHE_TIMEOUT):
+                version = cache.get(version_key) or version
+        return version
 
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return (role, course_id, org) in self._roles
 
 
 class AccessRole(object):
@@ -413,3 +445,22 @@ class UserBasedRole(object):
         * role (will be self.role--thus uninteresting)
         """
         return CourseAccessRole.objects.filter(role=self.role, user=self.user)
+
+
+def get_course_role_users(course_keys, roles):
+    """
+    Returns a dict mapping each (course_key, role) pair of the given course
+    keys and role names to the list of users having that role in that
+    course, loaded with a single query.
+    """
+    users_by_course_role = {
+        (course_key, role): []
+        for course_key in course_keys
+        for role in roles
+    }
+    access_roles = CourseAccessRole.objects.filter(
+        course_id__in=course_keys, role__in=roles,
+    ).select_related('user').order_by('id')
+    for access_role in access_roles:
+        users_by_course_role.setdefault((access_role.course_id, access_role.role), []).append(access_role.user)
+    return users_by_course_role
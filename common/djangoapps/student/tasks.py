@@ -1,5 +1,5 @@
 """
-This file contains celery tasks for sending email
+This file contains celery tasks for sending email and saving anonymous user ids
 """
 import logging
 
@@ -11,6 +11,7 @@ from django.contrib.sites.models import Site
 from edx_ace import ace
 from edx_ace.errors import RecoverableChannelDeliveryError
 from edx_ace.message import Message
+from opaque_keys.edx.keys import CourseKey
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.lib.celery.task_utils import emulate_http_request
 
@@ -67,3 +68,15 @@ def send_activation_email(self, msg_string, from_address=None):
                 exc_info=True
             )
             raise Exception
+
+
+@task()
+def save_anonymous_user_ids(anonymous_ids, course_id):
+    """
+    Saves the AnonymousUserId objects of the given (user id, anonymous id)
+    pairs, which request-path callers computed without saving them.
+    """
+    # importing here to avoid circular imports
+    from student.models import save_anonymous_ids
+    course_key = CourseKey.from_string(course_id) if course_id else None
+    save_anonymous_ids(anonymous_ids, course_key)
@@ -0,0 +1,69 @@
+"""
+Tests for the maintained enrollment counts of courses.
+"""
+from django.core.management import call_command
+
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from student.models import CourseEnrollment, CourseEnrollmentModeCount
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+
+
+class EnrollmentCountsTest(CacheIsolationTestCase):
+    """
+    Tests that enrollment counts follow enrollment changes and can be
+    recomputed.
+    """
+    def setUp(self):
+        super(EnrollmentCountsTest, self).setUp()
+        self.course = CourseOverviewFactory.create()
+        self.enrollments = [
+            CourseEnrollmentFactory.create(user=UserFactory.create(), course=self.course, mode=mode)
+            for mode in ('audit', 'audit', 'verified')
+        ]
+
+    def _assert_counts(self, expected):
+        """
+        Asserts the enrollment counts of the course, both as maintained and
+        as recomputed from the enrollments.
+        """
+        expected_total = sum(expected.itervalues())
+        self.assertEqual(
+            CourseEnrollment.objects.enrollment_counts(self.course.id), dict(expected, total=expected_total)
+        )
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course.id), expected_total)
+        maintained = dict(CourseEnrollmentModeCount.get_counts(self.course.id))
+        self.assertEqual(
+            {mode: count for mode, count in maintained.iteritems() if count},
+            CourseEnrollmentModeCount.reconcile(self.course.id),
+        )
+
+    def test_counts_follow_enrollments(self):
+        self._assert_counts({'audit': 2, 'verified': 1})
+
+        CourseEnrollment.unenroll(self.enrollments[0].user, self.course.id)
+        self._assert_counts({'audit': 1, 'verified': 1})
+
+        self.enrollments[1].update_enrollment(mode='verified')
+        self._assert_counts({'verified': 2})
+
+        CourseEnrollment.enroll(UserFactory.create(), self.course.id, mode='honor')
+        self.enrollments[2].delete()
+        self._assert_counts({'verified': 1, 'honor': 1})
+
+    def test_first_enrollment_in_mode(self):
+        CourseEnrollmentModeCount.objects.filter(course_id=self.course.id, mode='audit').update(count=10)
+        CourseEnrollment.enroll(UserFactory.create(), self.course.id, mode='honor')
+        # The new mode is counted without recounting the other modes.
+        self.assertEqual(CourseEnrollmentModeCount.get_counts(self.course.id), {'audit': 10, 'verified': 1, 'honor': 1})
+
+    def test_counts_read_without_aggregation(self):
+        CourseEnrollmentModeCount.reconcile(self.course.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course.id), 3)
+
+    def test_reconcile_command(self):
+        CourseEnrollmentModeCount.objects.filter(course_id=self.course.id, mode='audit').update(count=10)
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course.id), 11)
+        call_command('reconcile_enrollment_counts', unicode(self.course.id))
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course.id), 3)
@@ -2,10 +2,13 @@
 Tests of student.roles
 """
 import ddt
+from django.core.cache import caches
 from django.test import TestCase
 from opaque_keys.edx.keys import CourseKey
 
 from courseware.tests.factories import InstructorFactory, StaffFactory, UserFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from student.models import CourseAccessRole
 from student.roles import (
     CourseBetaTesterRole,
     CourseInstructorRole,
@@ -14,7 +17,8 @@ from student.roles import (
     GlobalStaff,
     OrgInstructorRole,
     OrgStaffRole,
-    RoleCache
+    RoleCache,
+    get_course_role_users
 )
 from student.tests.factories import AnonymousUserFactory
 
@@ -198,3 +202,50 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+
+class SharedRoleCacheTestCase(CacheIsolationTestCase):
+    """
+    Tests sharing the roles of users through the django cache, and loading
+    the roles of courses in bulk.
+    """
+    ENABLED_CACHES = ['default']
+    COURSE_KEY = CourseKey.from_string('edX/toy/2012_Fall')
+    OTHER_COURSE_KEY = CourseKey.from_string('edX/toy/2013_Fall')
+
+    def test_roles_shared_until_changed(self):
+        user = UserFactory()
+        CourseStaffRole(self.COURSE_KEY).add_users(user)
+        with self.assertNumQueries(1):
+            RoleCache(user)
+        with self.assertNumQueries(0):
+            self.assertTrue(RoleCache(user).has_role('staff', self.COURSE_KEY, 'edX'))
+
+        CourseInstructorRole(self.COURSE_KEY).add_users(user)
+        self.assertTrue(RoleCache(user).has_role('instructor', self.COURSE_KEY, 'edX'))
+        CourseStaffRole(self.COURSE_KEY).remove_users(user)
+        self.assertFalse(RoleCache(user).has_role('staff', self.COURSE_KEY, 'edX'))
+
+    def test_stale_roles_cached_after_change(self):
+        # Roles read before a change, and cached after it, are cached under
+        # the version the change dropped.
+        user = UserFactory()
+        version = RoleCache._get_user_roles_version(user)  # pylint: disable=protected-access
+        CourseStaffRole(self.COURSE_KEY).add_users(user)
+        caches['default'].set(CourseAccessRole.user_roles_cache_key(user.id, version), set(), RoleCache.CACHE_TIMEOUT)
+        self.assertTrue(RoleCache(user).has_role('staff', self.COURSE_KEY, 'edX'))
+
+    def test_get_course_role_users(self):
+        staff = StaffFactory(course_key=self.COURSE_KEY)
+        instructor = InstructorFactory(course_key=self.COURSE_KEY)
+        other_staff = StaffFactory(course_key=self.OTHER_COURSE_KEY)
+        with self.assertNumQueries(1):
+            users_by_course_role = get_course_role_users(
+                [self.COURSE_KEY, self.OTHER_COURSE_KEY], ['staff', 'instructor']
+            )
+        self.assertEqual(users_by_course_role, {
+            (self.COURSE_KEY, 'staff'): [staff],
+            (self.COURSE_KEY, 'instructor'): [instructor],
+            (self.OTHER_COURSE_KEY, 'staff'): [other_staff],
+            (self.OTHER_COURSE_KEY, 'instructor'): [],
+        })
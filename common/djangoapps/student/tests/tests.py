@@ -32,18 +32,24 @@ from course_modes.tests.factories import CourseModeFactory
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from openedx.core.djangoapps.catalog.tests.factories import CourseFactory as CatalogCourseFactory
 from openedx.core.djangoapps.catalog.tests.factories import CourseRunFactory, ProgramFactory, generate_course_run_key
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
 from openedx.core.djangoapps.programs.tests.mixins import ProgramsApiConfigMixin
+from openedx.core.djangoapps.request_cache.middleware import RequestCache
 from openedx.core.djangoapps.site_configuration.tests.mixins import SiteMixin
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
+from openedx.core.lib.cache_utils import LRUCache
 from student.helpers import _cert_info, process_survey_link
 from student.models import (
     CourseEnrollment,
+    CourseEnrollmentState,
     LinkedInAddToProfileConfiguration,
     UserAttribute,
     anonymous_id_for_user,
+    anonymous_ids_for_users,
     unique_id_for_user,
     user_by_anonymous_id
 )
+from student.tasks import save_anonymous_user_ids
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
 from student.views import complete_course_mode_info
 from util.model_utils import USER_SETTINGS_CHANGED_EVENT_NAME
@@ -932,6 +938,76 @@ class EnrollInCourseTest(EnrollmentEventTestMixin, CacheIsolationTestCase):
         self.assert_enrollment_mode_change_event_was_emitted(user, course_id, "audit")
 
 
+class EnrollmentStateCacheTest(CacheIsolationTestCase):
+    """Tests caching the enrollment states of users in a course."""
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(EnrollmentStateCacheTest, self).setUp()
+        self.course = CourseOverviewFactory.create()
+        self.active, self.inactive, self.unenrolled = UserFactory.create_batch(3)
+        CourseEnrollmentFactory.create(user=self.active, course=self.course, mode='verified')
+        CourseEnrollmentFactory.create(user=self.inactive, course=self.course, mode='audit', is_active=False)
+        RequestCache.clear_request_cache()
+
+    def _assert_enrollment_states(self, expected_queries):
+        """
+        Asserts the enrollment states of the users, as fetched in bulk and
+        with the given number of queries.
+        """
+        with self.assertNumQueries(expected_queries):
+            enrollment_states = CourseEnrollment.get_enrollment_states(
+                [self.active, self.inactive, self.unenrolled], self.course.id
+            )
+        self.assertEqual(enrollment_states, {
+            self.active.id: ('verified', True),
+            self.inactive.id: ('audit', False),
+            self.unenrolled.id: (None, None),
+        })
+
+    def test_get_enrollment_states(self):
+        self._assert_enrollment_states(expected_queries=1)
+        self._assert_enrollment_states(expected_queries=0)
+        RequestCache.clear_request_cache()
+        self._assert_enrollment_states(expected_queries=0)
+
+    def test_warm_enrollment_state_cache(self):
+        with self.assertNumQueries(1):
+            CourseEnrollment.warm_enrollment_state_cache(self.course.id)
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            self.assertTrue(CourseEnrollment.is_enrolled(self.active, self.course.id))
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(self.inactive, self.course.id), ('audit', False))
+
+    def test_invalidated_on_save(self):
+        self._assert_enrollment_states(expected_queries=1)
+        enrollment = CourseEnrollment.objects.get(user=self.inactive, course_id=self.course.id)
+        enrollment.is_active = True
+        enrollment.save()
+        CourseEnrollmentFactory.create(user=self.unenrolled, course=self.course, mode='honor')
+        with self.assertNumQueries(1):
+            enrollment_states = CourseEnrollment.get_enrollment_states(
+                [self.active, self.inactive, self.unenrolled], self.course.id
+            )
+        self.assertEqual(enrollment_states[self.inactive.id], ('audit', True))
+        self.assertEqual(enrollment_states[self.unenrolled.id], ('honor', True))
+
+    def test_stale_state_stored_after_save(self):  # pylint: disable=protected-access
+        # A state read before the save, and stored in the cache after it, is
+        # stored under the version the save dropped.
+        version = CourseEnrollment._get_enrollment_state_cache_version(self.course.id)
+        enrollment = CourseEnrollment.objects.get(user=self.inactive, course_id=self.course.id)
+        enrollment.is_active = True
+        enrollment.save()
+        CourseEnrollment._set_enrollment_states_in_cache(
+            {self.inactive.id: CourseEnrollmentState('audit', False)}, self.course.id, version
+        )
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            enrollment_states = CourseEnrollment.get_enrollment_states([self.inactive], self.course.id)
+        self.assertEqual(enrollment_states[self.inactive.id], ('audit', True))
+
+
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 class ChangeEnrollmentViewTest(ModuleStoreTestCase):
     """Tests the student.views.change_enrollment view"""
@@ -1062,6 +1138,51 @@ class AnonymousLookupTable(ModuleStoreTestCase):
             self.assertEqual(self.user, user_by_anonymous_id(anonymous_id))
             self.assertEqual(self.user, user_by_anonymous_id(new_anonymous_id))
 
+    def test_bulk_ids(self):
+        users = [self.user] + [UserFactory.create() for _ in range(3)]
+        anonymous_id_for_user(users[0], self.course.id)
+
+        users = list(User.objects.filter(id__in=[user.id for user in users]))
+        with self.assertNumQueries(4):
+            anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+        for user in users:
+            self.assertEqual(anonymous_ids[user.id], anonymous_id_for_user(user, self.course.id, save=False))
+            self.assertEqual(user, user_by_anonymous_id(anonymous_ids[user.id]))
+
+        # The saved ids are not looked up again by this process.
+        users = list(User.objects.filter(id__in=[user.id for user in users]))
+        with self.assertNumQueries(0):
+            anonymous_ids_for_users(users, self.course.id)
+            anonymous_id_for_user(users[0], self.course.id)
+
+    def test_deferred_save(self):
+        with patch('student.tasks.save_anonymous_user_ids.delay') as mock_delay:
+            with self.assertNumQueries(1):
+                anonymous_id = anonymous_id_for_user(self.user, self.course.id, defer_save=True)
+        self.assertIsNone(user_by_anonymous_id(anonymous_id))
+        mock_delay.assert_called_once_with([(self.user.id, anonymous_id)], unicode(self.course.id))
+
+        # The task runs in a worker process, which has not seen the id yet.
+        with patch('student.models._saved_anonymous_ids', LRUCache(10)):
+            save_anonymous_user_ids(*mock_delay.call_args[0])
+        self.assertEqual(self.user, user_by_anonymous_id(anonymous_id))
+
+        # This process finds the saved id and does not queue the task again.
+        self.user = User.objects.get(id=self.user.id)
+        with patch('student.tasks.save_anonymous_user_ids.delay') as mock_delay:
+            with self.assertNumQueries(1):
+                anonymous_id_for_user(self.user, self.course.id, defer_save=True)
+        self.assertFalse(mock_delay.called)
+
+    def test_lost_deferred_save(self):
+        with patch('student.tasks.save_anonymous_user_ids.delay'):
+            anonymous_id = anonymous_id_for_user(self.user, self.course.id, defer_save=True)
+
+        # The task never ran, so a later synchronous save still creates the id.
+        self.user = User.objects.get(id=self.user.id)
+        anonymous_id_for_user(self.user, self.course.id)
+        self.assertEqual(self.user, user_by_anonymous_id(anonymous_id))
+
 
 @attr(shard=3)
 @skip_unless_lms
@@ -11,7 +11,7 @@ from milestones.services import MilestonesService
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 
-from openedx.core.djangoapps.request_cache import get_cache
+from openedx.core.djangoapps.request_cache import clear_cache, get_cache
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from xmodule.modulestore.django import modulestore
 
@@ -20,6 +20,7 @@ NAMESPACE_CHOICES = {
 }
 
 REQUEST_CACHE_NAME = "milestones"
+FULFILLMENT_PATHS_REQUEST_CACHE_NAME = "milestones.fulfillment_paths"
 
 
 def get_namespace_choices():
@@ -67,6 +68,7 @@ def add_prerequisite_course(course_key, prerequisite_course_key):
 
     # add fulfillment course milestone
     milestones_api.add_course_milestone(prerequisite_course_key, 'fulfills', milestone)
+    _clear_fulfillment_paths_cache()
 
 
 def remove_prerequisite_course(course_key, milestone):
@@ -80,6 +82,7 @@ def remove_prerequisite_course(course_key, milestone):
         course_key,
         milestone,
     )
+    _clear_fulfillment_paths_cache()
 
 
 def set_prerequisite_courses(course_key, prerequisite_course_keys):
@@ -128,7 +131,7 @@ def get_pre_requisite_courses_not_completed(user, enrolled_courses):  # pylint:
 
     for course_key in enrolled_courses:
         required_courses = []
-        fulfillment_paths = milestones_api.get_course_milestones_fulfillment_paths(course_key, {'id': user.id})
+        fulfillment_paths = _get_fulfillment_paths(course_key, user.id)
         for __, milestone_value in fulfillment_paths.items():
             for key, value in milestone_value.items():
                 if key == 'courses' and value:
@@ -193,6 +196,7 @@ def fulfill_course_milestone(course_key, user):
         course_milestones = milestones_api.get_course_milestones(course_key=course_key, relationship="fulfills")
     for milestone in course_milestones:
         milestones_api.add_user_milestone({'id': user.id}, milestone)
+    _clear_fulfillment_paths_cache()
 
 
 def remove_course_milestones(course_key, user, relationship):
@@ -204,6 +208,7 @@ def remove_course_milestones(course_key, user, relationship):
     course_milestones = milestones_api.get_course_milestones(course_key=course_key, relationship=relationship)
     for milestone in course_milestones:
         milestones_api.remove_user_milestone({'id': user.id}, milestone)
+    _clear_fulfillment_paths_cache()
 
 
 def get_required_content(course_key, user):
@@ -323,6 +328,7 @@ def add_course_milestone(course_id, relationship, milestone):
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return None
+    _clear_fulfillment_paths_cache()
     return milestones_api.add_course_milestone(course_id, relationship, milestone)
 
 
@@ -402,7 +408,7 @@ def any_unfulfilled_milestones(course_id, user_id):
     if not settings.FEATURES.get('MILESTONES_APP'):
         return False
 
-    fulfillment_paths = milestones_api.get_course_milestones_fulfillment_paths(course_id, {'id': user_id})
+    fulfillment_paths = _get_fulfillment_paths(course_id, user_id)
 
     # Returns True if any of the milestones is unfulfilled. False if
     # values is empty or all values are.
@@ -427,6 +433,7 @@ def add_user_milestone(user, milestone):
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return None
+    _clear_fulfillment_paths_cache()
     return milestones_api.add_user_milestone(user, milestone)
 
 
@@ -436,9 +443,33 @@ def remove_user_milestone(user, milestone):
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return None
+    _clear_fulfillment_paths_cache()
     return milestones_api.remove_user_milestone(user, milestone)
 
 
+def _get_fulfillment_paths(course_key, user_id):
+    """
+    Returns the fulfillment paths of the given user for the milestones of
+    the given course, using the request cache so that the many access checks
+    of a request query them once. The cache is cleared by the helpers above
+    that change course or user milestones.
+    """
+    request_cache_dict = get_cache(FULFILLMENT_PATHS_REQUEST_CACHE_NAME)
+    cache_key = (unicode(course_key), user_id)
+    if cache_key not in request_cache_dict:
+        request_cache_dict[cache_key] = milestones_api.get_course_milestones_fulfillment_paths(
+            course_key, {'id': user_id}
+        )
+    return request_cache_dict[cache_key]
+
+
+def _clear_fulfillment_paths_cache():
+    """
+    Clears the request cache of milestone fulfillment paths.
+    """
+    clear_cache(FULFILLMENT_PATHS_REQUEST_CACHE_NAME)
+
+
 def get_service():
     """
     Returns MilestonesService instance if feature flag enabled;
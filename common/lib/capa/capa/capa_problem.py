@@ -13,6 +13,8 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+import hashlib
+import json
 import logging
 import os.path
 import re
@@ -32,6 +34,7 @@ from capa.correctmap import CorrectMap
 from capa.safe_exec import safe_exec
 from capa.util import contextualize_text, convert_files_to_filenames
 from openedx.core.djangolib.markup import HTML
+from openedx.core.lib.cache_utils import LRUCache
 from xmodule.stringify import stringify_children
 
 # extra things displayed after "show answers" is pressed
@@ -71,6 +74,18 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Parsed problem XML trees, before includes are processed, by problem text.
+# They don't depend on the learner, so every LoncapaProblem of the process
+# starts from a copy of the cached tree instead of parsing the text again.
+PROBLEM_TREE_CACHE_SIZE = 500
+_problem_trees = LRUCache(PROBLEM_TREE_CACHE_SIZE)
+
+# Serialized script contexts by script code, seed and execution environment,
+# so that learners sharing a seed share the result of running the problem's
+# scripts. Scripts that read the anonymous student id are never cached here.
+PROBLEM_CONTEXT_CACHE_SIZE = 5000
+_problem_contexts = LRUCache(PROBLEM_CONTEXT_CACHE_SIZE)
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -179,9 +194,7 @@ class LoncapaProblem(object):
         self.problem_text = problem_text
 
         # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
+        self.tree = self._parse_problem_text(problem_text)
 
         # handle any <include file="foo"> tags
         self._process_includes()
@@ -746,6 +759,19 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
+    def _parse_problem_text(self, problem_text):
+        """
+        Returns a new element tree of the given problem XML, made compatible
+        by `make_xml_compatible`. The text is only parsed the first time it
+        is seen; later calls copy the cached tree.
+        """
+        tree = _problem_trees.get(problem_text)
+        if tree is None:
+            tree = etree.XML(problem_text)
+            self.make_xml_compatible(tree)
+            _problem_trees.set(problem_text, tree)
+        return deepcopy(tree)
+
     def _process_includes(self):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
@@ -871,21 +897,42 @@ class LoncapaProblem(object):
                 extra_files.append(("python_lib.zip", zip_lib))
                 python_path.append("python_lib.zip")
 
-            try:
-                safe_exec(
+            unsafely = self.capa_system.can_execute_unsafe_code()
+            context_key = None
+            if 'anonymous_student_id' not in all_code:
+                context_key = (
                     all_code,
-                    context,
-                    random_seed=self.seed,
-                    python_path=python_path,
-                    extra_files=extra_files,
-                    cache=self.capa_system.cache,
-                    slug=self.problem_id,
-                    unsafely=self.capa_system.can_execute_unsafe_code(),
+                    self.seed,
+                    tuple(python_path),
+                    hashlib.sha1(zip_lib).hexdigest() if zip_lib is not None else None,
+                    unsafely,
                 )
-            except Exception as err:
-                log.exception("Error while execing script code: " + all_code)
-                msg = "Error while executing script code: %s" % str(err).replace('<', '&lt;')
-                raise responsetypes.LoncapaProblemError(msg)
+            cached_context = _problem_contexts.get(context_key) if context_key else None
+
+            if cached_context is not None:
+                context.update(json.loads(cached_context))
+                context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+            else:
+                try:
+                    safe_exec(
+                        all_code,
+                        context,
+                        random_seed=self.seed,
+                        python_path=python_path,
+                        extra_files=extra_files,
+                        cache=self.capa_system.cache,
+                        slug=self.problem_id,
+                        unsafely=unsafely,
+                    )
+                except Exception as err:
+                    log.exception("Error while execing script code: " + all_code)
+                    msg = "Error while executing script code: %s" % str(err).replace('<', '&lt;')
+                    raise responsetypes.LoncapaProblemError(msg)
+                if context_key:
+                    try:
+                        _problem_contexts.set(context_key, json.dumps(context))
+                    except (TypeError, ValueError):
+                        log.debug("Not caching the script context of problem %s: not serializable", self.problem_id)
 
         # Store code source in context, along with the Python path needed to run it correctly.
         context['script_code'] = all_code
@@ -73,6 +73,50 @@ QUESTION_HINT_LABEL_STYLE = 'hint-label'
 QUESTION_HINT_TEXT_STYLE = 'hint-text'
 QUESTION_HINT_MULTILINE = 'feedback-hint-multi'
 
+# Maximum number of entries in each of the caches below. Like the cache of the
+# re module, a cache is emptied once it is full.
+MATCHER_CACHE_SIZE = 2000
+
+# Caches shared by all problem instances in the process, so that rescoring a
+# problem for many learners parses each distinct answer only once. They are
+# keyed by the answer text after contextualization, which already reflects the
+# problem definition and seed.
+_compiled_regexps = {}
+_evaluated_expressions = {}
+
+
+def _cache_value(cache, key, value):
+    """
+    Stores the value in the given module level cache and returns it.
+    """
+    if len(cache) >= MATCHER_CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+    return value
+
+
+def compile_answer_regexp(pattern, flags=0):
+    """
+    Returns the compiled regular expression matching exactly the given answer
+    pattern. Errors are raised as by `re.compile`.
+    """
+    key = (pattern, flags)
+    try:
+        return _compiled_regexps[key]
+    except KeyError:
+        return _cache_value(_compiled_regexps, key, re.compile('^' + pattern + '$', flags=flags | re.UNICODE))
+
+
+def evaluate_expression(expression):
+    """
+    Returns the value of the given variable-free math expression, as computed
+    by `evaluator`. Errors are raised as by `evaluator` and are not cached.
+    """
+    try:
+        return _evaluated_expressions[expression]
+    except KeyError:
+        return _cache_value(_evaluated_expressions, expression, evaluator({}, {}, expression))
+
 #-----------------------------------------------------------------------------
 # Exceptions
 
@@ -1512,6 +1556,8 @@ class NumericalResponse(LoncapaResponse):
         self.tolerance = default_tolerance
         self.range_tolerance = False
         self.answer_range = self.inclusion = None
+        self.partial_range = 2
+        self.partial_answers = None
         super(NumericalResponse, self).__init__(*args, **kwargs)
 
     def setup_response(self):
@@ -1523,6 +1569,18 @@ class NumericalResponse(LoncapaResponse):
             [element.get('answer') for element in xml.findall('additional_answer')]
         )
 
+        # What multiple of the tolerance is worth partial credit?
+        has_partial_range = xml.xpath('responseparam[@partial_range]')
+        if has_partial_range:
+            self.partial_range = float(has_partial_range[0].get('partial_range', default='2'))
+
+        # Alternative answers that are worth partial credit.
+        has_partial_answers = xml.xpath('responseparam[@partial_answers]')
+        if has_partial_answers:
+            self.partial_answers = [
+                word.strip() for word in has_partial_answers[0].get('partial_answers').split(',')
+            ]
+
         if answer.startswith(('[', '(')) and answer.endswith((']', ')')):  # range tolerance case
             self.range_tolerance = True
             self.inclusion = (
@@ -1562,7 +1620,7 @@ class NumericalResponse(LoncapaResponse):
             # `ValueError`. Then test if instead it is a math expression.
             # `complex` seems to only generate `ValueErrors`, only catch these.
             try:
-                correct_ans = evaluator({}, {}, answer)
+                correct_ans = evaluate_expression(answer)
             except Exception:
                 log.debug("Content error--answer '%s' is not a valid number", answer)
                 _ = self.capa_system.i18n.ugettext
@@ -1597,7 +1655,7 @@ class NumericalResponse(LoncapaResponse):
         # Begin `evaluator` block
         # Catch a bunch of exceptions and give nicer messages to the student.
         try:
-            student_float = evaluator({}, {}, student_answer)
+            student_float = evaluate_expression(student_answer)
         except UndefinedVariable as undef_var:
             raise StudentInputError(
                 _(u"You may not use variables ({bad_variables}) in numerical problems.").format(
@@ -1628,23 +1686,11 @@ class NumericalResponse(LoncapaResponse):
             raise general_exception
         # End `evaluator` block -- we figured out the student's answer!
 
-        tree = self.xml
-
-        # What multiple of the tolerance is worth partial credit?
-        has_partial_range = tree.xpath('responseparam[@partial_range]')
-        if has_partial_range:
-            partial_range = float(has_partial_range[0].get('partial_range', default='2'))
-        else:
-            partial_range = 2
+        partial_range = self.partial_range
 
         # Take in alternative answers that are worth partial credit.
-        has_partial_answers = tree.xpath('responseparam[@partial_answers]')
-        if has_partial_answers:
-            partial_answers = has_partial_answers[0].get('partial_answers').split(',')
-            for index, word in enumerate(partial_answers):
-                partial_answers[index] = word.strip()
-                partial_answers[index] = self.get_staff_ans(partial_answers[index])
-
+        if self.partial_answers:
+            partial_answers = [self.get_staff_ans(answer) for answer in self.partial_answers]
         else:
             partial_answers = False
 
@@ -1762,8 +1808,8 @@ class NumericalResponse(LoncapaResponse):
         with this problem's tolerance.
         """
         return compare_with_tolerance(
-            evaluator({}, {}, ans1),
-            evaluator({}, {}, ans2),
+            evaluate_expression(ans1),
+            evaluate_expression(ans2),
             self.tolerance
         )
 
@@ -1772,7 +1818,7 @@ class NumericalResponse(LoncapaResponse):
         Returns whether this answer is in a valid form.
         """
         try:
-            evaluator(dict(), dict(), answer)
+            evaluate_expression(answer)
             return True
         except (StudentInputError, UndefinedVariable, UnmatchedParenthesis):
             return False
@@ -1878,6 +1924,8 @@ class StringResponse(LoncapaResponse):
         self.backward = '_or_' in self.xml.get('answer').lower()
         self.regexp = False
         self.case_insensitive = False
+        # Contextualized answers of the hints, by their answer attribute.
+        self.hinted_answers = {}
         if self.xml.get('type') is not None:
             self.regexp = 'regexp' in self.xml.get('type').lower().split(' ')
             self.case_insensitive = 'ci' in self.xml.get('type').lower().split(' ')
@@ -1995,7 +2043,7 @@ class StringResponse(LoncapaResponse):
                 flags = re.IGNORECASE
             try:
                 # We follow the check_string convention/exception, adding ^ and $
-                regex = re.compile('^' + answer + '$', flags=flags | re.UNICODE)
+                regex = compile_answer_regexp(answer, flags)
                 return re.search(regex, given)
             except Exception:  # pylint: disable=broad-except
                 return False
@@ -2037,7 +2085,7 @@ class StringResponse(LoncapaResponse):
         if self.regexp:  # regexp match
             flags = re.IGNORECASE if self.case_insensitive else 0
             try:
-                regexp = re.compile('^' + '|'.join(expected) + '$', flags=flags | re.UNICODE)
+                regexp = compile_answer_regexp('|'.join(expected), flags)
                 result = re.search(regexp, given)
             except Exception as err:
                 msg = u'[courseware.capa.responsetypes.stringresponse] {error}: {message}'.format(
@@ -2059,7 +2107,10 @@ class StringResponse(LoncapaResponse):
         for hxml in hxml_set:
             name = hxml.get('name')
 
-            hinted_answer = contextualize_text(hxml.get('answer'), self.context).strip()
+            answer = hxml.get('answer')
+            if answer not in self.hinted_answers:
+                self.hinted_answers[answer] = contextualize_text(answer, self.context).strip()
+            hinted_answer = self.hinted_answers[answer]
 
             if self.check_string([hinted_answer], given):
                 hints_to_show.append(name)
@@ -7,8 +7,10 @@ from lxml import etree
 from mock import patch
 import unittest
 
-from capa.tests.helpers import new_loncapa_problem
+from capa.safe_exec import safe_exec
+from capa.tests.helpers import new_loncapa_problem, test_capa_system
 from openedx.core.djangolib.markup import HTML
+from openedx.core.lib.cache_utils import LRUCache
 
 
 @ddt.ddt
@@ -708,3 +710,63 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
             """
         )
         self.assertEquals(problem.find_answer_text('1_2_1', 'hide'), 'hide')
+
+
+class CAPAProblemCacheTest(unittest.TestCase):
+    """
+    Tests for the caches of parsed problem trees and script contexts shared
+    by the problems of the process.
+    """
+    def setUp(self):
+        super(CAPAProblemCacheTest, self).setUp()
+        patcher = patch('capa.capa_problem._problem_trees', LRUCache(10))
+        self.problem_trees = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('capa.capa_problem._problem_contexts', LRUCache(10))
+        self.problem_contexts = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _new_problem(self, script, anonymous_student_id='student', seed=723):
+        """
+        Returns a new problem running the given script, for the given student.
+        """
+        capa_system = test_capa_system()
+        capa_system.anonymous_student_id = anonymous_student_id
+        xml = textwrap.dedent("""
+            <problem>
+                <script type="loncapa/python">{}</script>
+                <stringresponse answer="$answer">
+                    <textline size="40"/>
+                </stringresponse>
+            </problem>
+        """).format(script)
+        return new_loncapa_problem(xml, capa_system=capa_system, seed=seed)
+
+    def test_tree_parsed_once(self):
+        with patch('capa.capa_problem.etree.XML', wraps=etree.XML) as mock_xml:
+            first = self._new_problem('answer = "a"')
+            second = self._new_problem('answer = "a"')
+        self.assertEqual(len(self.problem_trees), 1)
+        parsed_texts = [call[0][0] for call in mock_xml.call_args_list]
+        self.assertEqual(parsed_texts.count(first.problem_text), 1)
+        self.assertIsNot(first.tree, second.tree)
+        self.assertEqual(etree.tostring(first.tree), etree.tostring(second.tree))
+
+    def test_context_shared_by_seed(self):
+        script = 'answer = str(random.randint(0, 10 ** 9))'
+        with patch('capa.capa_problem.safe_exec', wraps=safe_exec) as mock_safe_exec:
+            first = self._new_problem(script, anonymous_student_id='first')
+            second = self._new_problem(script, anonymous_student_id='second')
+            other_seed = self._new_problem(script, anonymous_student_id='second', seed=724)
+        self.assertEqual(mock_safe_exec.call_count, 2)
+        self.assertEqual(first.context['answer'], second.context['answer'])
+        self.assertEqual(second.context['anonymous_student_id'], 'second')
+        self.assertEqual(other_seed.context['seed'], 724)
+
+    def test_context_reading_student_id_not_shared(self):
+        script = 'answer = anonymous_student_id'
+        first = self._new_problem(script, anonymous_student_id='first')
+        second = self._new_problem(script, anonymous_student_id='second')
+        self.assertEqual(len(self.problem_contexts), 0)
+        self.assertEqual(first.context['answer'], 'first')
+        self.assertEqual(second.context['answer'], 'second')
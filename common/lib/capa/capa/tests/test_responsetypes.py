@@ -9,6 +9,7 @@ import json
 import os
 import pyparsing
 import random
+import re
 import textwrap
 import unittest
 import zipfile
@@ -600,6 +601,13 @@ class StringResponseTest(ResponseTest):  # pylint: disable=missing-docstring
             self.assert_grade(problem, answer.lower(), "correct")
         self.assert_grade(problem, "Other String", "incorrect")
 
+    def test_regexp_cached_across_problems(self):
+        with mock.patch('capa.responsetypes._compiled_regexps', {}) as compiled_regexps:
+            for _ in range(3):
+                problem = self.build_problem(answer="sec.*", case_sensitive=False, regexp=True)
+                self.assert_multiple_grade(problem, ["Second", "second"], ["First"])
+            self.assertEqual(compiled_regexps.keys(), [("sec.*", re.IGNORECASE)])
+
     def test_regexp(self):
         problem = self.build_problem(answer="Second", case_sensitive=False, regexp=True)
         self.assert_grade(problem, "Second", "correct")
@@ -1612,7 +1620,9 @@ class NumericalResponseTest(ResponseTest):  # pylint: disable=missing-docstring
 
         problem = self.build_problem(answer=4, tolerance='10%')
 
-        with mock.patch('capa.responsetypes.evaluator') as mock_eval:
+        # Keep the mocked values out of the cache of evaluated expressions.
+        with mock.patch.dict('capa.responsetypes._evaluated_expressions', clear=True), \
+                mock.patch('capa.responsetypes.evaluator') as mock_eval:
             mock_eval.side_effect = evaluator_side_effect
             self.assert_grade(problem, 'some big input', 'incorrect')
             self.assert_grade(problem, 'some neg input', 'incorrect')
@@ -1644,6 +1654,22 @@ class NumericalResponseTest(ResponseTest):  # pylint: disable=missing-docstring
                 with self.assertRaisesRegexp(StudentInputError, msg_regex):
                     problem.grade_answers({'1_2_1': 'foobar'})
 
+    def test_evaluations_cached_across_problems(self):
+        """
+        Each distinct staff and student answer is evaluated once, however
+        many problem instances grade it.
+        """
+        with mock.patch.dict('capa.responsetypes._evaluated_expressions', clear=True), \
+                mock.patch('capa.responsetypes.evaluator', wraps=calc.evaluator) as mock_eval:
+            for _ in range(3):
+                problem = self.build_problem(answer="4*2", tolerance="1", partial_credit="list", partial_answers="2*2")
+                self.assert_multiple_grade(problem, ['2^3', '7.5'], ['5*2'])
+                self.assert_grade(problem, '2+2', 'partially-correct')
+            self.assertEqual(
+                sorted(call[0][2] for call in mock_eval.call_args_list),
+                ['2*2', '2+2', '2^3', '4*2', '5*2', '7.5'],
+            )
+
     def test_compare_answer(self):
         """Tests the answer compare function."""
         problem = self.build_problem(answer="42")
@@ -6,12 +6,14 @@ from __future__ import division
 
 import abc
 import inspect
+import json
 import logging
 import random
 import sys
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 
+import numpy
 from contracts import contract
 from pytz import UTC
 from django.utils.translation import ugettext_lazy as _
@@ -154,6 +156,11 @@ def invalid_args(func, argdict):
     return set(argdict) - set(args)
 
 
+# Graders compiled by grader_from_conf, keyed by their serialized configuration.
+_COMPILED_GRADERS = {}
+_MAX_COMPILED_GRADERS = 1000
+
+
 def grader_from_conf(conf):
     """
     This creates a CourseGrader from a configuration (such as in course_settings.py).
@@ -161,10 +168,31 @@ def grader_from_conf(conf):
     More commonly, the conf is a list of dictionaries. A WeightedSubsectionsGrader
     with AssignmentFormatGraders will be generated. Every dictionary should contain
     the parameters for making an AssignmentFormatGrader, in addition to a 'weight' key.
+
+    Graders are compiled once per distinct configuration and shared by all callers,
+    so they must be treated as immutable.
     """
     if isinstance(conf, CourseGrader):
         return conf
 
+    try:
+        conf_key = json.dumps(conf, sort_keys=True)
+    except (TypeError, ValueError):
+        return _compile_grader(conf)
+
+    grader = _COMPILED_GRADERS.get(conf_key)
+    if grader is None:
+        grader = _compile_grader(conf)
+        if len(_COMPILED_GRADERS) >= _MAX_COMPILED_GRADERS:
+            _COMPILED_GRADERS.clear()
+        _COMPILED_GRADERS[conf_key] = grader
+    return grader
+
+
+def _compile_grader(conf):
+    """
+    Builds a WeightedSubsectionsGrader from the given list of subgrader configurations.
+    """
     subgraders = []
     for subgraderconf in conf:
         subgraderconf = subgraderconf.copy()
@@ -297,6 +325,23 @@ class WeightedSubsectionsGrader(CourseGrader):
             'grade_breakdown': grade_breakdown
         }
 
+    def grade_percents(self, section_percents_by_type, num_learners):
+        """
+        Computes the final percentages of a batch of learners at once.
+
+        section_percents_by_type maps each assignment type to a list holding,
+        for each learner in order, the list of the learner's graded percents
+        for the sections of that type (as in the grade_sheet passed to grade()).
+        Types that are absent are treated as having no sections yet.
+
+        Returns a numpy array with the final percentage of each learner, in
+        order. These are the percents grade() returns, without the breakdowns.
+        """
+        total_percents = numpy.zeros(num_learners)
+        for subgrader, __, weight in self.subgraders:
+            total_percents += subgrader.grade_percents(section_percents_by_type, num_learners) * weight
+        return total_percents
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -354,20 +399,41 @@ class AssignmentFormatGrader(CourseGrader):
         self.starting_index = starting_index
         self.hide_average = hide_average
 
+        # Short labels only depend on the grading policy, so the ones of the
+        # expected sections are formatted once and reused for every learner.
+        # Graders are shared (see grader_from_conf), so this is never mutated.
+        self._short_labels = tuple(self._format_short_label(index) for index in range(min_count))
+
+    def _format_short_label(self, index):
+        """
+        Formats the short label (e.g. "HW 03") of the section at the given 0-based index.
+        """
+        return u"{short_label} {index:02d}".format(index=index + self.starting_index, short_label=self.short_label)
+
+    def _short_label_for(self, index):
+        """
+        Returns the short label of the section at the given 0-based index.
+        """
+        if index < len(self._short_labels):
+            return self._short_labels[index]
+        return self._format_short_label(index)
+
     def total_with_drops(self, breakdown):
         """
         Calculates total score for a section while dropping lowest scores
         """
-        # Create an array of tuples with (index, mark), sorted by mark['percent'] descending
-        sorted_breakdown = sorted(enumerate(breakdown), key=lambda x: -x[1]['percent'])
-
         # A list of the indices of the dropped scores
         dropped_indices = []
         if self.drop_count > 0:
-            dropped_indices = [x[0] for x in sorted_breakdown[-self.drop_count:]]
+            # Sort the indices by percent descending, keeping the original order of ties,
+            # and drop the last ones.
+            sorted_indices = sorted(range(len(breakdown)), key=lambda index: -breakdown[index]['percent'])
+            dropped_indices = sorted_indices[-self.drop_count:]
+
+        dropped = set(dropped_indices)
         aggregate_score = 0
         for index, mark in enumerate(breakdown):
-            if index not in dropped_indices:
+            if index not in dropped:
                 aggregate_score += mark['percent']
 
         if len(breakdown) - self.drop_count > 0:
@@ -375,6 +441,54 @@ class AssignmentFormatGrader(CourseGrader):
 
         return aggregate_score, dropped_indices
 
+    def totals_with_drops(self, section_percents):
+        """
+        Calculates the totals of a batch of learners for this section at once,
+        like total_with_drops does for one learner.
+
+        section_percents is a 2D array-like of shape (number of learners, number
+        of sections) holding the learners' percents for the sections.
+
+        Returns a numpy array with the total of each learner, in order.
+        """
+        section_percents = numpy.asarray(section_percents, dtype=float)
+        num_kept = section_percents.shape[-1] - self.drop_count if section_percents.size else 0
+        if num_kept <= 0:
+            return numpy.zeros(len(section_percents))
+
+        # Zero the lowest scores instead of removing them, so that the kept ones
+        # are summed in the order of their sections, as in total_with_drops.
+        if self.drop_count > 0:
+            dropped_columns = numpy.argsort(-section_percents, axis=1, kind='mergesort')[:, -self.drop_count:]
+            section_percents = section_percents.copy()
+            section_percents[numpy.arange(len(section_percents))[:, None], dropped_columns] = 0.0
+        return section_percents.sum(axis=1) / num_kept
+
+    def grade_percents(self, section_percents_by_type, num_learners):
+        """
+        Computes the percentages of a batch of learners for this assignment type at once.
+
+        section_percents_by_type is as for WeightedSubsectionsGrader.grade_percents.
+        Learners with fewer sections than min_count get placeholder scores of 0,
+        as in grade(). Learners are scored together, one array operation per
+        distinct number of sections.
+
+        Returns a numpy array with the percentage of each learner, in order.
+        """
+        learner_percents = section_percents_by_type.get(self.type) or [[]] * num_learners
+        learners_by_num_sections = defaultdict(list)
+        for learner_index, percents in enumerate(learner_percents):
+            learners_by_num_sections[max(self.min_count, len(percents))].append(learner_index)
+
+        total_percents = numpy.zeros(num_learners)
+        for num_sections, learner_indices in learners_by_num_sections.iteritems():
+            section_percents = numpy.zeros((len(learner_indices), num_sections))
+            for row, learner_index in enumerate(learner_indices):
+                percents = learner_percents[learner_index]
+                section_percents[row, :len(percents)] = percents
+            total_percents[learner_indices] = self.totals_with_drops(section_percents)
+        return total_percents
+
     def grade(self, grade_sheet, generate_random_scores=False):
         scores = grade_sheet.get(self.type, {}).values()
         breakdown = []
@@ -407,10 +521,7 @@ class AssignmentFormatGrader(CourseGrader):
                     index=i + self.starting_index,
                     section_type=self.section_type
                 )
-            short_label = u"{short_label} {index:02d}".format(
-                index=i + self.starting_index,
-                short_label=self.short_label
-            )
+            short_label = self._short_label_for(i)
 
             breakdown.append({'percent': percentage, 'label': short_label,
                               'detail': summary, 'category': self.category})
@@ -1,5 +1,6 @@
 import sys
 import logging
+from collections import OrderedDict
 
 from contracts import contract, new_contract
 from fs.osfs import OSFS
@@ -41,6 +42,9 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
     Computes the settings (nee 'metadata') inheritance upon creation.
     """
+    # Maximum number of definitions fetched together by get_definition.
+    DEFINITION_BATCH_SIZE = 100
+
     @contract(course_entry=CourseEnvelope)
     def __init__(self, modulestore, course_entry, default_class, module_data, lazy, **kwargs):
         """
@@ -84,6 +88,12 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
 
+        # Ids of the definitions that lazily loaded blocks will need, in the
+        # order the blocks were loaded, and the definitions that were fetched
+        # along with another one but were not used yet (see get_definition).
+        self._pending_definition_ids = OrderedDict()
+        self._prefetched_definitions = {}
+
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
     def _parent_map(self):
@@ -159,6 +169,39 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         return json_data
 
+    def get_definition(self, course_key, definition_id):
+        """
+        Returns the given definition for a lazily loaded block.
+
+        When a block needs a definition that was not prefetched, the
+        definitions of up to DEFINITION_BATCH_SIZE - 1 other blocks that were
+        loaded without theirs are fetched along with it, in a single query, so
+        that walking a whole course does not query the definitions one block
+        at a time. Only one batch is held at once: the definitions left unused
+        from the previous batch are dropped, and their ids are pending again.
+        """
+        definition = self._prefetched_definitions.pop(definition_id, None)
+        if definition is not None:
+            return definition
+
+        for unused_definition_id in self._prefetched_definitions:
+            self._pending_definition_ids[unused_definition_id] = None
+        self._prefetched_definitions = {}
+
+        self._pending_definition_ids.pop(definition_id, None)
+        batch_definition_ids = [definition_id]
+        while self._pending_definition_ids and len(batch_definition_ids) < self.DEFINITION_BATCH_SIZE:
+            batch_definition_ids.append(self._pending_definition_ids.popitem(last=False)[0])
+        for fetched_definition in self.modulestore.get_definitions(course_key, batch_definition_ids):
+            self._prefetched_definitions[fetched_definition['_id']] = fetched_definition
+
+        definition = self._prefetched_definitions.pop(definition_id, None)
+        if definition is None:
+            # not found in the batch, e.g. a definition id that is not an
+            # ObjectId; fall back to fetching it alone.
+            definition = self.modulestore.get_definition(course_key, definition_id)
+        return definition
+
     # xblock's runtime does not always pass enough contextual information to figure out
     # which named container (course x branch) or which parent is requesting an item. Because split allows
     # a many:1 mapping from named containers to structures and because item's identities encode
@@ -198,7 +241,9 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 block_key.type,
                 definition_id,
                 convert_fields,
+                runtime=self,
             )
+            self._pending_definition_ids[definition_id] = None
         else:
             definition_loader = None
 
@@ -32,6 +32,7 @@ from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import mock_tab_from_json
@@ -1121,6 +1122,44 @@ class SplitModuleItemTests(SplitModuleTest):
         with self.assertRaises(ItemNotFoundError):
             modulestore().get_item(course.location.for_branch(BRANCH_NAME_PUBLISHED))
 
+    def test_lazy_definitions_fetched_together(self):
+        """
+        The definitions of lazily loaded blocks are fetched in a single query
+        when the first of them is needed.
+        """
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        problems = modulestore().get_items(locator, qualifiers={'category': 'problem'})
+        self.assertEqual(len(problems), 3)
+
+        db_connection = modulestore().db_connection
+        with patch.object(db_connection, 'get_definitions', wraps=db_connection.get_definitions) as get_definitions:
+            with patch.object(db_connection, 'get_definition', wraps=db_connection.get_definition) as get_definition:
+                for problem in problems:
+                    problem.data  # pylint: disable=pointless-statement
+        self.assertEqual(get_definitions.call_count, 1)
+        self.assertFalse(get_definition.called)
+
+    def test_lazy_definitions_fetched_in_batches(self):
+        """
+        The definitions of lazily loaded blocks are fetched at most
+        DEFINITION_BATCH_SIZE at a time, and are not kept once used.
+        """
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        problems = modulestore().get_items(locator, qualifiers={'category': 'problem'})
+        self.assertEqual(len(problems), 3)
+
+        db_connection = modulestore().db_connection
+        with patch.object(CachingDescriptorSystem, 'DEFINITION_BATCH_SIZE', 2):
+            with patch.object(db_connection, 'get_definitions', wraps=db_connection.get_definitions) as get_definitions:
+                for problem in problems:
+                    problem.data  # pylint: disable=pointless-statement
+        self.assertGreaterEqual(get_definitions.call_count, 2)
+        for call in get_definitions.call_args_list:
+            self.assertLessEqual(len(call[0][0]), 2)
+        for problem in problems:
+            prefetched_definitions = problem.runtime._prefetched_definitions  # pylint: disable=protected-access
+            self.assertNotIn(problem.definition_locator.definition_id, prefetched_definitions)
+
     def test_get_non_root(self):
         # not a course obj
         locator = BlockUsageLocator(
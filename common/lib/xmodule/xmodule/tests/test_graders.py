@@ -303,6 +303,61 @@ class GraderTest(unittest.TestCase):
         self.assertAlmostEqual(graded['percent'], 0.11)
         self.assertEqual(len(graded['section_breakdown']), 12 + 1)
 
+    def test_grader_from_conf_is_compiled_once(self):
+        conf = [{'type': "Homework", 'min_count': 12, 'drop_count': 2, 'weight': 1.0}]
+        self.assertIs(graders.grader_from_conf(conf), graders.grader_from_conf(list(conf)))
+        self.assertIsNot(
+            graders.grader_from_conf(conf),
+            graders.grader_from_conf([dict(conf[0], drop_count=1)]),
+        )
+
+    def test_grade_percents(self):
+        homework_grader = graders.AssignmentFormatGrader("Homework", 12, 2)
+        lab_grader = graders.AssignmentFormatGrader("Lab", 3, 2)
+        midterm_grader = graders.AssignmentFormatGrader("Midterm", 1, 0)
+        weighted_grader = graders.WeightedSubsectionsGrader([
+            (homework_grader, homework_grader.category, 0.25),
+            (lab_grader, lab_grader.category, 0.25),
+            (midterm_grader, midterm_grader.category, 0.5),
+        ])
+
+        gradesheets = [self.test_gradesheet, self.incomplete_gradesheet, self.empty_gradesheet]
+        section_percents_by_type = {
+            assignment_type: [
+                [grade.percent_graded for grade in gradesheet.get(assignment_type, {}).values()]
+                for gradesheet in gradesheets
+            ]
+            for assignment_type in self.test_gradesheet
+        }
+
+        for subgrader, __, __ in weighted_grader.subgraders:
+            percents = subgrader.grade_percents(section_percents_by_type, len(gradesheets))
+            for percent, gradesheet in zip(percents, gradesheets):
+                self.assertAlmostEqual(percent, subgrader.grade(gradesheet)['percent'])
+
+        percents = weighted_grader.grade_percents(section_percents_by_type, len(gradesheets))
+        self.assertEqual(len(percents), len(gradesheets))
+        for percent, gradesheet in zip(percents, gradesheets):
+            self.assertAlmostEqual(percent, weighted_grader.grade(gradesheet)['percent'])
+
+        self.assertEqual(list(midterm_grader.grade_percents({}, 2)), [0.0, 0.0])
+
+    def test_totals_with_drops(self):
+        lab_grader = graders.AssignmentFormatGrader("Lab", 3, 2)
+        section_percents = [[0.5, 1.0, 0.2, 1.0], [0.0, 0.0, 0.0, 0.0], [1.0, 0.5, 0.5, 0.25]]
+        totals = lab_grader.totals_with_drops(section_percents)
+        for total, percents in zip(totals, section_percents):
+            expected, __ = lab_grader.total_with_drops([{'percent': percent} for percent in percents])
+            self.assertAlmostEqual(total, expected)
+        self.assertEqual(list(lab_grader.totals_with_drops([[1.0, 1.0]])), [0.0])
+        self.assertEqual(list(lab_grader.totals_with_drops([])), [])
+
+    def test_short_labels_not_mutated(self):
+        grader = graders.AssignmentFormatGrader("Homework", 2, 0, short_label="HW")
+        self.assertEqual(grader._short_label_for(1), u"HW 02")  # pylint: disable=protected-access
+        self.assertEqual(grader._short_label_for(4), u"HW 05")  # pylint: disable=protected-access
+        self.assertEqual(grader._short_labels, (u"HW 01", u"HW 02"))  # pylint: disable=protected-access
+
     @ddt.data(
         (
             # empty
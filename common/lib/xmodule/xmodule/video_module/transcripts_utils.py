@@ -4,9 +4,12 @@ Utility functions for transcripts.
 """
 from functools import wraps
 from django.conf import settings
+from django.core.cache import cache
 import os
 import copy
+import hashlib
 import json
+import numpy
 import requests
 import logging
 from pysrt import SubRipTime, SubRipItem, SubRipFile
@@ -33,6 +36,9 @@ log = logging.getLogger(__name__)
 
 NON_EXISTENT_TRANSCRIPT = 'non_existent_dummy_file_name'
 
+TRANSCRIPT_CACHE_KEY_PREFIX = u'video_module.transcripts'
+TRANSCRIPT_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 class TranscriptException(Exception):  # pylint: disable=missing-docstring
     pass
@@ -87,18 +93,25 @@ def generate_subs(speed, source_speed, source_subs):
 
     coefficient = 1.0 * speed / source_speed
     subs = {
-        'start': [
-            int(round(timestamp * coefficient)) for
-            timestamp in source_subs['start']
-        ],
-        'end': [
-            int(round(timestamp * coefficient)) for
-            timestamp in source_subs['end']
-        ],
+        'start': _scale_timestamps(source_subs['start'], coefficient).tolist(),
+        'end': _scale_timestamps(source_subs['end'], coefficient).tolist(),
         'text': source_subs['text']}
     return subs
 
 
+def _scale_timestamps(timestamps, coefficient):
+    """
+    Returns the given timestamps multiplied by coefficient as an integer
+    numpy array, rounding halves away from zero as python's `round` does.
+    """
+    scaled = numpy.asarray(timestamps, dtype=numpy.float64) * coefficient
+    truncated = numpy.trunc(scaled)
+    rounded = numpy.rint(scaled)
+    halves = numpy.abs(scaled - truncated) == 0.5
+    rounded[halves] = (truncated + numpy.sign(scaled))[halves]
+    return rounded.astype(numpy.int64)
+
+
 def save_to_store(content, name, mime_type, location):
     """
     Save named content to store by location.
@@ -122,11 +135,18 @@ def save_subs_to_store(subs, subs_id, item, language='en'):
 
     Returns: location of saved subtitles.
     """
-    filedata = json.dumps(subs, indent=2)
+    filedata = _sjson_filedata(subs)
     filename = subs_filename(subs_id, language)
     return save_to_store(filedata, filename, 'application/json', item.location)
 
 
+def _sjson_filedata(subs):
+    """
+    Returns the content of the sjson file that `subs` are saved to.
+    """
+    return json.dumps(subs, indent=2)
+
+
 def youtube_video_transcript_name(youtube_text_api):
     """
     Get the transcript name from available transcripts of video
@@ -276,6 +296,11 @@ def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, langua
             language
         )
 
+    # Once all the speeds are saved, the conversions of the speed 1.0
+    # transcript are prebuilt. The other speeds are converted on first read.
+    if 1 in speed_subs:
+        Transcript.prebuild(_sjson_filedata(generate_subs(1, 1, subs)), Transcript.SJSON)
+
     return subs
 
 
@@ -597,6 +622,57 @@ def get_available_transcript_languages(edx_video_id):
     return available_languages
 
 
+def get_available_transcript_languages_for_videos(edx_video_ids):
+    """
+    Gets available transcript languages for several videos with a single query.
+
+    Arguments:
+        edx_video_ids(iterable): edx-val's video identifiers
+
+    Returns:
+        A dict mapping each edx_video_id to the list of its transcript language codes.
+        Videos without any edx-val transcript are left out.
+    """
+    available_languages = {}
+    edx_video_ids = set(filter(None, (clean_video_id(edx_video_id) for edx_video_id in edx_video_ids)))
+    if edxval_api and edx_video_ids:
+        # edx-val's api only looks up one video at a time, so query its model directly.
+        from edxval.models import VideoTranscript
+        video_transcripts = VideoTranscript.objects.filter(
+            video__edx_video_id__in=edx_video_ids
+        ).values_list(
+            'video__edx_video_id', 'language_code'
+        )
+        for edx_video_id, language_code in video_transcripts:
+            available_languages.setdefault(edx_video_id, []).append(language_code)
+
+    return available_languages
+
+
+def add_val_transcript_languages(transcripts, transcript_languages):
+    """
+    Returns a copy of the transcripts dict with the given edx-val transcript languages added.
+
+    Arguments:
+        transcripts (dict): A dict with all transcripts and a sub.
+        transcript_languages (list): edx-val transcript language codes of the video.
+    """
+    sub, other_lang = transcripts["sub"], dict(transcripts["transcripts"])
+    # HACK Warning! this is temporary and will be removed once edx-val take over the
+    # transcript module and contentstore will only function as fallback until all the
+    # data is migrated to edx-val.
+    for language_code in transcript_languages:
+        if language_code == 'en' and not sub:
+            sub = NON_EXISTENT_TRANSCRIPT
+        elif not other_lang.get(language_code):
+            other_lang[language_code] = NON_EXISTENT_TRANSCRIPT
+
+    return {
+        "sub": sub,
+        "transcripts": other_lang,
+    }
+
+
 def convert_video_transcript(file_name, content, output_format):
     """
     Convert video transcript into desired format
@@ -617,6 +693,124 @@ def convert_video_transcript(file_name, content, output_format):
     return dict(filename=filename, content=converted_transcript)
 
 
+def get_default_transcript_language(transcripts, preferred_language):
+    """
+    Returns the language in which a video's transcript is shown by default.
+
+    Arguments:
+        transcripts (dict): A dict with all transcripts and a sub.
+        preferred_language (unicode): The learner's preferred transcript language.
+    """
+    sub, other_lang = transcripts["sub"], transcripts["transcripts"]
+    if preferred_language in other_lang:
+        transcript_language = preferred_language
+    elif sub:
+        transcript_language = u'en'
+    elif len(other_lang) > 0:
+        transcript_language = sorted(other_lang)[0]
+    else:
+        transcript_language = u'en'
+    return transcript_language
+
+
+class TranscriptCacheEntry(object):
+    """
+    Cached conversions of a single transcript.
+
+    Entries are keyed by a digest of the transcript content and its input
+    format, so a re-uploaded transcript never reads the outputs of its
+    previous version.  Converted outputs are kept by (output format, speed)
+    and the speed 1.0 timings are kept as packed float arrays, from which
+    sjson outputs for other speeds are scaled without parsing the transcript
+    again.
+    """
+    def __init__(self, content, input_format, cached_data=None):
+        self.content = content
+        self.input_format = input_format
+        cached_data = cached_data or {}
+        self.timings = cached_data.get('timings')
+        self.outputs = cached_data.get('outputs', {})
+
+    @classmethod
+    def get(cls, content, input_format):
+        """
+        Returns the entry for the given transcript content, as cached so far.
+        """
+        return cls(content, input_format, cache.get(cls.cache_key(content, input_format)))
+
+    @staticmethod
+    def cache_key(content, input_format):
+        """
+        Returns the cache key for the given transcript content.
+        """
+        if isinstance(content, text_type):
+            content = content.encode('utf-8')
+        return u'{prefix}.{input_format}.{digest}'.format(
+            prefix=TRANSCRIPT_CACHE_KEY_PREFIX,
+            input_format=input_format,
+            digest=hashlib.sha1(content).hexdigest(),
+        )
+
+    def save(self):
+        """
+        Stores the timings and outputs converted so far in the cache.
+        """
+        cache.set(
+            self.cache_key(self.content, self.input_format),
+            {'timings': self.timings, 'outputs': self.outputs},
+            TRANSCRIPT_CACHE_TIMEOUT,
+        )
+
+    def output(self, output_format, speed=1.0, save=True):
+        """
+        Returns the transcript converted to `output_format` at `speed`,
+        converting and caching it if it wasn't already.
+        """
+        if output_format == self.input_format and speed == 1.0:
+            return self.content
+
+        output_key = (output_format, speed)
+        if output_key not in self.outputs:
+            if speed == 1.0:
+                self.outputs[output_key] = Transcript._convert(  # pylint: disable=protected-access
+                    self.content, self.input_format, output_format
+                )
+            else:
+                start, end, text = self.get_timings()
+                self.outputs[output_key] = json.dumps({
+                    'start': _scale_timestamps(start, speed).tolist(),
+                    'end': _scale_timestamps(end, speed).tolist(),
+                    'text': text,
+                })
+            if save:
+                self.save()
+        return self.outputs[output_key]
+
+    def get_timings(self):
+        """
+        Returns the speed 1.0 start and end timestamps as float arrays,
+        along with the texts of the transcript.
+        """
+        if self.timings is None:
+            subs = json.loads(self.output(Transcript.SJSON, save=False))
+            self.timings = (
+                numpy.asarray(subs['start'], dtype=numpy.float64).tostring(),
+                numpy.asarray(subs['end'], dtype=numpy.float64).tostring(),
+                subs['text'],
+            )
+        start, end, text = self.timings
+        return _unpack_timestamps(start), _unpack_timestamps(end), text
+
+
+def _unpack_timestamps(packed):
+    """
+    Returns the float array packed in the given string.
+    """
+    if not packed:
+        return numpy.empty(0, dtype=numpy.float64)
+    return numpy.frombuffer(packed, dtype=numpy.float64)
+
+
 class Transcript(object):
     """
     Container for transcript methods.
@@ -631,19 +825,46 @@ class Transcript(object):
     }
 
     @staticmethod
-    def convert(content, input_format, output_format):
+    def convert(content, input_format, output_format, speed=1.0):
         """
         Convert transcript `content` from `input_format` to `output_format`.
 
         Accepted input formats: sjson, srt.
         Accepted output format: srt, txt, sjson.
 
+        For sjson output, timings are scaled from speed 1.0 to `speed`.
+        Converted transcripts are cached by content, see `TranscriptCacheEntry`.
+
         Raises:
             TranscriptsGenerationException: On parsing the invalid srt content during conversion from srt to sjson.
         """
         assert input_format in ('srt', 'sjson')
         assert output_format in ('txt', 'srt', 'sjson')
+        assert speed == 1.0 or output_format == 'sjson'
+
+        if input_format == output_format and speed == 1.0:
+            return content
+
+        return TranscriptCacheEntry.get(content, input_format).output(output_format, speed)
 
+    @staticmethod
+    def prebuild(content, input_format):
+        """
+        Caches the conversions of `content` to every output format at speed
+        1.0, so that they are readily available to later requests.
+        """
+        entry = TranscriptCacheEntry.get(content, input_format)
+        for output_format in (Transcript.SRT, Transcript.TXT, Transcript.SJSON):
+            entry.output(output_format, save=False)
+        entry.get_timings()
+        entry.save()
+
+    @staticmethod
+    def _convert(content, input_format, output_format):
+        """
+        Uncached conversion of transcript `content` from `input_format` to
+        `output_format`, see `convert`.
+        """
         if input_format == output_format:
             return content
 
@@ -826,18 +1047,9 @@ class VideoTranscriptsMixin(object):
         Args:
             transcripts (dict): A dict with all transcripts and a sub.
         """
-        sub, other_lang = transcripts["sub"], transcripts["transcripts"]
-        if self.transcript_language in other_lang:
-            transcript_language = self.transcript_language
-        elif sub:
-            transcript_language = u'en'
-        elif len(other_lang) > 0:
-            transcript_language = sorted(other_lang)[0]
-        else:
-            transcript_language = u'en'
-        return transcript_language
+        return get_default_transcript_language(transcripts, self.transcript_language)
 
-    def get_transcripts_info(self, is_bumper=False):
+    def get_transcripts_info(self, is_bumper=False, include_val_transcripts=True):
         """
         Returns a transcript dictionary for the video.
 
@@ -857,24 +1069,18 @@ class VideoTranscriptsMixin(object):
             language_code: transcript_file
             for language_code, transcript_file in transcripts.items() if transcript_file != ''
         }
-
-        # bumper transcripts are stored in content store so we don't need to include val transcripts
-        if not is_bumper:
-            transcript_languages = get_available_transcript_languages(edx_video_id=self.edx_video_id)
-            # HACK Warning! this is temporary and will be removed once edx-val take over the
-            # transcript module and contentstore will only function as fallback until all the
-            # data is migrated to edx-val.
-            for language_code in transcript_languages:
-                if language_code == 'en' and not sub:
-                    sub = NON_EXISTENT_TRANSCRIPT
-                elif not transcripts.get(language_code):
-                    transcripts[language_code] = NON_EXISTENT_TRANSCRIPT
-
-        return {
+        transcripts_info = {
             "sub": sub,
             "transcripts": transcripts,
         }
 
+        # bumper transcripts are stored in content store so we don't need to include val transcripts
+        if include_val_transcripts and not is_bumper:
+            transcript_languages = get_available_transcript_languages(edx_video_id=self.edx_video_id)
+            transcripts_info = add_val_transcript_languages(transcripts_info, transcript_languages)
+
+        return transcripts_info
+
 
 @exception_decorator
 def get_transcript_from_val(edx_video_id, lang=None, output_format=Transcript.SRT):
@@ -982,8 +1188,11 @@ def get_transcript_from_contentstore(video, language, output_format, transcripts
 
     if youtube_id:
         youtube_ids = youtube_speed_dict(video)
-        transcript_content = json.dumps(
-            generate_subs(youtube_ids.get(youtube_id, 1), 1, json.loads(transcript_content))
+        transcript_content = Transcript.convert(
+            transcript_content,
+            input_format=Transcript.SJSON,
+            output_format=Transcript.SJSON,
+            speed=youtube_ids.get(youtube_id, 1),
         )
 
     return transcript_content, transcript_name, Transcript.mime_types[output_format]
@@ -185,6 +185,58 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
     return cert.status
 
 
+def generate_user_certificates_in_bulk(students, course_key, course=None, insecure=False, generation_mode='batch',
+                                       collected_block_structure=None):
+    """
+    Generates certificates for several students of a course, like calling
+    `generate_user_certificates` for each of them, but grading them
+    together and adding the certificate generation tasks to the xqueue
+    once all their certificates are saved.
+
+    Args:
+        students (list of User)
+        course_key (CourseKey)
+
+    Keyword Arguments:
+        course (Course): Optionally provide the course object; if not provided
+            it will be loaded.
+        insecure - (Boolean)
+        generation_mode - who has requested certificate generation.
+        collected_block_structure: Optionally provide the collected course
+            structure that the students are graded with.
+
+    Returns a dict mapping the ids of the students to their certificate
+    statuses.  Students for whom no certificate was created are left out.
+    """
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+
+    if not course:
+        course = modulestore().get_course(course_key, depth=0)
+
+    generate_pdf = not has_any_active_web_certificate(course)
+
+    certs = xqueue.add_certs(
+        students,
+        course_key,
+        course=course,
+        generate_pdf=generate_pdf,
+        collected_block_structure=collected_block_structure,
+    )
+    for student in students:
+        cert = certs.get(student.id)
+        if cert is not None and CertificateStatuses.is_passing_status(cert.status):
+            emit_certificate_event('created', student, course_key, course, {
+                'user_id': student.id,
+                'course_id': unicode(course_key),
+                'certificate_id': cert.verify_uuid,
+                'enrollment_mode': cert.mode,
+                'generation_mode': generation_mode
+            })
+    return {user_id: cert.status for user_id, cert in certs.iteritems()}
+
+
 def regenerate_user_certificates(student, course_key, course=None,
                                  forced_grade=None, template_file=None, insecure=False):
     """
@@ -6,6 +6,7 @@ from uuid import uuid4
 
 import lxml.html
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse
 from django.test.client import RequestFactory
 from lxml.etree import ParserError, XMLSyntaxError
@@ -17,6 +18,7 @@ from lms.djangoapps.certificates.models import (
     CertificateWhitelist,
     ExampleCertificate,
     GeneratedCertificate,
+    certificate_status,
     certificate_status_for_student
 )
 from course_modes.models import CourseMode
@@ -46,6 +48,26 @@ class XQueueAddToQueueError(Exception):
         )
 
 
+class LocalXQueueInterface(object):
+    """
+    Stand-in for the XQueue client that keeps the submitted tasks in
+    memory instead of sending them to an XQueue server, so certificate
+    generation can be exercised locally and in tests.
+
+    It can be passed to `XQueueCertInterface` as its `xqueue_interface`.
+    """
+
+    def __init__(self, url=None, django_auth=None, requests_auth=None):  # pylint: disable=unused-argument
+        self.submissions = []
+
+    def send_to_queue(self, header, body, files_to_upload=None):  # pylint: disable=unused-argument
+        """
+        Records the task and reports success like XQueue does.
+        """
+        self.submissions.append((json.loads(header), json.loads(body)))
+        return (0, 'Queued')
+
+
 class XQueueCertInterface(object):
     """
     XQueueCertificateInterface provides an
@@ -65,6 +87,11 @@ class XQueueCertInterface(object):
                    view which will save the certificate
                    download URL.
 
+       add_certs:  Add new certificates for several students
+                   of a course.  Grades the students together
+                   and puts the requests on the queue once all
+                   the certificates are saved.
+
        regen_cert: Regenerate an existing certificate.
                    For a user that already has a certificate
                    this will delete the existing one and
@@ -77,7 +104,21 @@ class XQueueCertInterface(object):
 
     """
 
-    def __init__(self, request=None):
+    # Statuses of the certificates that add_cert may replace.
+    VALID_STATUSES = [
+        status.generating,
+        status.unavailable,
+        status.deleted,
+        status.error,
+        status.notpassing,
+        status.downloadable,
+        status.auditing,
+        status.audit_passing,
+        status.audit_notpassing,
+        status.unverified,
+    ]
+
+    def __init__(self, request=None, xqueue_interface=None):
 
         # Get basic auth (username/password) for
         # xqueue connection if it's in the settings
@@ -94,11 +135,13 @@ class XQueueCertInterface(object):
         else:
             self.request = request
 
-        self.xqueue_interface = XQueueInterface(
-            settings.XQUEUE_INTERFACE['url'],
-            settings.XQUEUE_INTERFACE['django_auth'],
-            requests_auth,
-        )
+        if xqueue_interface is None:
+            xqueue_interface = XQueueInterface(
+                settings.XQUEUE_INTERFACE['url'],
+                settings.XQUEUE_INTERFACE['django_auth'],
+                requests_auth,
+            )
+        self.xqueue_interface = xqueue_interface
         self.whitelist = CertificateWhitelist.objects.all()
         self.restricted = UserProfile.objects.filter(allow_certificate=False)
         self.use_https = True
@@ -224,23 +267,10 @@ class XQueueCertInterface(object):
             )
             return None
 
-        valid_statuses = [
-            status.generating,
-            status.unavailable,
-            status.deleted,
-            status.error,
-            status.notpassing,
-            status.downloadable,
-            status.auditing,
-            status.audit_passing,
-            status.audit_notpassing,
-            status.unverified,
-        ]
-
         cert_status = certificate_status_for_student(student, course_id)['status']
         cert = None
 
-        if cert_status not in valid_statuses:
+        if cert_status not in self.VALID_STATUSES:
             LOGGER.warning(
                 (
                     u"Cannot create certificate generation task for user %s "
@@ -250,7 +280,7 @@ class XQueueCertInterface(object):
                 student.id,
                 unicode(course_id),
                 cert_status,
-                unicode(valid_statuses)
+                unicode(self.VALID_STATUSES)
             )
             return None
 
@@ -261,7 +291,6 @@ class XQueueCertInterface(object):
             course = modulestore().get_course(course_id, depth=0)
 
         profile = UserProfile.objects.get(user=student)
-        profile_name = profile.name
 
         # Needed for access control in grading.
         self.request.user = student
@@ -270,8 +299,131 @@ class XQueueCertInterface(object):
         is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
         course_grade = CourseGradeFactory().read(student, course)
         enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
-        mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         user_is_verified = IDVerificationService.user_is_verified(student)
+        is_restricted = self.restricted.filter(user=student).exists()
+
+        cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+        cert, contents = self._update_cert(
+            cert, student, course, course_grade, profile.name, enrollment_mode,
+            is_whitelisted, user_is_verified, is_restricted,
+            forced_grade=forced_grade, template_file=template_file, generate_pdf=generate_pdf,
+        )
+        if contents is not None:
+            self._submit_cert(cert, contents)
+        return cert
+
+    def add_certs(self, students, course_id, course=None, generate_pdf=True, collected_block_structure=None):
+        """
+        Request new certificates for several students of a course.
+
+        Behaves like calling `add_cert` for each student, but the students
+        are graded together against a single collected course structure,
+        the data needed to decide on their certificates is read with one
+        query per table, the missing certificates are created together,
+        and the PDF generation tasks are added to the queue only once all
+        the certificates are saved.  Callers adding certificates in several
+        calls can pass the collected course structure to grade all of them
+        with it.
+
+        Returns a dict mapping the ids of the students to their newly
+        created certificate instances.  Students whose certificate status
+        does not allow a new certificate, or who could not be graded, are
+        left out.
+        """
+        if hasattr(course_id, 'ccx'):
+            LOGGER.warning(
+                u"Cannot create certificate generation tasks in the course '%s'; "
+                u"certificates are not allowed for CCX courses.",
+                unicode(course_id)
+            )
+            return {}
+
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+
+        existing_certs = {
+            cert.user_id: cert
+            for cert in GeneratedCertificate.objects.filter(user__in=students, course_id=course_id)
+        }
+        students = [
+            student for student in students
+            if certificate_status(existing_certs.get(student.id))['status'] in self.VALID_STATUSES
+        ]
+        if not students:
+            return {}
+
+        course_grades = []
+        for student, course_grade, error in CourseGradeFactory().iter(
+                students, course=course, collected_block_structure=collected_block_structure,
+        ):
+            if course_grade is None:
+                LOGGER.warning(
+                    (
+                        u"Cannot create certificate generation task for user %s "
+                        u"in the course '%s'; "
+                        u"grading the student failed with '%s'."
+                    ),
+                    student.id,
+                    unicode(course_id),
+                    error
+                )
+            else:
+                course_grades.append((student, course_grade))
+        students = [student for student, __ in course_grades]
+
+        profile_names = dict(UserProfile.objects.filter(user__in=students).values_list('user_id', 'name'))
+        whitelisted_ids = set(self.whitelist.filter(
+            user__in=students, course_id=course_id, whitelist=True,
+        ).values_list('user_id', flat=True))
+        verified_ids = {verification.user_id for verification in IDVerificationService.get_verified_users(students)}
+        restricted_ids = set(self.restricted.filter(user__in=students).values_list('user_id', flat=True))
+        CourseEnrollment.bulk_fetch_enrollment_states(students, course_id)
+
+        missing_certs = [
+            GeneratedCertificate(user=student, course_id=course_id)
+            for student in students if student.id not in existing_certs
+        ]
+        if missing_certs:
+            with transaction.atomic():
+                GeneratedCertificate.objects.bulk_create(missing_certs)
+            existing_certs.update(
+                (cert.user_id, cert) for cert in GeneratedCertificate.objects.filter(
+                    user__in=[cert.user_id for cert in missing_certs], course_id=course_id,
+                )
+            )
+
+        # Each certificate is saved in its own transaction, as in add_cert:
+        # the certificate signals queue tasks that must see the saved
+        # certificate, and a failing student must not roll back the others.
+        certs = {}
+        pending_contents = []
+        for student, course_grade in course_grades:
+            enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+            cert, contents = self._update_cert(
+                existing_certs[student.id], student, course, course_grade, profile_names[student.id],
+                enrollment_mode, student.id in whitelisted_ids, student.id in verified_ids,
+                student.id in restricted_ids, generate_pdf=generate_pdf,
+            )
+            certs[student.id] = cert
+            if contents is not None:
+                pending_contents.append((cert, contents))
+
+        for cert, contents in pending_contents:
+            self._submit_cert(cert, contents)
+        return certs
+
+    def _update_cert(self, cert, student, course, course_grade, profile_name, enrollment_mode,
+                     is_whitelisted, user_is_verified, is_restricted,
+                     forced_grade=None, template_file=None, generate_pdf=True):
+        """
+        Decide on the certificate of a student from their grade, enrollment,
+        whitelisting, verification and restriction, and save it.
+
+        Returns the certificate and, if it needs a PDF, the contents of
+        its generation task, which the caller adds to the queue.
+        """
+        course_id = course.id
+        mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         cert_mode = enrollment_mode
         is_eligible_for_certificate = is_whitelisted or CourseMode.is_eligible_for_certificate(enrollment_mode)
         unverified = False
@@ -310,8 +462,6 @@ class XQueueCertInterface(object):
             generate_pdf
         )
 
-        cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
-
         cert.mode = cert_mode
         cert.user = student
         cert.grade = course_grade.percent
@@ -364,7 +514,7 @@ class XQueueCertInterface(object):
                 student.id,
                 enrollment_mode
             )
-            return cert
+            return cert, None
         # If they are not passing, short-circuit and don't generate cert
         elif not passing:
             cert.status = status.notpassing
@@ -380,12 +530,12 @@ class XQueueCertInterface(object):
                 unicode(course_id),
                 cert.status
             )
-            return cert
+            return cert, None
 
         # Check to see whether the student is on the the embargoed
         # country restricted list. If so, they should not receive a
         # certificate -- set their status to restricted and log it.
-        if self.restricted.filter(user=student).exists():
+        if is_restricted:
             cert.status = status.restricted
             cert.save()
 
@@ -400,7 +550,7 @@ class XQueueCertInterface(object):
                 cert.status,
                 unicode(course_id)
             )
-            return cert
+            return cert, None
 
         if unverified:
             cert.status = status.unverified
@@ -414,15 +564,15 @@ class XQueueCertInterface(object):
                 student.id,
                 unicode(course_id),
             )
-            return cert
+            return cert, None
 
-        # Finally, generate the certificate and send it off.
+        # Finally, generate the certificate.
         return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
 
     def _generate_cert(self, cert, course, student, grade_contents, template_pdf, generate_pdf):
         """
         Generate a certificate for the student. If `generate_pdf` is True,
-        sends a request to XQueue.
+        also returns the contents of the XQueue task that generates its PDF.
         """
         course_id = unicode(course.id)
 
@@ -446,33 +596,37 @@ class XQueueCertInterface(object):
         cert.save()
         logging.info(u'certificate generated for user: %s with generate_pdf status: %s',
                      student.username, generate_pdf)
+        return cert, (contents if generate_pdf else None)
 
-        if generate_pdf:
-            try:
-                self._send_to_xqueue(contents, key)
-            except XQueueAddToQueueError as exc:
-                cert.status = ExampleCertificate.STATUS_ERROR
-                cert.error_reason = unicode(exc)
-                cert.save()
-                LOGGER.critical(
-                    (
-                        u"Could not add certificate task to XQueue.  "
-                        u"The course was '%s' and the student was '%s'."
-                        u"The certificate task status has been marked as 'error' "
-                        u"and can be re-submitted with a management command."
-                    ), course_id, student.id
-                )
-            else:
-                LOGGER.info(
-                    (
-                        u"The certificate status has been set to '%s'.  "
-                        u"Sent a certificate grading task to the XQueue "
-                        u"with the key '%s'. "
-                    ),
-                    cert.status,
-                    key
-                )
-        return cert
+    def _submit_cert(self, cert, contents):
+        """
+        Add the PDF generation task of a certificate to the queue.
+        If that fails, the certificate status is set to 'error'.
+        """
+        try:
+            self._send_to_xqueue(contents, cert.key)
+        except XQueueAddToQueueError as exc:
+            cert.status = ExampleCertificate.STATUS_ERROR
+            cert.error_reason = unicode(exc)
+            cert.save()
+            LOGGER.critical(
+                (
+                    u"Could not add certificate task to XQueue.  "
+                    u"The course was '%s' and the student was '%s'."
+                    u"The certificate task status has been marked as 'error' "
+                    u"and can be re-submitted with a management command."
+                ), cert.course_id, cert.user_id
+            )
+        else:
+            LOGGER.info(
+                (
+                    u"The certificate status has been set to '%s'.  "
+                    u"Sent a certificate grading task to the XQueue "
+                    u"with the key '%s'. "
+                ),
+                cert.status,
+                cert.key
+            )
 
     def add_example_cert(self, example_cert):
         """Add a task to create an example certificate.
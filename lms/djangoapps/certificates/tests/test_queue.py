@@ -20,7 +20,7 @@ from opaque_keys.edx.locator import CourseLocator
 # in our `XQueueCertInterface` implementation.
 from capa.xqueue_interface import XQueueInterface
 from lms.djangoapps.certificates.models import CertificateStatuses, ExampleCertificate, ExampleCertificateSet, GeneratedCertificate
-from lms.djangoapps.certificates.queue import XQueueCertInterface
+from lms.djangoapps.certificates.queue import LocalXQueueInterface, XQueueCertInterface
 from lms.djangoapps.certificates.tests.factories import CertificateWhitelistFactory, GeneratedCertificateFactory
 from course_modes.models import CourseMode
 from lms.djangoapps.grades.tests.utils import mock_passing_grade
@@ -278,6 +278,42 @@ class XQueueCertInterfaceAddCertificateTest(ModuleStoreTestCase):
             expected_status
         )
 
+    def test_add_certs(self):
+        """
+        Test that certificates of several students are generated together
+        and their tasks are sent to the queue once they are saved.
+        """
+        CourseEnrollmentFactory(user=self.user_2, course_id=self.course.id, is_active=True, mode='verified')
+        restricted_user = UserFactory.create()
+        restricted_user.profile.allow_certificate = False
+        restricted_user.profile.save()
+        CourseEnrollmentFactory(user=restricted_user, course_id=self.course.id, is_active=True, mode='honor')
+        deleting_user = UserFactory.create()
+        GeneratedCertificateFactory(user=deleting_user, course_id=self.course.id, status=CertificateStatuses.deleting)
+
+        local_queue = LocalXQueueInterface()
+        xqueue = XQueueCertInterface(xqueue_interface=local_queue)
+        with mock_passing_grade():
+            certs = xqueue.add_certs([self.user, self.user_2, restricted_user, deleting_user], self.course.id)
+
+        self.assertEqual(
+            {user_id: cert.status for user_id, cert in certs.iteritems()},
+            {
+                self.user.id: CertificateStatuses.generating,
+                self.user_2.id: CertificateStatuses.generating,
+                restricted_user.id: CertificateStatuses.restricted,
+            }
+        )
+        self.assertEqual(certs[self.user_2.id].mode, 'verified')
+        self.assertItemsEqual(
+            [(header['lms_key'], body['username']) for header, body in local_queue.submissions],
+            [(certs[user.id].key, user.username) for user in (self.user, self.user_2)]
+        )
+        self.assertEqual(
+            GeneratedCertificate.objects.get(user=deleting_user, course_id=self.course.id).status,
+            CertificateStatuses.deleting
+        )
+
 
 @attr(shard=1)
 @override_settings(CERT_QUEUE='certificates')
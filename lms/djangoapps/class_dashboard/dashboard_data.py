@@ -1,12 +1,17 @@
 """
 Computes the data to display on the Instructor Dashboard
 """
+import hashlib
 import json
+import uuid
+from datetime import datetime, timedelta
 
+from django.core.cache import cache
 from django.db.models import Count
 from django.utils.translation import ugettext as _
 
 from opaque_keys.edx.locator import BlockUsageLocator
+from pytz import UTC
 from six import text_type
 
 from courseware import models
@@ -18,6 +23,282 @@ from xmodule.modulestore.inheritance import own_metadata
 # Used to limit the length of list displayed to the screen.
 MAX_SCREEN_LIST_LENGTH = 250
 
+# Cached distributions that are older than this are refreshed, in a task,
+# with the student modules that were modified since they were computed.
+DISTRIBUTIONS_REFRESH_INTERVAL = timedelta(minutes=5)
+
+# Cached distributions are fully recomputed after this many seconds, so that
+# deleted student modules are eventually accounted for.
+DISTRIBUTIONS_CACHE_TIMEOUT = 24 * 60 * 60
+
+# The distributions of a course are cached in chunks of this many problems
+# or subsections/sequentials (see _set_chunked_cache_value).
+DISTRIBUTIONS_CACHE_CHUNK_SIZE = 500
+
+
+def get_course_distributions(course_id):
+    """
+    Returns the cached grade and subsection open distributions for the
+    course, computing them if they are not cached for the course's current
+    structure version and scheduling their refresh if they are out of date.
+
+    `course_id` the course ID for the course interested in
+
+    Output is a dict with:
+      'version' - the version of the course's structure
+      'computed_at' - the time as of which the distributions were computed
+      'problem_grades' - a dict where the key is the problem 'module_id' and the value is an
+        array of tuples (`grade`, `max_grade`, `count`) ordered by `grade`
+      'sequential_opens' - a dict mapping the 'module_id' of each subsection/sequential to the
+        number of students that opened it
+    """
+    version = _get_course_version(course_id)
+    cache_key = _distributions_cache_key(course_id, version)
+    distributions = _get_cached_distributions(cache_key)
+    if distributions is None:
+        distributions = _compute_course_distributions(course_id, version)
+        _set_cached_distributions(cache_key, distributions)
+    elif distributions['computed_at'] < datetime.now(UTC) - DISTRIBUTIONS_REFRESH_INTERVAL:
+        # Schedule a single refresh per refresh interval.
+        refresh_timeout = int(DISTRIBUTIONS_REFRESH_INTERVAL.total_seconds())
+        if cache.add(cache_key + u'.refreshing', True, refresh_timeout):
+            from .tasks import update_course_distributions
+            update_course_distributions.delay(text_type(course_id))
+    return distributions
+
+
+def refresh_course_distributions(course_id):
+    """
+    Refreshes the cached distributions of the course: only the problems and
+    subsections/sequentials with student modules that were modified since
+    the distributions were computed are aggregated again.
+
+    `course_id` the course ID for the course interested in
+    """
+    version = _get_course_version(course_id)
+    cache_key = _distributions_cache_key(course_id, version)
+    distributions = _get_cached_distributions(cache_key)
+    if distributions is None:
+        distributions = _compute_course_distributions(course_id, version)
+    else:
+        computed_at = datetime.now(UTC)
+        modified_modules = models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            module_type__in=('problem', 'sequential'),
+            modified__gte=distributions['computed_at'],
+        ).values_list('module_type', 'module_state_key').distinct()
+
+        modified_keys = {'problem': set(), 'sequential': set()}
+        for module_type, module_state_key in modified_modules:
+            modified_keys[module_type].add(module_state_key)
+
+        if modified_keys['problem']:
+            for module_state_key in modified_keys['problem']:
+                distributions['problem_grades'].pop(module_state_key.map_into_course(course_id), None)
+            distributions['problem_grades'].update(
+                _aggregate_problem_grades(course_id, modified_keys['problem'])
+            )
+        if modified_keys['sequential']:
+            distributions['sequential_opens'].update(
+                _aggregate_sequential_opens(course_id, modified_keys['sequential'])
+            )
+        distributions['computed_at'] = computed_at
+
+    _set_cached_distributions(cache_key, distributions)
+
+
+def _compute_course_distributions(course_id, version):
+    """
+    Computes the grade and subsection open distributions for all of the
+    course's student modules. See get_course_distributions.
+    """
+    computed_at = datetime.now(UTC)
+    return {
+        'version': version,
+        'computed_at': computed_at,
+        'problem_grades': _aggregate_problem_grades(course_id),
+        'sequential_opens': _aggregate_sequential_opens(course_id),
+    }
+
+
+def _aggregate_problem_grades(course_id, module_state_keys=None):
+    """
+    Returns a dict mapping the 'module_id' of each problem (of the given
+    problems, or of the course) to an array of tuples (`grade`, `max_grade`,
+    `count`) ordered by `grade`, counted by the database.
+    """
+    db_query = models.StudentModule.objects.filter(
+        course_id__exact=course_id,
+        grade__isnull=False,
+        module_type__exact="problem",
+    )
+    if module_state_keys is None:
+        db_queries = [db_query]
+    else:
+        db_queries = [
+            db_query.filter(module_state_key__in=chunk)
+            for chunk in models.chunks(module_state_keys, 500)
+        ]
+
+    problem_grades = {}
+    for db_query in db_queries:
+        rows = db_query.values(
+            'module_state_key',
+            'grade',
+            'max_grade',
+        ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+
+        curr_key, curr_grades = None, None
+        for row in rows:
+            if row['module_state_key'] != curr_key:
+                curr_key = row['module_state_key']
+                curr_grades = problem_grades.setdefault(curr_key.map_into_course(course_id), [])
+            curr_grades.append((row['grade'], row['max_grade'], row['count_grade']))
+
+    return problem_grades
+
+
+def _aggregate_sequential_opens(course_id, module_state_keys=None):
+    """
+    Returns a dict mapping the 'module_id' of each subsection/sequential (of
+    the given ones, or of the course) to the number of students that opened
+    it, counted by the database.
+    """
+    db_query = models.StudentModule.objects.filter(
+        course_id__exact=course_id,
+        module_type__exact="sequential",
+    )
+    if module_state_keys is None:
+        db_queries = [db_query]
+    else:
+        db_queries = [
+            db_query.filter(module_state_key__in=chunk)
+            for chunk in models.chunks(module_state_keys, 500)
+        ]
+
+    return {
+        row['module_state_key'].map_into_course(course_id): row['count_sequential']
+        for db_query in db_queries
+        for row in db_query.values('module_state_key').annotate(
+            count_sequential=Count('module_state_key')
+        ).order_by()
+    }
+
+
+def _distributions_cache_key(course_id, version):
+    """
+    Returns the key of the cached distributions of the course for the given
+    structure version.
+    """
+    return u'class_dashboard.distributions.{}.{}'.format(course_id, version)
+
+
+def _get_cached_distributions(cache_key):
+    """
+    Returns the distributions cached under the given key by
+    _set_cached_distributions, or None if they are not cached.
+    """
+    fields, items = _get_chunked_cache_value(cache_key)
+    if fields is None:
+        return None
+
+    distributions = dict(fields, problem_grades={}, sequential_opens={})
+    for name, module_id, value in items:
+        distributions[name][module_id] = value
+    return distributions
+
+
+def _set_cached_distributions(cache_key, distributions):
+    """
+    Caches the given distributions under the given key, with their problems
+    and subsections/sequentials split in chunks of DISTRIBUTIONS_CACHE_CHUNK_SIZE.
+    """
+    items = [
+        (name, module_id, value)
+        for name in ('problem_grades', 'sequential_opens')
+        for module_id, value in distributions[name].iteritems()
+    ]
+    fields = {'version': distributions['version'], 'computed_at': distributions['computed_at']}
+    _set_chunked_cache_value(cache_key, fields, items, DISTRIBUTIONS_CACHE_CHUNK_SIZE)
+
+
+def _get_chunked_cache_value(cache_key):
+    """
+    Returns the (fields, items) cached under the given key by
+    _set_chunked_cache_value, or (None, None) if they, or any chunk of the
+    items, are not cached.
+    """
+    cached_value = cache.get(cache_key)
+    if cached_value is None:
+        return None, None
+
+    chunk_keys = [
+        u'{}.{}.{}'.format(cache_key, cached_value['generation'], index)
+        for index in xrange(cached_value['num_chunks'])
+    ]
+    cached_chunks = cache.get_many(chunk_keys)
+    if len(cached_chunks) != len(chunk_keys):
+        return None, None
+    return cached_value['fields'], [item for chunk_key in chunk_keys for item in cached_chunks[chunk_key]]
+
+
+def _set_chunked_cache_value(cache_key, fields, items, chunk_size):
+    """
+    Caches the given dict of fields under the given key, and the given list
+    of items in chunks of chunk_size items, so that no cached value of a
+    large course exceeds the cache's maximum value size.
+
+    The chunks are stored under a new generation before the value that
+    refers to them, so that readers never combine chunks of different
+    computations.
+    """
+    generation = uuid.uuid4().hex
+    chunks = list(models.chunks(items, chunk_size))
+    cache.set_many(
+        {u'{}.{}.{}'.format(cache_key, generation, index): chunk for index, chunk in enumerate(chunks)},
+        DISTRIBUTIONS_CACHE_TIMEOUT,
+    )
+    cache.set(
+        cache_key,
+        {'fields': fields, 'generation': generation, 'num_chunks': len(chunks)},
+        DISTRIBUTIONS_CACHE_TIMEOUT,
+    )
+
+
+def _get_cached_d3_data(name, compute_d3_data, course_id, *args):
+    """
+    Returns the d3 data computed by compute_d3_data for the course and the
+    given arguments, cached until the course's structure or its
+    distributions change.
+    """
+    distributions = get_course_distributions(course_id)
+    distributions_version = u'{}.{}.{}'.format(
+        distributions['version'], distributions['computed_at'].isoformat(), args,
+    )
+    cache_key = u'class_dashboard.{}.{}.{}'.format(
+        name, course_id, hashlib.sha1(distributions_version.encode('utf-8')).hexdigest(),
+    )
+    __, d3_data = _get_chunked_cache_value(cache_key)
+    if d3_data is None:
+        d3_data = compute_d3_data(course_id, *args)
+        # The d3 data is a list with one entry per section (or per problem
+        # of a section), each cached on its own.
+        _set_chunked_cache_value(cache_key, {}, d3_data, 1)
+    return d3_data
+
+
+def _get_course_version(course_id):
+    """
+    Returns a digest of the version of the course's structure, which changes
+    whenever the course is published.
+    """
+    course = modulestore().get_course(course_id, depth=0)
+    version = u'{}.{}'.format(
+        getattr(course, 'course_version', None),
+        getattr(course, 'subtree_edited_on', None),
+    )
+    return hashlib.sha1(version.encode('utf-8')).hexdigest()
+
 
 def get_problem_grade_distribution(course_id):
     """
@@ -32,37 +313,17 @@ def get_problem_grade_distribution(course_id):
       'total_student_count' where the key is problem 'module_id' and the value is number of students
         attempting the problem
     """
-
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
-
     prob_grade_distrib = {}
     total_student_count = {}
 
-    # Loop through resultset building data for each problem
-    for row in db_query:
-        curr_problem = row['module_state_key'].map_into_course(course_id)
-
-        # Build set of grade distributions for each problem that has student responses
-        if curr_problem in prob_grade_distrib:
-            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count_grade']))
-
-            if (prob_grade_distrib[curr_problem]['max_grade'] != row['max_grade']) and \
-                    (prob_grade_distrib[curr_problem]['max_grade'] < row['max_grade']):
-                prob_grade_distrib[curr_problem]['max_grade'] = row['max_grade']
-
-        else:
-            prob_grade_distrib[curr_problem] = {
-                'max_grade': row['max_grade'],
-                'grade_distrib': [(row['grade'], row['count_grade'])]
-            }
+    for curr_problem, grades in get_course_distributions(course_id)['problem_grades'].iteritems():
+        prob_grade_distrib[curr_problem] = {
+            'max_grade': max(max_grade for __, max_grade, __ in grades),
+            'grade_distrib': [(grade, count_grade) for grade, __, count_grade in grades],
+        }
 
         # Build set of total students attempting each problem
-        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count_grade']
+        total_student_count[curr_problem] = sum(count_grade for __, __, count_grade in grades)
 
     return prob_grade_distrib, total_student_count
 
@@ -75,20 +336,7 @@ def get_sequential_open_distrib(course_id):
 
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
-
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
-
-    # Build set of "opened" data for each subsection that has "opened" data
-    sequential_open_distrib = {}
-    for row in db_query:
-        row_loc = row['module_state_key'].map_into_course(course_id)
-        sequential_open_distrib[row_loc] = row['count_sequential']
-
-    return sequential_open_distrib
+    return dict(get_course_distributions(course_id)['sequential_opens'])
 
 
 def get_problem_set_grade_distrib(course_id, problem_set):
@@ -99,42 +347,24 @@ def get_problem_set_grade_distrib(course_id, problem_set):
 
     `problem_set` an array of UsageKeys representing problem module_id's.
 
-    Requests from the database the a count of each grade for each problem in the `problem_set`.
+    Reads the count of each grade for each problem in the `problem_set` from the course's cached distributions.
 
     Returns a dict, where the key is the problem 'module_id' and the value is a dict with two parts:
       'max_grade' - the maximum grade possible for the course
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
-
+    problem_grades = get_course_distributions(course_id)['problem_grades']
     prob_grade_distrib = {}
 
-    # Loop through resultset building data for each problem
-    for row in db_query:
-        row_loc = row['module_state_key'].map_into_course(course_id)
-        if row_loc not in prob_grade_distrib:
+    for row_loc in problem_set:
+        grades = problem_grades.get(row_loc)
+        if grades:
             prob_grade_distrib[row_loc] = {
-                'max_grade': 0,
-                'grade_distrib': [],
+                'max_grade': max([0] + [max_grade for __, max_grade, __ in grades]),
+                'grade_distrib': [(grade, count_grade) for grade, __, count_grade in grades],
             }
 
-        curr_grade_distrib = prob_grade_distrib[row_loc]
-        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count_grade']))
-
-        if curr_grade_distrib['max_grade'] < row['max_grade']:
-            curr_grade_distrib['max_grade'] = row['max_grade']
-
     return prob_grade_distrib
 
 
@@ -148,6 +378,13 @@ def get_d3_problem_grade_distrib(course_id):
       'display_name' - display name for the section
       'data' - data for the d3_stacked_bar_graph function of the grade distribution for that problem
     """
+    return _get_cached_d3_data('problem_grade_distrib', _compute_d3_problem_grade_distrib, course_id)
+
+
+def _compute_d3_problem_grade_distrib(course_id):
+    """
+    Computes the data returned by get_d3_problem_grade_distrib.
+    """
 
     prob_grade_distrib, total_student_count = get_problem_grade_distribution(course_id)
     d3_data = []
@@ -240,6 +477,13 @@ def get_d3_sequential_open_distrib(course_id):
       'display_name' - display name for the section
       'data' - data for the d3_stacked_bar_graph function of how many students opened each sequential/subsection
     """
+    return _get_cached_d3_data('sequential_open_distrib', _compute_d3_sequential_open_distrib, course_id)
+
+
+def _compute_d3_sequential_open_distrib(course_id):
+    """
+    Computes the data returned by get_d3_sequential_open_distrib.
+    """
     sequential_open_distrib = get_sequential_open_distrib(course_id)
 
     d3_data = []
@@ -313,6 +557,13 @@ def get_d3_section_grade_distrib(course_id, section):
         'value' - Maps to the height of the bar, along the y-axis
         'tooltip' - (Optional) Text to display on mouse hover
     """
+    return _get_cached_d3_data('section_grade_distrib', _compute_d3_section_grade_distrib, course_id, section)
+
+
+def _compute_d3_section_grade_distrib(course_id, section):
+    """
+    Computes the data returned by get_d3_section_grade_distrib.
+    """
 
     # Retrieve course object down to problems
     course = modulestore().get_course(course_id, depth=4)
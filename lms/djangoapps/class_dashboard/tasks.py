@@ -0,0 +1,24 @@
+"""
+Asynchronous tasks for the class dashboard (Metrics tab in instructor dashboard).
+"""
+import logging
+
+from celery import task
+from opaque_keys.edx.keys import CourseKey
+
+from class_dashboard import dashboard_data
+
+log = logging.getLogger(__name__)
+
+
+@task()
+def update_course_distributions(course_id):
+    """
+    Refreshes the cached grade and subsection open distributions of the
+    course with the student modules modified since they were computed.
+
+    Args:
+        course_id(str): Id of the course whose distributions to refresh
+    """
+    log.info(u'Class dashboard: refreshing distributions of course %s', course_id)
+    dashboard_data.refresh_course_distributions(CourseKey.from_string(course_id))
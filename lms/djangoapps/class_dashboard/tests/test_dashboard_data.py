@@ -3,16 +3,22 @@ Tests for class dashboard (Metrics tab in instructor dashboard)
 """
 
 import json
+from datetime import datetime, timedelta
 
+from django.core.cache import cache
 from django.urls import reverse
 from django.test.client import RequestFactory
+from freezegun import freeze_time
 from mock import patch
 from nose.plugins.attrib import attr
+from pytz import UTC
 from six import text_type
 
 from capa.tests.response_xml_factory import StringResponseXMLFactory
 from class_dashboard.dashboard_data import (
+    DISTRIBUTIONS_REFRESH_INTERVAL,
     get_array_section_has_problem,
+    get_course_distributions,
     get_d3_problem_grade_distrib,
     get_d3_section_grade_distrib,
     get_d3_sequential_open_distrib,
@@ -21,7 +27,8 @@ from class_dashboard.dashboard_data import (
     get_section_display_name,
     get_sequential_open_distrib,
     get_students_opened_subsection,
-    get_students_problem_grades
+    get_students_problem_grades,
+    refresh_course_distributions
 )
 from class_dashboard.views import has_instructor_access_for_class
 from courseware.tests.factories import StudentModuleFactory
@@ -138,6 +145,60 @@ class TestGetProblemGradeDistribution(SharedModuleStoreTestCase):
                 sum_attempts += item[1]
             self.assertEquals(USER_COUNT, sum_attempts)
 
+    def test_course_distributions_cached(self):
+        cache.clear()
+        get_course_distributions(self.course.id)
+
+        with self.assertNumQueries(0):
+            get_problem_grade_distribution(self.course.id)
+            get_sequential_open_distrib(self.course.id)
+            get_d3_problem_grade_distrib(self.course.id)
+            get_d3_problem_grade_distrib(self.course.id)
+
+    @patch('class_dashboard.dashboard_data.DISTRIBUTIONS_CACHE_CHUNK_SIZE', 1)
+    def test_course_distributions_cached_in_chunks(self):
+        cache.clear()
+        distributions = get_course_distributions(self.course.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(distributions, get_course_distributions(self.course.id))
+
+    def test_refresh_course_distributions(self):
+        cache.clear()
+        get_course_distributions(self.course.id)
+        StudentModuleFactory.create(
+            grade=1,
+            max_grade=1,
+            student=UserFactory.create(),
+            course_id=self.course.id,
+            module_state_key=self.item.location,
+        )
+
+        # The cached distributions are used until they are refreshed
+        __, total_student_count = get_problem_grade_distribution(self.course.id)
+        self.assertEquals(USER_COUNT, total_student_count[self.item.location])
+
+        refresh_course_distributions(self.course.id)
+        prob_grade_distrib, total_student_count = get_problem_grade_distribution(self.course.id)
+        self.assertEquals(USER_COUNT + 1, total_student_count[self.item.location])
+        self.assertEquals([(0, 10), (1, 2)], prob_grade_distrib[self.item.location]['grade_distrib'])
+        self.assertEquals(USER_COUNT, total_student_count[self.items[0].location])
+
+    @patch('class_dashboard.tasks.update_course_distributions.delay')
+    def test_stale_course_distributions(self, mock_update):
+        cache.clear()
+        now = datetime.now(UTC)
+        with freeze_time(now):
+            get_course_distributions(self.course.id)
+            get_course_distributions(self.course.id)
+        self.assertFalse(mock_update.called)
+
+        # A single refresh is scheduled per refresh interval
+        with freeze_time(now + DISTRIBUTIONS_REFRESH_INTERVAL + timedelta(seconds=1)):
+            get_course_distributions(self.course.id)
+            get_course_distributions(self.course.id)
+        mock_update.assert_called_once_with(text_type(self.course.id))
+
     def test_get_d3_problem_grade_distrib(self):
 
         d3_data = get_d3_problem_grade_distrib(self.course.id)
@@ -1,3 +1,9 @@
 """
 Course API Blocks
 """
+from openedx.core.djangoapps.waffle_utils import WaffleSwitch, WaffleSwitchNamespace
+
+WAFFLE_SWITCH_NAMESPACE = WaffleSwitchNamespace(name='course_blocks_api')
+
+# Streams the JSON of the blocks API response, serialized directly from the block structure.
+STREAM_BLOCKS_JSON = WaffleSwitch(WAFFLE_SWITCH_NAMESPACE, 'stream_json')
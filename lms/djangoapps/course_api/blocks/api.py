@@ -6,7 +6,7 @@ import lms.djangoapps.course_blocks.api as course_blocks_api
 from lms.djangoapps.course_blocks.transformers.hidden_content import HiddenContentTransformer
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
-from .serializers import BlockDictSerializer, BlockSerializer
+from .serializers import BlockDictSerializer, BlockJSONStream, BlockSerializer
 from .transformers.blocks_api import BlocksAPITransformer
 from .transformers.block_completion import BlockCompletionTransformer
 from .transformers.milestones import MilestonesAndSpecialExamsTransformer
@@ -50,10 +50,76 @@ def get_blocks(
         block_types_filter (list): Optional list of block type names used to filter
             the final result of returned blocks.
     """
-    # create ordered list of transformers, adding BlocksAPITransformer at end.
-    transformers = BlockStructureTransformers()
     if requested_fields is None:
         requested_fields = []
+    blocks = _get_transformed_blocks(
+        usage_key, user, depth, nav_depth, requested_fields, block_counts, student_view_data, block_types_filter,
+    )
+
+    # serialize
+    serializer_context = {
+        'request': request,
+        'block_structure': blocks,
+        'requested_fields': requested_fields,
+    }
+
+    if return_type == 'dict':
+        serializer = BlockDictSerializer(blocks, context=serializer_context, many=False)
+    else:
+        serializer = BlockSerializer(blocks, context=serializer_context, many=True)
+
+    # return serialized data
+    return serializer.data
+
+
+def get_blocks_json_stream(
+        request,
+        usage_key,
+        user=None,
+        depth=None,
+        nav_depth=None,
+        requested_fields=None,
+        block_counts=None,
+        student_view_data=None,
+        return_type='dict',
+        block_types_filter=None,
+):
+    """
+    Return an iterator over the JSON serialization of the course blocks,
+    which is identical to the rendered result of get_blocks.
+
+    The blocks are transformed before this function returns, while the
+    JSON of each block is only serialized, directly from the block
+    structure, as the iterator is consumed, so it can be streamed in a
+    response.
+
+    Arguments: See get_blocks.
+    """
+    if requested_fields is None:
+        requested_fields = []
+    blocks = _get_transformed_blocks(
+        usage_key, user, depth, nav_depth, requested_fields, block_counts, student_view_data, block_types_filter,
+    )
+    return BlockJSONStream(blocks, request, requested_fields, return_type)
+
+
+def _get_transformed_blocks(
+        usage_key,
+        user,
+        depth,
+        nav_depth,
+        requested_fields,
+        block_counts,
+        student_view_data,
+        block_types_filter,
+):
+    """
+    Return the course blocks transformed for the given user and parameters.
+
+    Arguments: See get_blocks.
+    """
+    # create ordered list of transformers, adding BlocksAPITransformer at end.
+    transformers = BlockStructureTransformers()
     include_completion = 'completion' in requested_fields
     include_special_exams = 'special_exam_info' in requested_fields
     include_gated_sections = 'show_gated_sections' in requested_fields
@@ -89,17 +155,4 @@ def get_blocks(
         for block_key in block_keys_to_remove:
             blocks.remove_block(block_key, keep_descendants=True)
 
-    # serialize
-    serializer_context = {
-        'request': request,
-        'block_structure': blocks,
-        'requested_fields': requested_fields or [],
-    }
-
-    if return_type == 'dict':
-        serializer = BlockDictSerializer(blocks, context=serializer_context, many=False)
-    else:
-        serializer = BlockSerializer(blocks, context=serializer_context, many=True)
-
-    # return serialized data
-    return serializer.data
+    return blocks
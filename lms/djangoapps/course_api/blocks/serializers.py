@@ -2,7 +2,9 @@
 Serializers for Course Blocks related return objects.
 """
 from django.conf import settings
+from django.utils.http import RFC3986_SUBDELIMS, urlquote
 from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
 from rest_framework.reverse import reverse
 
 from .transformers import SUPPORTED_FIELDS
@@ -94,3 +96,178 @@ class BlockDictSerializer(serializers.Serializer):  # pylint: disable=abstract-m
             unicode(block_key): BlockSerializer(block_key, context=self.context).data
             for block_key in structure
         }
+
+
+class BlockURLBuilder(object):
+    """
+    Builds the URLs of the blocks of a course, producing the same values
+    as reversing each URL separately.
+
+    The URLs that are returned for each block only differ in their final
+    path segment, the usage key of the block, so each URL is reversed once
+    per course, with the usage key of a sample block, and split into the
+    parts that precede and follow that block's quoted usage key.
+    """
+    # Characters that django leaves unquoted when reversing a URL.
+    SAFE_CHARACTERS = RFC3986_SUBDELIMS + str('/~:@')
+
+    def __init__(self, request):
+        self.request = request
+        self._templates = {}
+
+    def get_urls(self, block_key, requested_fields):
+        """
+        Returns a dict of the URL fields of the given block.
+        """
+        urls = {
+            'lms_web_url': self._get_url('jump_to', 'location', block_key),
+            'student_view_url': self._get_url('render_xblock', 'usage_key_string', block_key),
+        }
+        if settings.FEATURES.get("ENABLE_LTI_PROVIDER") and 'lti_url' in requested_fields:
+            urls['lti_url'] = self._get_url('lti_provider_launch', 'usage_id', block_key)
+        return urls
+
+    def _get_url(self, url_name, block_kwarg, block_key):
+        """
+        Returns the URL with the given name for the given block, reversing
+        it only for the first block of each course.
+        """
+        template_key = (url_name, block_key.course_key)
+        template = self._templates.get(template_key)
+        if template is None:
+            template = self._templates[template_key] = self._get_template(url_name, block_kwarg, block_key)
+
+        if template:
+            prefix, suffix = template
+            return prefix + urlquote(unicode(block_key), safe=self.SAFE_CHARACTERS) + suffix
+        return self._reverse(url_name, block_kwarg, block_key)
+
+    def _get_template(self, url_name, block_kwarg, block_key):
+        """
+        Returns the (prefix, suffix) parts of the given URL around the
+        quoted usage key of the given block, or False if the URL cannot be
+        split that way.
+        """
+        url = self._reverse(url_name, block_kwarg, block_key)
+        quoted_block_key = urlquote(unicode(block_key), safe=self.SAFE_CHARACTERS)
+        index = url.rfind(quoted_block_key)
+        if index == -1:
+            return False
+        return url[:index], url[index + len(quoted_block_key):]
+
+    def _reverse(self, url_name, block_kwarg, block_key):
+        """
+        Reverses the given URL for the given block.
+        """
+        kwargs = {block_kwarg: unicode(block_key)}
+        if url_name != 'render_xblock':
+            kwargs['course_id'] = unicode(block_key.course_key)
+        return reverse(url_name, kwargs=kwargs, request=self.request)
+
+
+class BlockJSONStream(object):
+    """
+    Iterates over the JSON serialization of a transformed block structure,
+    one block at a time.
+
+    The JSON is the same as the one rendered for the data of a
+    BlockDictSerializer (or, when return_type is 'list', of a
+    BlockSerializer with many=True), but the requested fields of each block
+    are read directly from the block structure's data rather than through
+    the serializer fields, and the response can be written while the rest
+    of the blocks are serialized.
+    """
+    def __init__(self, block_structure, request, requested_fields, return_type='dict'):
+        self.block_structure = block_structure
+        self.requested_fields = requested_fields
+        self.return_type = return_type
+        self.url_builder = BlockURLBuilder(request)
+        self.supported_fields = [
+            (
+                supported_field.transformer.name() if supported_field.transformer else None,
+                supported_field.block_field_name,
+                supported_field.serializer_field_name,
+                supported_field.default_value,
+            )
+            for supported_field in SUPPORTED_FIELDS
+            if supported_field.requested_field_name in requested_fields
+        ]
+        renderer = JSONRenderer()
+        self.encoder = renderer.encoder_class(
+            ensure_ascii=renderer.ensure_ascii,
+            allow_nan=not renderer.strict,
+            separators=(',', ':') if renderer.compact else (', ', ': '),
+        )
+
+        # Reverse the URLs of the root block now, while the request's
+        # URL configuration is still active.
+        if block_structure.root_block_usage_key in block_structure:
+            self.url_builder.get_urls(block_structure.root_block_usage_key, requested_fields)
+
+    def __iter__(self):
+        if self.return_type == 'dict':
+            yield self._encode_chunk(u'{{"root":{},"blocks":{{'.format(
+                self.encoder.encode(unicode(self.block_structure.root_block_usage_key))
+            ))
+            separator = u''
+            for block_key in self.block_structure:
+                yield self._encode_chunk(u'{}{}:{}'.format(
+                    separator,
+                    self.encoder.encode(unicode(block_key)),
+                    self.encoder.encode(self.get_block_data(block_key)),
+                ))
+                separator = u','
+            yield b'}}'
+        else:
+            yield b'['
+            separator = u''
+            for block_key in self.block_structure:
+                yield self._encode_chunk(separator + self.encoder.encode(self.get_block_data(block_key)))
+                separator = u','
+            yield b']'
+
+    def get_block_data(self, block_key):
+        """
+        Returns the same representation of the given block as
+        BlockSerializer.to_representation.
+        """
+        data = {
+            'id': unicode(block_key),
+            'block_id': unicode(block_key.block_id),
+        }
+        data.update(self.url_builder.get_urls(block_key, self.requested_fields))
+
+        block_data = self.block_structure[block_key]
+        for transformer_name, block_field_name, serializer_field_name, default_value in self.supported_fields:
+            if transformer_name is None:
+                value = block_data.fields.get(block_field_name)
+            else:
+                transformer_data = dict.get(block_data.transformer_data, transformer_name)
+                if transformer_data is None:
+                    value = None
+                elif block_field_name is None:
+                    value = transformer_data.fields
+                else:
+                    value = transformer_data.fields.get(block_field_name)
+
+            if value is None:
+                value = default_value
+            if value is not None:
+                # only return fields that have data
+                data[serializer_field_name] = value
+
+        if 'children' in self.requested_fields:
+            children = self.block_structure.get_children(block_key)
+            if children:
+                data['children'] = [unicode(child) for child in children]
+
+        return data
+
+    def _encode_chunk(self, chunk):
+        """
+        Encodes the given chunk of JSON the same way as the JSONRenderer.
+        """
+        if isinstance(chunk, unicode):
+            chunk = chunk.replace(u'\u2028', u'\\u2028').replace(u'\u2029', u'\\u2029')
+            return chunk.encode('utf-8')
+        return chunk
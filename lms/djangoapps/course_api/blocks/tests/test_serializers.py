@@ -1,7 +1,11 @@
 """
 Tests for Course Blocks serializers
 """
+import json
+
+from django.test.client import RequestFactory
 from mock import MagicMock
+from rest_framework.renderers import JSONRenderer
 
 from lms.djangoapps.course_blocks.api import get_course_block_access_transformers, get_course_blocks
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
@@ -11,7 +15,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
-from ..serializers import BlockDictSerializer, BlockSerializer
+from ..serializers import BlockDictSerializer, BlockJSONStream, BlockSerializer
 from ..transformers.blocks_api import BlocksAPITransformer
 from .helpers import deserialize_usage_key
 
@@ -237,3 +241,45 @@ class TestBlockDictSerializer(TestBlockSerializerBase):
             self.assert_extended_block(serialized_block)
             self.assert_staff_fields(serialized_block)
         self.assertEquals(len(serializer.data['blocks']), 29)
+
+
+class TestBlockJSONStream(TestBlockSerializerBase):
+    """
+    Tests the BlockJSONStream class, which streams the same JSON as is
+    rendered for the BlockDictSerializer and BlockSerializer classes.
+    """
+    shard = 4
+
+    def setUp(self):
+        super(TestBlockJSONStream, self).setUp()
+        self.serializer_context['request'] = RequestFactory().get('/')
+
+    def assert_same_json(self, context):
+        """
+        Verifies that the streamed JSON matches the rendered serializer
+        data for both return types.
+        """
+        for return_type, serializer in (
+                ('dict', BlockDictSerializer(context['block_structure'], many=False, context=context)),
+                ('list', BlockSerializer(context['block_structure'], many=True, context=context)),
+        ):
+            stream = BlockJSONStream(
+                context['block_structure'], context['request'], context['requested_fields'], return_type,
+            )
+            self.assertEquals(
+                json.loads(b''.join(stream)),
+                json.loads(JSONRenderer().render(serializer.data)),
+            )
+
+    def test_basic(self):
+        self.assert_same_json(self.serializer_context)
+
+    def test_additional_requested_fields(self):
+        self.add_additional_requested_fields()
+        self.assert_same_json(self.serializer_context)
+
+    def test_staff_fields(self):
+        context = self.create_staff_context()
+        context['request'] = self.serializer_context['request']
+        self.add_additional_requested_fields(context)
+        self.assert_same_json(context)
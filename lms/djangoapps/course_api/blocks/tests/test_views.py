@@ -1,6 +1,7 @@
 """
 Tests for Blocks Views
 """
+import json
 from datetime import datetime
 from string import join
 from urllib import urlencode
@@ -8,6 +9,7 @@ from urlparse import urlunparse
 
 from django.urls import reverse
 from opaque_keys.edx.locator import CourseLocator
+from waffle.testutils import override_switch
 
 from student.models import CourseEnrollment
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
@@ -246,6 +248,21 @@ class TestBlocksView(SharedModuleStoreTestCase):
         )
         self.verify_response_with_requested_fields(response)
 
+    def test_streamed_json(self):
+        for return_type in ('dict', 'list'):
+            params = {
+                'requested_fields': self.requested_fields + ['display_name', 'lti_url', 'nav_depth'],
+                'block_counts': ['video'],
+                'student_view_data': self.BLOCK_TYPES_WITH_STUDENT_VIEW_DATA,
+                'return_type': return_type,
+            }
+            expected_data = json.loads(self.verify_response(params=params).content)
+            with override_switch('course_blocks_api.stream_json', active=True):
+                response = self.verify_response(params=params)
+            self.assertTrue(response.streaming)
+            self.assertEquals(response['Content-Type'], 'application/json')
+            self.assertEquals(json.loads(b''.join(response.streaming_content)), expected_data)
+
 
 class TestBlocksInCourseView(TestBlocksView):  # pylint: disable=test-inherits-tests
     """
@@ -2,7 +2,7 @@
 CourseBlocks API views
 """
 from django.core.exceptions import ValidationError
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from rest_framework.generics import ListAPIView
@@ -13,7 +13,8 @@ from openedx.core.lib.api.view_utils import DeveloperErrorViewMixin, view_auth_c
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
-from .api import get_blocks
+from . import STREAM_BLOCKS_JSON
+from .api import get_blocks, get_blocks_json_stream
 from .forms import BlockListGetForm
 
 
@@ -201,23 +202,32 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
             raise ValidationError(params.errors)
 
         try:
-            return Response(
-                get_blocks(
-                    request,
-                    params.cleaned_data['usage_key'],
-                    params.cleaned_data['user'],
-                    params.cleaned_data['depth'],
-                    params.cleaned_data.get('nav_depth'),
-                    params.cleaned_data['requested_fields'],
-                    params.cleaned_data.get('block_counts', []),
-                    params.cleaned_data.get('student_view_data', []),
-                    params.cleaned_data['return_type'],
-                    params.cleaned_data.get('block_types_filter', None),
+            if STREAM_BLOCKS_JSON.is_enabled():
+                return StreamingHttpResponse(
+                    get_blocks_json_stream(request, *self._get_blocks_args(params)),
+                    content_type='application/json',
                 )
-            )
+            return Response(get_blocks(request, *self._get_blocks_args(params)))
         except ItemNotFoundError as exception:
             raise Http404("Block not found: {}".format(text_type(exception)))
 
+    def _get_blocks_args(self, params):
+        """
+        Returns the arguments of get_blocks and get_blocks_json_stream,
+        following the request, for the given validated request parameters.
+        """
+        return (
+            params.cleaned_data['usage_key'],
+            params.cleaned_data['user'],
+            params.cleaned_data['depth'],
+            params.cleaned_data.get('nav_depth'),
+            params.cleaned_data['requested_fields'],
+            params.cleaned_data.get('block_counts', []),
+            params.cleaned_data.get('student_view_data', []),
+            params.cleaned_data['return_type'],
+            params.cleaned_data.get('block_types_filter', None),
+        )
+
 
 @view_auth_classes()
 class BlocksInCourseView(BlocksView):
@@ -0,0 +1,235 @@
+"""
+Command to benchmark the collect and transform phases of course blocks.
+"""
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from time import time
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers, METRICS_PREFIX
+from openedx.core.djangoapps.monitoring_utils.middleware import REQUEST_CACHE_KEY as METRICS_CACHE_KEY
+from openedx.core.djangoapps.request_cache import clear_cache, get_cache
+
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Measures collect and transform throughput of the course blocks
+    transformers, either on a newly generated synthetic course of the
+    requested size or on an existing course, and reports the time spent in
+    each transformer. The synthetic course is deleted afterwards, unless
+    --keep is given.
+
+    Example usage:
+        $ ./manage.py lms benchmark_course_blocks staff --chapters 20 --sequentials 10 --settings=devstack
+        $ ./manage.py lms benchmark_course_blocks staff --course 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    args = u'<username>'
+    help = u'Benchmarks the collect and transform phases of course blocks for the given user.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            'username',
+            help=u'Username of the learner for whom the course blocks are transformed.',
+        )
+        parser.add_argument(
+            '--course',
+            dest='course',
+            help=u'Benchmark the given existing course instead of generating a synthetic one.',
+        )
+        parser.add_argument(
+            '--chapters',
+            help=u'Number of chapters in the synthetic course.',
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            '--sequentials',
+            help=u'Number of sequentials in each chapter of the synthetic course.',
+            default=5,
+            type=int,
+        )
+        parser.add_argument(
+            '--verticals',
+            help=u'Number of verticals in each sequential of the synthetic course.',
+            default=4,
+            type=int,
+        )
+        parser.add_argument(
+            '--problems',
+            help=u'Number of problems in each vertical of the synthetic course.',
+            default=3,
+            type=int,
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help=u'Keep the synthetic course instead of deleting it once benchmarked.',
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of times each phase is run.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError(u'At least one iteration is required.')
+
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(u'User {} does not exist.'.format(options['username']))
+
+        if options.get('course'):
+            try:
+                course_key = CourseKey.from_string(options['course'])
+            except InvalidKeyError:
+                raise CommandError(u'Invalid course_key: {}.'.format(options['course']))
+            delete_course = False
+        else:
+            course_key = self._create_synthetic_course(options)
+            delete_course = not options.get('keep')
+
+        try:
+            root_block_usage_key = modulestore().make_course_usage_key(course_key)
+            self._benchmark_collect(root_block_usage_key, options['iterations'])
+            self._benchmark_transform(user, root_block_usage_key, options['iterations'])
+        finally:
+            if delete_course:
+                self._delete_synthetic_course(course_key)
+
+    def _create_synthetic_course(self, options):
+        """
+        Creates and publishes a course with the requested number of blocks
+        at each level and returns its course key.
+        """
+        store = modulestore()
+        user_id = ModuleStoreEnum.UserID.mgmt_command
+        run = uuid4().hex[:8]
+
+        with store.default_store(ModuleStoreEnum.Type.split):
+            course = store.create_course(u'benchmark', u'course_blocks', run, user_id)
+            with store.bulk_operations(course.id):
+                for chapter_index in range(options['chapters']):
+                    chapter = store.create_child(
+                        user_id, course.location, 'chapter',
+                        fields={'display_name': u'Chapter {}'.format(chapter_index)},
+                    )
+                    for sequential_index in range(options['sequentials']):
+                        sequential = store.create_child(
+                            user_id, chapter.location, 'sequential',
+                            fields={'display_name': u'Sequential {}'.format(sequential_index), 'graded': True},
+                        )
+                        for vertical_index in range(options['verticals']):
+                            vertical = store.create_child(
+                                user_id, sequential.location, 'vertical',
+                                fields={'display_name': u'Vertical {}'.format(vertical_index)},
+                            )
+                            for problem_index in range(options['problems']):
+                                store.create_child(
+                                    user_id, vertical.location, 'problem',
+                                    fields={'display_name': u'Problem {}'.format(problem_index)},
+                                )
+                store.publish(course.location, user_id)
+
+        log.info(u'Created synthetic course %s.', text_type(course.id))
+        return course.id
+
+    def _delete_synthetic_course(self, course_key):
+        """
+        Deletes the given synthetic course and its collected block structure.
+        """
+        get_block_structure_manager(course_key).clear()
+        modulestore().delete_course(course_key, ModuleStoreEnum.UserID.mgmt_command)
+        log.info(u'Deleted synthetic course %s.', text_type(course_key))
+
+    def _benchmark_collect(self, root_block_usage_key, iterations):
+        """
+        Times creating the block structure from the modulestore and
+        collecting the data of all registered transformers.
+        """
+        store = modulestore()
+        with self._measure(u'collect', iterations) as results:
+            for _ in range(iterations):
+                with store.bulk_operations(root_block_usage_key.course_key):
+                    start_time = time()
+                    block_structure = BlockStructureFactory.create_from_modulestore(root_block_usage_key, store)
+                    BlockStructureTransformers.collect(block_structure)
+                    results.append((time() - start_time, len(block_structure)))
+
+    def _benchmark_transform(self, user, root_block_usage_key, iterations):
+        """
+        Times transforming an already collected block structure for the
+        given user with the default course block access transformers.
+        """
+        collected_block_structure = get_block_structure_manager(root_block_usage_key.course_key).get_collected()
+        with self._measure(u'transform', iterations) as results:
+            for _ in range(iterations):
+                start_time = time()
+                get_course_blocks(user, root_block_usage_key, collected_block_structure=collected_block_structure)
+                results.append((time() - start_time, len(collected_block_structure)))
+
+    @contextmanager
+    def _measure(self, phase, iterations):
+        """
+        Yields a list in which (duration, num_blocks) results of the given
+        phase are collected and, once all iterations are done, writes the
+        phase's throughput and its per transformer averages.
+        """
+        clear_cache(METRICS_CACHE_KEY)
+        results = []
+        yield results
+        self._report(phase, iterations, results)
+        clear_cache(METRICS_CACHE_KEY)
+
+    def _report(self, phase, iterations, results):
+        """
+        Writes the throughput of the given phase and the average duration
+        and block counts of each of its steps.
+        """
+        total_duration = sum(duration for duration, _ in results)
+        total_blocks = sum(num_blocks for _, num_blocks in results)
+        self.stdout.write(
+            u'{phase}: {iterations} iterations, {average_ms:.2f} ms average, {throughput:.0f} blocks/sec'.format(
+                phase=phase,
+                iterations=iterations,
+                average_ms=total_duration * 1000 / iterations,
+                throughput=total_blocks / total_duration if total_duration else 0,
+            )
+        )
+
+        steps = defaultdict(dict)
+        prefix = u'{}.{}.'.format(METRICS_PREFIX, phase)
+        for name, value in get_cache(METRICS_CACHE_KEY).iteritems():
+            if name.startswith(prefix):
+                step_name, measure = name[len(prefix):].rsplit(u'.', 1)
+                steps[step_name][measure] = value
+
+        for step_name, measures in sorted(steps.iteritems(), key=lambda item: -item[1].get('duration_ms', 0)):
+            self.stdout.write(
+                u'    {step_name}: {duration_ms:.2f} ms, {num_blocks:.0f} blocks, {num_blocks_removed:.0f} removed'.format(
+                    step_name=step_name,
+                    duration_ms=measures.get('duration_ms', 0) / iterations,
+                    num_blocks=measures.get('num_blocks', 0) / float(iterations),
+                    num_blocks_removed=measures.get('num_blocks_removed', 0) / float(iterations),
+                )
+            )
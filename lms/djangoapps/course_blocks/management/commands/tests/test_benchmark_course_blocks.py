@@ -0,0 +1,59 @@
+"""
+Tests for benchmark_course_blocks management command.
+"""
+from StringIO import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from nose.plugins.attrib import attr
+
+from student.tests.factories import UserFactory
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+@attr(shard=3)
+class TestBenchmarkCourseBlocks(ModuleStoreTestCase):
+    """
+    Tests benchmark course blocks management command.
+    """
+    def setUp(self):
+        super(TestBenchmarkCourseBlocks, self).setUp()
+        self.user = UserFactory.create()
+
+    def _call_command(self, *args, **options):
+        """
+        Calls the command and returns its output.
+        """
+        out = StringIO()
+        call_command('benchmark_course_blocks', self.user.username, *args, stdout=out, **options)
+        return out.getvalue()
+
+    def _synthetic_courses(self):
+        """
+        Returns the synthetic courses left in the modulestore.
+        """
+        return [course for course in modulestore().get_courses() if course.id.org == u'benchmark']
+
+    def test_synthetic_course(self):
+        output = self._call_command(chapters=2, sequentials=1, verticals=1, problems=2, iterations=2)
+        self.assertIn(u'collect: 2 iterations', output)
+        self.assertIn(u'transform: 2 iterations', output)
+        self.assertIn(u'visibility:', output)
+        self.assertIn(u'filters:', output)
+        self.assertEqual(self._synthetic_courses(), [])
+
+    def test_keep_synthetic_course(self):
+        self._call_command(chapters=1, sequentials=1, verticals=1, problems=1, iterations=1, keep=True)
+        self.assertEqual(len(self._synthetic_courses()), 1)
+
+    def test_existing_course(self):
+        course = CourseFactory.create()
+        output = self._call_command(course=unicode(course.id), iterations=1)
+        self.assertIn(u'collect: 1 iterations', output)
+        self.assertIn(u'transform: 1 iterations', output)
+
+    def test_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_course_blocks', 'not_a_user')
@@ -17,7 +17,7 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.partitions.partitions import Group, UserPartition
 
 from ...api import get_course_blocks
-from ..user_partitions import UserPartitionTransformer, _MergedGroupAccess
+from ..user_partitions import UserPartitionTransformer, _GroupAccessBits, _MergedGroupAccess
 from .helpers import CourseStructureTestCase, update_block
 
 
@@ -446,6 +446,13 @@ class MergedGroupAccessTestData(UserPartitionTestMixin, CourseStructureTestCase)
             expected_access,
         )
 
+        # the compiled bitmasks agree with the merged group access
+        group_bits = _GroupAccessBits(self.user_partitions, [merged_group_access])
+        self.assertEquals(
+            not group_bits.user_mask(user_partition_groups) & ~group_bits.access_mask(merged_group_access),
+            expected_access,
+        )
+
     @ddt.data(
         ([None], None),
         ([{1}, None], {1}),
@@ -1,7 +1,6 @@
 """
 User Partitions Transformer
 """
-from lms.djangoapps.courseware.access import has_access
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
     FilteringTransformerMixin
@@ -20,9 +19,14 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
     not have group access.
 
     Staff users are *not* exempted from user partition pathways.
+
+    At collect time, the merged group access of each block is compiled
+    into a bitmask over the groups of the course's partitions (see
+    _GroupAccessBits), so that the access check of a user on each block
+    is a single bitwise test.
     """
-    WRITE_VERSION = 1
-    READ_VERSION = 1
+    WRITE_VERSION = 2
+    READ_VERSION = 2
 
     @classmethod
     def name(cls):
@@ -60,15 +64,23 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
         # topological sort, we know a block's parents are guaranteed to
         # already have merged group access computed before the block
         # itself.
+        merged_group_accesses = {}
         for block_key in block_structure.topological_traversal():
             xblock = block_structure.get_xblock(block_key)
-            parent_keys = block_structure.get_parents(block_key)
             merged_parent_access_list = [
-                block_structure.get_transformer_block_field(parent_key, cls, 'merged_group_access')
-                for parent_key in parent_keys
+                merged_group_accesses[parent_key]
+                for parent_key in block_structure.get_parents(block_key)
             ]
-            merged_group_access = _MergedGroupAccess(user_partitions, xblock, merged_parent_access_list)
-            block_structure.set_transformer_block_field(block_key, cls, 'merged_group_access', merged_group_access)
+            merged_group_accesses[block_key] = _MergedGroupAccess(user_partitions, xblock, merged_parent_access_list)
+
+        # Compile the merged group accesses into bitmasks, which are the
+        # only per-block data that needs to be stored.
+        group_bits = _GroupAccessBits(user_partitions, merged_group_accesses.itervalues())
+        block_structure.set_transformer_data(cls, 'group_bits', group_bits)
+        for block_key, merged_group_access in merged_group_accesses.iteritems():
+            block_structure.set_transformer_block_field(
+                block_key, cls, 'group_access_mask', group_bits.access_mask(merged_group_access),
+            )
 
     def transform_block_filters(self, usage_info, block_structure):
         user = usage_info.user
@@ -78,14 +90,15 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
         if not user_partitions:
             return [block_structure.create_universal_filter()]
 
+        if usage_info.has_staff_access:
+            return result_list
+
         user_groups = _get_user_partition_groups(usage_info.course_key, user_partitions, user)
+        user_mask = block_structure.get_transformer_data(self, 'group_bits').user_mask(user_groups)
 
         group_access_filter = block_structure.create_removal_filter(
-            lambda block_key: not (
-                has_access(user, 'staff', block_key) or
-                block_structure.get_transformer_block_field(block_key, self, 'merged_group_access').check_group_access(
-                    user_groups
-                )
+            lambda block_key: (
+                user_mask & ~block_structure.get_transformer_block_field(block_key, self, 'group_access_mask')
             )
         )
 
@@ -241,6 +254,89 @@ class _MergedGroupAccess(object):
         return True
 
 
+class _GroupAccessBits(object):
+    """
+    Assigns a bit to each group of each user partition, plus one bit per
+    partition standing for "any other group or no group at all", so that
+    group access can be checked with bitwise operations.
+
+    The groups of a user map to a mask with exactly one bit set for each
+    partition: the bit of their group in the partition, or the partition's
+    other bit. The merged group access of a block maps to a mask of the
+    bits that are allowed: all the bits of a partition that the block does
+    not restrict, and only the bits of the allowed groups of a partition
+    that it does restrict. A user has access to a block if all the bits of
+    their mask are allowed, that is if `user_mask & ~access_mask` is zero,
+    which matches _MergedGroupAccess.check_group_access.
+    """
+    def __init__(self, user_partitions, merged_group_accesses):
+        """
+        Arguments:
+            user_partitions (list[UserPartition])
+            merged_group_accesses (iterable[_MergedGroupAccess]): the
+                accesses whose allowed groups need bits, in addition to
+                the groups declared by the partitions.
+        """
+        # { partition.id: bit of the partition's other groups }
+        self._other_bits = {}
+
+        # { (partition.id, group.id): bit of the group }
+        self._group_bits = {}
+
+        # { partition.id: mask of all the bits of the partition }
+        self._partition_masks = {}
+
+        for partition in user_partitions:
+            self._other_bits[partition.id] = self._add_bit(partition.id)
+            for group in partition.groups:
+                self._group_bits[(partition.id, group.id)] = self._add_bit(partition.id)
+
+        # group_access may refer to groups that are not declared by the
+        # partition; give them bits so that they are checked as before.
+        for merged_group_access in merged_group_accesses:
+            # pylint: disable=protected-access
+            for partition_id, group_ids in merged_group_access._access.iteritems():
+                for group_id in group_ids:
+                    if (partition_id, group_id) not in self._group_bits:
+                        self._group_bits[(partition_id, group_id)] = self._add_bit(partition_id)
+
+        self._universal_mask = 0
+        for partition_mask in self._partition_masks.itervalues():
+            self._universal_mask |= partition_mask
+
+    def _add_bit(self, partition_id):
+        """
+        Returns a new bit, included in the mask of the given partition.
+        """
+        bit = 1 << (len(self._group_bits) + len(self._other_bits))
+        self._partition_masks[partition_id] = self._partition_masks.get(partition_id, 0) | bit
+        return bit
+
+    def access_mask(self, merged_group_access):
+        """
+        Returns the mask of the bits allowed by the given merged group
+        access.
+        """
+        mask = self._universal_mask
+        # pylint: disable=protected-access
+        for partition_id, group_ids in merged_group_access._access.iteritems():
+            mask &= ~self._partition_masks[partition_id]
+            for group_id in group_ids:
+                mask |= self._group_bits[(partition_id, group_id)]
+        return mask
+
+    def user_mask(self, user_groups):
+        """
+        Returns the mask of the given groups of a user, as returned by
+        _get_user_partition_groups.
+        """
+        mask = 0
+        for partition_id, other_bit in self._other_bits.iteritems():
+            group = user_groups.get(partition_id)
+            mask |= self._group_bits.get((partition_id, group.id), other_bit) if group else other_bit
+        return mask
+
+
 def _get_user_partition_groups(course_key, user_partitions, user):
     """
     Collect group ID for each partition in this course for this user.
@@ -697,23 +697,51 @@ def _has_access_to_course(user, access_level, course_key):
     return ACCESS_DENIED
 
 
-def administrative_accesses_to_course_for_user(user, course_key):
+class _CourseAccessRules(object):
     """
-    Returns types of access a user have for given course.
+    The course and org roles that decide a user's administrative access to a
+    course, looked up once and then reused by every access check of the user
+    in the course.
     """
-    global_staff = GlobalStaff().has_user(user)
+    def __init__(self, user, course_key):
+        self.staff_access = (
+            CourseStaffRole(course_key).has_user(user) or
+            OrgStaffRole(course_key.org).has_user(user)
+        )
+        self.instructor_access = (
+            CourseInstructorRole(course_key).has_user(user) or
+            OrgInstructorRole(course_key.org).has_user(user)
+        )
 
-    staff_access = (
-        CourseStaffRole(course_key).has_user(user) or
-        OrgStaffRole(course_key.org).has_user(user)
-    )
 
-    instructor_access = (
-        CourseInstructorRole(course_key).has_user(user) or
-        OrgInstructorRole(course_key.org).has_user(user)
-    )
+def _get_course_access_rules(user, course_key):
+    """
+    Returns the _CourseAccessRules of the given user in the given course.
 
-    return global_staff, staff_access, instructor_access
+    The rules are cached on the user object next to the user's role cache
+    (see student.roles.RoleBase.has_user), and are compiled again whenever
+    that cache is replaced, e.g. after the user's roles changed.
+    """
+    # pylint: disable=protected-access
+    cache_token = (getattr(user, '_roles', None), user.is_active)
+    cached_token, rules_by_course = getattr(user, '_course_access_rules', (None, {}))
+    if cached_token != cache_token or cache_token[0] is None:
+        rules_by_course = {}
+
+    rules = rules_by_course.get(course_key)
+    if rules is None:
+        rules = rules_by_course[course_key] = _CourseAccessRules(user, course_key)
+        user._course_access_rules = ((getattr(user, '_roles', None), user.is_active), rules_by_course)
+    return rules
+
+
+def administrative_accesses_to_course_for_user(user, course_key):
+    """
+    Returns types of access a user have for given course.
+    """
+    global_staff = GlobalStaff().has_user(user)
+    rules = _get_course_access_rules(user, course_key)
+    return global_staff, rules.staff_access, rules.instructor_access
 
 
 def _has_instructor_access_to_descriptor(user, descriptor, course_key):  # pylint: disable=invalid-name
@@ -233,6 +233,22 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase, MilestonesTes
 
         self.assertFalse(any(access.administrative_accesses_to_course_for_user(self.student, course_key)))
 
+    def test_course_access_rules_cached(self):
+        """
+        Test that a user's roles in a course are looked up once, and again
+        after they change.
+        """
+        course_key = self.course.id
+        self.assertFalse(access.has_access(self.student, 'staff', course_key))
+        with self.assertNumQueries(0):
+            self.assertFalse(access.has_access(self.student, 'staff', course_key))
+            self.assertFalse(access.has_access(self.student, 'staff', self.course.location, course_key))
+
+        CourseStaffRole(course_key).add_users(self.student)
+        self.assertTrue(access.has_access(self.student, 'staff', course_key))
+        CourseStaffRole(course_key).remove_users(self.student)
+        self.assertFalse(access.has_access(self.student, 'staff', course_key))
+
     def test_student_has_access(self):
         """
         Tests course student have right access to content w/o preview.
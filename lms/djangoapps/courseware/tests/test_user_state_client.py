@@ -7,10 +7,12 @@ from collections import defaultdict
 from unittest import skip
 
 from django.test import TestCase
+from django.test.utils import override_settings
 from edx_user_state_client.tests import UserStateClientTestBase
 
 from courseware.tests.factories import UserFactory
 from courseware.user_state_client import DjangoXBlockUserStateClient
+from opaque_keys.edx.locator import CourseLocator
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
@@ -36,3 +38,57 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
         super(TestDjangoUserStateClient, self).setUp()
         self.client = DjangoXBlockUserStateClient()
         self.users = defaultdict(UserFactory.create)
+
+
+@override_settings(USER_STATE_BATCH_SIZE=2)
+class TestDjangoUserStateClientBulkRead(TestCase):
+    """
+    Tests of the multi-block, multi-user reads of the DjangoUserStateClient,
+    with batches smaller than the number of stored states.
+    """
+    shard = 4
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestDjangoUserStateClientBulkRead, self).setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = [UserFactory.create() for _ in range(5)]
+        course_key = CourseLocator('org', 'course', 'run')
+        self.block_keys = [course_key.make_usage_key('problem', 'problem{}'.format(idx)) for idx in range(3)]
+        for user in self.users:
+            for block_key in self.block_keys[:2]:
+                self.client.set(user.username, block_key, {'user': user.username, 'block': unicode(block_key)})
+        # an empty state is stored, but treated as if it did not exist
+        self.client.delete(self.users[0].username, self.block_keys[1])
+
+    def test_iter_all_for_blocks(self):
+        states = list(self.client.iter_all_for_blocks(self.block_keys))
+        self.assertEqual(
+            [(state.block_key, state.username) for state in states],
+            [(self.block_keys[0], user.username) for user in self.users] +
+            [(self.block_keys[1], user.username) for user in self.users[1:]],
+        )
+        for state in states:
+            self.assertEqual(state.state, {'user': state.username, 'block': unicode(state.block_key)})
+
+    def test_iter_all_for_blocks_for_users(self):
+        usernames = [self.users[0].username, self.users[3].username]
+        self.assertEqual(
+            [
+                (state.block_key, state.username)
+                for state in self.client.iter_all_for_blocks(reversed(self.block_keys), usernames=usernames)
+            ],
+            [(self.block_keys[1], self.users[3].username)] +
+            [(self.block_keys[0], username) for username in usernames],
+        )
+
+    def test_iter_serialized_state_for_blocks(self):
+        rows = list(self.client.iter_serialized_state_for_blocks(self.block_keys))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[5][:3], (self.users[0].username, self.block_keys[1], '{}'))
+
+    def test_iter_serialized_state_for_blocks_limit(self):
+        for limit in (0, 1, 2, 3, 7):
+            rows = list(self.client.iter_serialized_state_for_blocks(self.block_keys, limit=limit))
+            self.assertEqual(len(rows), limit)
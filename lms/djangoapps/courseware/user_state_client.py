@@ -17,7 +17,7 @@ from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClie
 from xblock.fields import Scope
 
 import dogstats_wrapper as dog_stats_api
-from courseware.models import BaseStudentModuleHistory, StudentModule
+from courseware.models import BaseStudentModuleHistory, StudentModule, chunks
 from openedx.core.djangoapps import monitoring_utils
 
 try:
@@ -452,6 +452,29 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             block_key: an XBlock's locator (e.g. :class:`~BlockUsageLocator`)
             scope (Scope): must be `Scope.user_state`
 
+        Returns:
+            an iterator over all data. Each invocation returns the next :class:`~XBlockUserState`
+                object, which includes the block's contents.
+        """
+        return self.iter_all_for_blocks([block_key], scope=scope)
+
+    def iter_all_for_blocks(self, block_keys, usernames=None, scope=Scope.user_state):
+        """
+        Return an iterator over the data stored in the given blocks, for all
+        users or for the given users only.
+
+        The data is read in batches of `USER_STATE_BATCH_SIZE` rows and each
+        state is only decoded as it is iterated over, so the data of all users
+        is never held in memory at once. The data is returned block by block,
+        in the order of ``block_keys``, but you get no ordering guarantees
+        for the users of each block.
+
+        Arguments:
+            block_keys ([UsageKey]): the locators of the XBlocks
+            usernames ([str]): the names of the users whose data to return,
+                or None to return the data of all users
+            scope (Scope): must be `Scope.user_state`
+
         Returns:
             an iterator over all data. Each invocation returns the next :class:`~XBlockUserState`
                 object, which includes the block's contents.
@@ -459,19 +482,81 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
-        results = StudentModule.objects.order_by('id').filter(module_state_key=block_key)
-        p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
+        for username, block_key, serialized_state, modified in self.iter_serialized_state_for_blocks(
+                block_keys, usernames
+        ):
+            if serialized_state is None:
+                continue
 
-        for page_number in p.page_range:
-            page = p.page(page_number)
+            state = json.loads(serialized_state)
 
-            for sm in page.object_list:
-                state = json.loads(sm.state)
+            if state == {}:
+                continue
 
-                if state == {}:
-                    continue
+            yield XBlockUserState(username, block_key, state, modified, scope)
 
-                yield XBlockUserState(sm.student.username, sm.module_state_key, state, sm.modified, scope)
+    def iter_serialized_state_for_blocks(self, block_keys, usernames=None, limit=None):
+        """
+        Return an iterator over the raw StudentModule data of the given
+        blocks, for all users or for the given users only, in the order of
+        ``block_keys`` and, for each block, in the order in which the users
+        first stored data for it.
+
+        The rows are read in batches of `USER_STATE_BATCH_SIZE`, each batch
+        starting after the id of the last row of the previous one rather than
+        at an offset, so that reading a batch does not need to skip over all
+        of the rows that were already read. The rows of each batch are
+        streamed from the database cursor, which is server-side where the
+        database backend supports it, and the states are not decoded.
+
+        Arguments:
+            block_keys ([UsageKey]): the locators of the XBlocks
+            usernames ([str]): the names of the users whose data to return,
+                or None to return the data of all users
+            limit (int): the maximum total number of rows to return, or None
+                to return all of them
+
+        Returns:
+            an iterator over (username, block_key, serialized_state, modified)
+                tuples, where serialized_state is the JSON serialized state, as
+                stored, and may be None or an empty dict.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        username_chunks = [None] if usernames is None else list(chunks(usernames, 500))
+        count = 0
+        for block_key in block_keys:
+            for username_chunk in username_chunks:
+                filter_kwargs = {'module_state_key': block_key}
+                if block_key.run:
+                    # The course of old-style locations that were not mapped into it is not known.
+                    filter_kwargs['course_id'] = block_key.course_key
+                query = StudentModule.objects.filter(**filter_kwargs)
+                if username_chunk is not None:
+                    query = query.filter(student__username__in=username_chunk)
+
+                last_id = 0
+                while True:
+                    batch_size = settings.USER_STATE_BATCH_SIZE
+                    if limit is not None:
+                        batch_size = min(batch_size, limit - count)
+
+                    batch = query.filter(id__gt=last_id).order_by('id').values_list(
+                        'id', 'student__username', 'state', 'modified',
+                    )[:batch_size]
+
+                    batch_count = 0
+                    for row_id, username, serialized_state, modified in batch.iterator():
+                        batch_count += 1
+                        last_id = row_id
+                        yield username, block_key, serialized_state, modified
+
+                    count += batch_count
+                    if limit is not None and count >= limit:
+                        return
+                    if batch_count < batch_size:
+                        break
 
     def iter_all_for_course(self, course_key, block_type=None, scope=Scope.user_state):
         """
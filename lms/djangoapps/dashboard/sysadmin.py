@@ -40,7 +40,7 @@ from edxmako.shortcuts import render_to_response
 from openedx.core.djangoapps.external_auth.models import ExternalAuthMap
 from openedx.core.djangoapps.user_api.accounts.utils import generate_password
 from student.models import CourseEnrollment, Registration, UserProfile
-from student.roles import CourseInstructorRole, CourseStaffRole
+from student.roles import CourseInstructorRole, CourseStaffRole, get_course_role_users
 from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
@@ -522,13 +522,16 @@ class Staffing(SysadminDashboardView):
             raise Http404
         data = []
 
-        for course in self.get_courses():
+        courses = list(self.get_courses())
+        users_by_course_role = get_course_role_users(
+            [course.id for course in courses], [CourseStaffRole.ROLE, CourseInstructorRole.ROLE]
+        )
+        for course in courses:
             datum = [course.display_name, course.id]
             datum += [CourseEnrollment.objects.filter(
                 course_id=course.id).count()]
-            datum += [CourseStaffRole(course.id).users_with_role().count()]
-            datum += [','.join([x.username for x in CourseInstructorRole(
-                course.id).users_with_role()])]
+            datum += [len(users_by_course_role[(course.id, CourseStaffRole.ROLE)])]
+            datum += [','.join([x.username for x in users_by_course_role[(course.id, CourseInstructorRole.ROLE)]])]
             data.append(datum)
 
         datatable = dict(header=[_('Course Name'), _('course_id'),
@@ -556,9 +559,13 @@ class Staffing(SysadminDashboardView):
             data = []
             roles = [CourseInstructorRole, CourseStaffRole, ]
 
-            for course in self.get_courses():
+            courses = list(self.get_courses())
+            users_by_course_role = get_course_role_users(
+                [course.id for course in courses], [role.ROLE for role in roles]
+            )
+            for course in courses:
                 for role in roles:
-                    for user in role(course.id).users_with_role():
+                    for user in users_by_course_role[(course.id, role.ROLE)]:
                         datum = [course.id, role, user.username, user.email,
                                  user.profile.name.encode('utf-8')]
                         data.append(datum)
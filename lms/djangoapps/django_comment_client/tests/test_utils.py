@@ -23,8 +23,10 @@ from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 from django_comment_client.tests.utils import config_course_discussions, topic_name_to_id
 from django_comment_common.models import (
+    FORUM_ROLE_STUDENT,
     CourseDiscussionSettings,
     ForumsConfig,
+    all_permissions_for_user_in_course,
     assign_role
 )
 from django_comment_common.utils import (
@@ -1463,6 +1465,26 @@ class GroupIdForUserTestCase(ModuleStoreTestCase):
             utils.get_group_id_for_user(self.test_user, course_discussion_settings)
         )
 
+    def test_group_ids_for_users_by_cohort(self):
+        set_discussion_division_settings(
+            self.course.id, enable_cohorts=True, division_scheme=CourseDiscussionSettings.COHORT
+        )
+        course_discussion_settings = get_course_discussion_settings(self.course.id)
+        uncohorted_user = UserFactory.create()
+        CourseEnrollmentFactory.create(user=uncohorted_user, course_id=self.course.id)
+
+        group_ids = utils.get_group_ids_for_users([self.test_user, uncohorted_user], course_discussion_settings)
+
+        # Like get_group_id_for_user, users without a cohort get assigned one.
+        self.assertEqual(
+            group_ids,
+            {
+                self.test_user.id: self.test_cohort.id,
+                uncohorted_user.id: cohorts.get_cohort_id(uncohorted_user, self.course.id),
+            }
+        )
+        self.assertIsNotNone(group_ids[uncohorted_user.id])
+
     def test_discussion_division_by_enrollment_track(self):
         set_discussion_division_settings(
             self.course.id, division_scheme=CourseDiscussionSettings.ENROLLMENT_TRACK
@@ -1643,6 +1665,88 @@ class PermissionsTestCase(ModuleStoreTestCase):
                 'can_report': True
             })
 
+    def test_get_metadata_for_threads(self):
+        """
+        Tests that the contents of all the thread trees are annotated, with
+        their authors looked up together.
+        """
+        course = CourseFactory.create()
+        user = UserFactory.create()
+        authors = [UserFactory.create() for _ in range(3)]
+        threads = [
+            {
+                'id': 'thread_1', 'user_id': str(authors[0].id), 'username': authors[0].username, 'type': 'thread',
+                'children': [
+                    {'id': 'comment_1', 'user_id': str(authors[1].id), 'username': authors[1].username,
+                     'type': 'comment'},
+                ],
+            },
+            {
+                'id': 'thread_2', 'user_id': str(authors[2].id), 'username': authors[2].username, 'type': 'thread',
+                'endorsed_responses': [
+                    {'id': 'comment_2', 'user_id': str(authors[0].id), 'username': authors[0].username,
+                     'type': 'comment'},
+                ],
+            },
+        ]
+        user_info = {'upvoted_ids': ['comment_1'], 'downvoted_ids': [], 'subscribed_thread_ids': ['thread_2']}
+
+        with mock.patch('django_comment_client.utils.check_permissions_by_view', return_value=True):
+            with mock.patch(
+                'django_comment_client.utils.get_users_by_usernames', wraps=utils.get_users_by_usernames
+            ) as get_users:
+                metadata = utils.get_metadata_for_threads(course.id, threads, user, user_info)
+
+        get_users.assert_called_once_with({author.username for author in authors})
+        self.assertEqual(set(metadata), {'thread_1', 'comment_1', 'thread_2', 'comment_2'})
+        self.assertEqual(metadata['comment_1']['voted'], 'up')
+        self.assertTrue(metadata['thread_2']['subscribed'])
+        self.assertTrue(metadata['comment_2']['ability']['can_vote'])
+
+    def test_get_metadata_for_threads_query_count(self):
+        """
+        Tests that the authors of a thread are loaded with a single query,
+        however many responses the thread has.
+        """
+        course = CourseFactory.create()
+        user = UserFactory.create()
+        user_info = {'upvoted_ids': [], 'downvoted_ids': [], 'subscribed_thread_ids': []}
+
+        for num_responses in (1, 10):
+            authors = [UserFactory.create() for _ in range(num_responses)]
+            thread = {
+                'id': 'thread', 'user_id': str(user.id), 'username': user.username, 'type': 'thread',
+                'children': [
+                    {'id': 'comment_{}'.format(index), 'user_id': str(author.id), 'username': author.username,
+                     'type': 'comment'}
+                    for index, author in enumerate(authors)
+                ],
+            }
+            RequestCache.clear_request_cache()
+            # The discussion settings are read once per request, and are
+            # not part of the per-thread work.
+            get_course_discussion_settings(course.id)
+
+            with mock.patch('django_comment_client.utils.check_permissions_by_view', return_value=True):
+                with self.assertNumQueries(1):
+                    metadata = utils.get_metadata_for_threads(course.id, [thread], user, user_info)
+
+            self.assertEqual(len(metadata), num_responses + 1)
+
+    def test_all_permissions_for_user_in_course_query_count(self):
+        """
+        Tests that the roles and permissions of a user are read with a single query.
+        """
+        course = CourseFactory.create()
+        user = UserFactory.create()
+        seed_permissions_roles(course.id)
+        assign_role(course.id, user, FORUM_ROLE_STUDENT)
+
+        with self.assertNumQueries(1):
+            permissions = all_permissions_for_user_in_course(user, course.id)
+
+        self.assertIn('vote', permissions)
+
     def test_is_content_authored_by(self):
         content = {}
         user = mock.Mock()
@@ -21,9 +21,14 @@ from django_comment_client.settings import MAX_COMMENT_DEPTH
 from django_comment_common.models import FORUM_ROLE_STUDENT, CourseDiscussionSettings, Role
 from django_comment_common.utils import get_course_discussion_settings
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id, get_cohort_names, is_course_cohorted
+from openedx.core.djangoapps.course_groups.cohorts import (
+    get_cohort_id,
+    get_cohort_ids_for_users,
+    get_cohort_names,
+    is_course_cohorted
+)
 from openedx.core.djangoapps.request_cache.middleware import request_cached
-from student.models import UserProfile, get_user_by_username
+from student.models import UserProfile, get_user_by_username, get_users_by_usernames
 from student.roles import GlobalStaff
 from xmodule.modulestore.django import modulestore
 from xmodule.partitions.partitions import ENROLLMENT_TRACK_PARTITION_ID
@@ -535,11 +540,16 @@ class QueryCountDebugMiddleware(object):
         return response
 
 
-def get_ability(course_id, content, user):
+def get_ability(course_id, content, user, user_group_ids=None):
     """
     Return a dictionary of forums-oriented actions and the user's permission to perform them
+
+    `user_group_ids` is the (user_group_id, content_user_group_id) tuple of
+    get_user_group_ids, when it was already computed by the caller.
     """
-    (user_group_id, content_user_group_id) = get_user_group_ids(course_id, content, user)
+    if user_group_ids is None:
+        user_group_ids = get_user_group_ids(course_id, content, user)
+    (user_group_id, content_user_group_id) = user_group_ids
     return {
         'editable': check_permissions_by_view(
             user,
@@ -605,7 +615,27 @@ def get_user_group_ids(course_id, content, user=None):
     return user_group_id, content_user_group_id
 
 
-def get_annotated_content_info(course_id, content, user, user_info):
+def _get_user_group_ids_for_contents(course_id, contents, user):
+    """
+    Returns a dict mapping the id of each of the given contents to its
+    (user_group_id, content_user_group_id) tuple, as get_user_group_ids
+    would return it, with the authors of all the contents loaded in a single
+    query and their group ids looked up at once.
+    """
+    if course_id is None:
+        return {content['id']: (None, None) for content in contents}
+
+    authors = get_users_by_usernames({content['username'] for content in contents if content.get('username')})
+    group_ids = get_group_ids_for_users(authors.values(), get_course_discussion_settings(course_id))
+    author_group_ids = {username: group_ids[author.id] for username, author in authors.iteritems()}
+    user_group_id = get_group_id_for_user_from_cache(user, course_id) if user else None
+    return {
+        content['id']: (user_group_id, author_group_ids.get(content.get('username')))
+        for content in contents
+    }
+
+
+def get_annotated_content_info(course_id, content, user, user_info, user_group_ids=None):
     """
     Get metadata for an individual content (thread or comment)
     """
@@ -617,7 +647,7 @@ def get_annotated_content_info(course_id, content, user, user_info):
     return {
         'voted': voted,
         'subscribed': content['id'] in user_info['subscribed_thread_ids'],
-        'ability': get_ability(course_id, content, user),
+        'ability': get_ability(course_id, content, user, user_group_ids),
     }
 
 # TODO: RENAME
@@ -627,32 +657,37 @@ def get_annotated_content_infos(course_id, thread, user, user_info):
     """
     Get metadata for a thread and its children
     """
-    infos = {}
-
-    def annotate(content):
-        infos[str(content['id'])] = get_annotated_content_info(course_id, content, user, user_info)
-        for child in (
-                content.get('children', []) +
-                content.get('endorsed_responses', []) +
-                content.get('non_endorsed_responses', [])
-        ):
-            annotate(child)
-    annotate(thread)
-    return infos
+    return get_metadata_for_threads(course_id, [thread], user, user_info)
 
 
 def get_metadata_for_threads(course_id, threads, user, user_info):
     """
     Returns annotated content information for the specified course, threads, and user information
+
+    The contents of all the thread trees are annotated together, so that
+    the group ids needed for the abilities are looked up in bulk.
     """
+    contents = []
 
-    def infogetter(thread):
-        return get_annotated_content_infos(course_id, thread, user, user_info)
+    def collect(content):
+        contents.append(content)
+        for child in (
+                content.get('children', []) +
+                content.get('endorsed_responses', []) +
+                content.get('non_endorsed_responses', [])
+        ):
+            collect(child)
 
-    metadata = {}
     for thread in threads:
-        metadata.update(infogetter(thread))
-    return metadata
+        collect(thread)
+
+    user_group_ids = _get_user_group_ids_for_contents(course_id, contents, user)
+    return {
+        str(content['id']): get_annotated_content_info(
+            course_id, content, user, user_info, user_group_ids[content['id']]
+        )
+        for content in contents
+    }
 
 
 def permalink(content):
@@ -872,6 +907,23 @@ def get_group_id_for_user(user, course_discussion_settings):
         return None
 
 
+def get_group_ids_for_users(users, course_discussion_settings):
+    """
+    Returns a dict mapping the id of each of the given users to their group_id,
+    as get_group_id_for_user returns it, with the cohorts of all the users
+    looked up at once.
+    """
+    if _get_course_division_scheme(course_discussion_settings) != CourseDiscussionSettings.COHORT:
+        return {user.id: get_group_id_for_user(user, course_discussion_settings) for user in users}
+
+    cohort_ids = get_cohort_ids_for_users(course_discussion_settings.course_id, [user.id for user in users])
+    return {
+        # Users who are not in a cohort yet get assigned one, as get_group_id_for_user does.
+        user.id: cohort_ids[user.id] or get_cohort_id(user, course_discussion_settings.course_id)
+        for user in users
+    }
+
+
 def is_comment_too_deep(parent):
     """
     Determine whether a comment with the given parent violates MAX_COMMENT_DEPTH
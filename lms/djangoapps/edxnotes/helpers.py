@@ -93,7 +93,7 @@ def send_request(user, course_id, page, page_size, path="", text=None):
     """
     url = get_internal_endpoint(path)
     params = {
-        "user": anonymous_id_for_user(user, None),
+        "user": anonymous_id_for_user(user, None, defer_save=True),
         "course_id": unicode(course_id).encode("utf-8"),
         "page": page,
         "page_size": page_size,
@@ -136,7 +136,7 @@ def delete_all_notes_for_user(user):
         "x-annotator-auth-token": get_edxnotes_id_token(user),
     }
     data = {
-        "user": anonymous_id_for_user(user, None)
+        "user": anonymous_id_for_user(user, None, defer_save=True)
     }
     try:
         response = requests.delete(
@@ -9,6 +9,7 @@ from lazy import lazy
 
 from ccx_keys.locator import CCXLocator
 from xmodule import block_metadata_utils
+from xmodule.graders import WeightedSubsectionsGrader
 
 from .config import assume_zero_if_absent
 from .subsection_grade import ZeroSubsectionGrade
@@ -72,6 +73,22 @@ class CourseGradeBase(object):
                         subsections_by_format[subsection_grade.format][subsection_grade.location] = subsection_grade
         return subsections_by_format
 
+    @lazy
+    def graded_section_percents(self):
+        """
+        Returns the graded percents of the subsections graded by the
+        course's grader, in an ordered dict keyed by subsection format
+        types, whose values are ordered dicts mapping the subsections'
+        usage keys (as strings) to their percents.
+        """
+        return OrderedDict(
+            (assignment_type, OrderedDict(
+                (unicode(location), subsection_grade.percent_graded)
+                for location, subsection_grade in subsection_grades.iteritems()
+            ))
+            for assignment_type, subsection_grades in self.graded_subsections_by_format.iteritems()
+        )
+
     @lazy
     def chapter_grades(self):
         """
@@ -165,6 +182,17 @@ class CourseGradeBase(object):
         grade_summary['grade'] = self.letter_grade
         return grade_summary
 
+    @classmethod
+    def batch_grader(cls, course):
+        """
+        Returns the course's grader if it can compute the percents of
+        learners from their graded_section_percents, else None.
+        """
+        grader = cls._prep_course_for_grading(course).grader
+        if settings.GENERATE_PROFILE_SCORES or not isinstance(grader, WeightedSubsectionsGrader):
+            return None
+        return grader
+
     @classmethod
     def get_subsection_type_graders(cls, course):
         """
@@ -242,8 +270,15 @@ class CourseGrade(CourseGradeBase):
     Course Grade class when grades are updated or read from storage.
     """
     def __init__(self, user, course_data, *args, **kwargs):
+        subsection_grade_factory = kwargs.pop('subsection_grade_factory', None)
+        graded_section_percents = kwargs.pop('graded_section_percents', None)
         super(CourseGrade, self).__init__(user, course_data, *args, **kwargs)
-        self._subsection_grade_factory = SubsectionGradeFactory(user, course_data=course_data)
+        self._subsection_grade_factory = (
+            subsection_grade_factory or SubsectionGradeFactory(user, course_data=course_data)
+        )
+        if graded_section_percents is not None:
+            # Known percents, e.g. from the persisted grade, spare reading the subsection grades.
+            self.graded_section_percents = graded_section_percents
 
     def update(self):
         """
@@ -256,8 +291,42 @@ class CourseGrade(CourseGradeBase):
         # side-effects. Once functional, force_update_subsections
         # can be passed through and not confusingly stored and used
         # at a later time.
+        return self._update_from_percent(self.grader_result['percent'])
+
+    @classmethod
+    def bulk_update(cls, course_grades):
+        """
+        Updates the grades of several learners of the same course, like
+        calling update on each of them, but computing all their percents
+        with one call to the course's grader.
+        """
+        if not course_grades:
+            return course_grades
+
+        grader = cls.batch_grader(course_grades[0].course_data.course)
+        if grader is None:
+            return [course_grade.update() for course_grade in course_grades]
+
+        section_percents_by_type = {
+            subgrader.type: [
+                course_grade.graded_section_percents.get(subgrader.type, {}).values()
+                for course_grade in course_grades
+            ]
+            for subgrader, __, __ in grader.subgraders
+        }
+        percents = grader.grade_percents(section_percents_by_type, len(course_grades))
+        return [
+            course_grade._update_from_percent(float(percent))
+            for course_grade, percent in zip(course_grades, percents)
+        ]
+
+    def _update_from_percent(self, percent):
+        """
+        Updates the grade for the course from the given percent
+        computed by the grader.
+        """
         grade_cutoffs = self.course_data.course.grade_cutoffs
-        self.percent = self._compute_percent(self.grader_result)
+        self.percent = self._compute_percent(percent)
         self.letter_grade = self._compute_letter_grade(grade_cutoffs, self.percent)
         self.passed = self._compute_passed(grade_cutoffs, self.percent)
         return self
@@ -285,12 +354,12 @@ class CourseGrade(CourseGradeBase):
             return self._subsection_grade_factory.create(subsection, read_only=True)
 
     @staticmethod
-    def _compute_percent(grader_result):
+    def _compute_percent(percent):
         """
         Computes and returns the grade percentage from the given
-        result from the grader.
+        percent computed by the grader.
         """
-        return round(grader_result['percent'] * 100 + 0.05) / 100
+        return round(percent * 100 + 0.05) / 100
 
     @staticmethod
     def _compute_letter_grade(grade_cutoffs, percent):
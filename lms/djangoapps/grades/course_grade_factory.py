@@ -2,6 +2,7 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 import dogstats_wrapper as dog_stats_api
@@ -23,6 +24,9 @@ class CourseGradeFactory(object):
     """
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'error'])
 
+    # Number of students whose grades are computed together when iterating with force_update.
+    BULK_UPDATE_BATCH_SIZE = 100
+
     def read(
             self,
             user,
@@ -61,6 +65,8 @@ class CourseGradeFactory(object):
             course_structure=None,
             course_key=None,
             force_update_subsections=False,
+            subsection_grade_factory=None,
+            subsection_grade=None,
     ):
         """
         Computes, updates, and returns the CourseGrade for the given
@@ -68,12 +74,30 @@ class CourseGradeFactory(object):
 
         At least one of course, collected_block_structure, course_structure,
         or course_key should be provided.
+
+        A subsection_grade_factory that just updated some of the user's
+        subsection grades can be passed to reuse its course data and the
+        scores it already read, instead of reading them again.
+
+        If only one subsection grade changed, it can be passed as
+        subsection_grade to apply its change to the persisted course grade
+        instead of recomputing the course grade from all the subsection grades.
         """
-        course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        if subsection_grade_factory is not None:
+            course_data = subsection_grade_factory.course_data
+        else:
+            course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        if subsection_grade is not None and not force_update_subsections:
+            course_grade = self._update_from_subsection_grade(
+                user, course_data, subsection_grade, subsection_grade_factory,
+            )
+            if course_grade is not None:
+                return course_grade
         return self._update(
             user,
             course_data,
-            force_update_subsections=force_update_subsections
+            force_update_subsections=force_update_subsections,
+            subsection_grade_factory=subsection_grade_factory,
         )
 
     def iter(
@@ -92,6 +116,9 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If force_update, the grades are recomputed and saved, in batches of
+        students whose course percents are computed together.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -102,34 +129,93 @@ class CourseGradeFactory(object):
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
+        if force_update:
+            users = iter(users)
+            batch = list(islice(users, self.BULK_UPDATE_BATCH_SIZE))
+            while batch:
+                with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
+                    results = self._bulk_update(batch, course_data)
+                for result in results:
+                    yield result
+                batch = list(islice(users, self.BULK_UPDATE_BATCH_SIZE))
+        else:
+            for user in users:
+                with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
+                    yield self._iter_grade_result(user, course_data)
+
+    def _bulk_update(self, users, course_data):
+        """
+        Computes, saves, and returns a GradeResult for each of the given users,
+        like update with force_update_subsections does, but computing the
+        course percents of all of them with one call to the course's grader.
+        """
+        should_persist = should_persist_grades(course_data.course_key)
+        results = []
+        course_grades = []
         for user in users:
-            with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
-                yield self._iter_grade_result(user, course_data, force_update)
+            try:
+                if should_persist:
+                    prefetch(user, course_data.course_key)
+                user_course_data = CourseData(
+                    user,
+                    course=course_data.course,
+                    collected_block_structure=course_data.collected_structure,
+                    course_key=course_data.course_key,
+                )
+                course_grade = CourseGrade(user, user_course_data, force_update_subsections=True)
+                # Update the subsection grades now, so that a failure is reported for this user only.
+                course_grade.graded_subsections_by_format  # pylint: disable=pointless-statement
+            except Exception as exc:  # pylint: disable=broad-except
+                results.append(self._grade_error(user, course_data, exc))
+            else:
+                course_grades.append(course_grade)
+                results.append(self.GradeResult(user, course_grade, None))
 
-    def _iter_grade_result(self, user, course_data, force_update):
         try:
-            kwargs = {
-                'user': user,
-                'course': course_data.course,
-                'collected_block_structure': course_data.collected_structure,
-                'course_key': course_data.course_key
-            }
-            if force_update:
-                kwargs['force_update_subsections'] = True
-
-            method = CourseGradeFactory().update if force_update else CourseGradeFactory().read
-            course_grade = method(**kwargs)
-            return self.GradeResult(user, course_grade, None)
+            CourseGrade.bulk_update(course_grades)
         except Exception as exc:  # pylint: disable=broad-except
-            # Keep marching on even if this student couldn't be graded for
-            # some reason, but log it for future reference.
-            log.exception(
-                'Cannot grade student %s in course %s because of exception: %s',
-                user.id,
-                course_data.course_key,
-                text_type(exc)
+            return [
+                result if result.error is not None else self._grade_error(result.student, course_data, exc)
+                for result in results
+            ]
+
+        for index, result in enumerate(results):
+            if result.error is None:
+                course_grade = result.course_grade
+                try:
+                    self._save(
+                        result.student, course_grade.course_data, course_grade,
+                        should_persist and course_grade.attempted,
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    results[index] = self._grade_error(result.student, course_data, exc)
+        return results
+
+    def _grade_error(self, user, course_data, exc):
+        """
+        Logs that the given user couldn't be graded and returns the GradeResult of the error.
+        """
+        # Keep marching on even if this student couldn't be graded for
+        # some reason, but log it for future reference.
+        log.exception(
+            'Cannot grade student %s in course %s because of exception: %s',
+            user.id,
+            course_data.course_key,
+            text_type(exc)
+        )
+        return self.GradeResult(user, None, exc)
+
+    def _iter_grade_result(self, user, course_data):
+        try:
+            course_grade = CourseGradeFactory().read(
+                user=user,
+                course=course_data.course,
+                collected_block_structure=course_data.collected_structure,
+                course_key=course_data.course_key,
             )
-            return self.GradeResult(user, None, exc)
+            return self.GradeResult(user, course_grade, None)
+        except Exception as exc:  # pylint: disable=broad-except
+            return self._grade_error(user, course_data, exc)
 
     @staticmethod
     def _create_zero(user, course_data):
@@ -160,7 +246,7 @@ class CourseGradeFactory(object):
         )
 
     @staticmethod
-    def _update(user, course_data, force_update_subsections=False):
+    def _update(user, course_data, force_update_subsections=False, subsection_grade_factory=None):
         """
         Computes, saves, and returns a CourseGrade object for the
         given user and course.
@@ -175,11 +261,65 @@ class CourseGradeFactory(object):
         course_grade = CourseGrade(
             user,
             course_data,
-            force_update_subsections=force_update_subsections
+            force_update_subsections=force_update_subsections,
+            subsection_grade_factory=subsection_grade_factory,
         )
         course_grade = course_grade.update()
+        return CourseGradeFactory._save(user, course_data, course_grade, should_persist and course_grade.attempted)
+
+    @staticmethod
+    def _update_from_subsection_grade(user, course_data, subsection_grade, subsection_grade_factory=None):
+        """
+        Updates and returns the CourseGrade for the given user and course by
+        applying the change of the given subsection grade to the section
+        percents of the persisted course grade, without reading the other
+        subsection grades.
+        Returns None if the course grade needs to be fully recomputed, as when
+        it was not persisted with its section percents, or was computed
+        against another version of the course or of its grading policy.
+        """
+        # Only a change to a subsection the grader sees can be applied.
+        if not subsection_grade.graded or subsection_grade.graded_total.possible <= 0:
+            return None
+        if not should_persist_grades(course_data.course_key):
+            return None
+        try:
+            persistent_grade = PersistentCourseGrade.read(user.id, course_data.course_key)
+        except PersistentCourseGrade.DoesNotExist:
+            return None
+
+        section_percents = persistent_grade.section_percents
+        if (
+                section_percents is None or
+                persistent_grade.course_version != (course_data.version or "") or
+                persistent_grade.grading_policy_hash != course_data.grading_policy_hash or
+                CourseGrade.batch_grader(course_data.course) is None
+        ):
+            return None
 
-        should_persist = should_persist and course_grade.attempted
+        type_percents = section_percents.get(subsection_grade.format)
+        location = unicode(subsection_grade.location)
+        if type_percents is None or location not in type_percents:
+            return None
+        type_percents[location] = subsection_grade.percent_graded
+
+        course_grade = CourseGrade(
+            user,
+            course_data,
+            subsection_grade_factory=subsection_grade_factory,
+            graded_section_percents=section_percents,
+        )
+        course_grade, = CourseGrade.bulk_update([course_grade])
+        log.debug(u'Grades: Update from subsection, %s, User: %s, %s', unicode(course_data), user.id, location)
+        # The persisted grade was attempted, so the updated one is too.
+        return CourseGradeFactory._save(user, course_data, course_grade, True)
+
+    @staticmethod
+    def _save(user, course_data, course_grade, should_persist):
+        """
+        Saves the given updated CourseGrade if should_persist, and sends
+        the course grade signals.
+        """
         if should_persist:
             course_grade._subsection_grade_factory.bulk_create_unsaved()
             PersistentCourseGrade.update_or_create(
@@ -191,6 +331,7 @@ class CourseGradeFactory(object):
                 percent_grade=course_grade.percent,
                 letter_grade=course_grade.letter_grade or "",
                 passed=course_grade.passed,
+                section_percents=course_grade.graded_section_percents,
             )
 
         COURSE_GRADE_CHANGED.send_robust(
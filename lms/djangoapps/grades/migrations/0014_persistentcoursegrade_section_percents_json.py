@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0013_persistentsubsectiongradeoverride'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='persistentcoursegrade',
+            name='section_percents_json',
+            field=models.TextField(null=True, verbose_name='Graded subsection percents by assignment type', blank=True),
+        ),
+    ]
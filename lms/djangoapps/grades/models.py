@@ -11,7 +11,7 @@ persisted, course grades are also immune to changes in course content.
 import json
 import logging
 from base64 import b64encode
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from hashlib import sha1
 
 from django.db import models
@@ -510,6 +510,10 @@ class PersistentCourseGrade(TimeStampedModel):
     # Information related to course completion
     passed_timestamp = models.DateTimeField(u'Date learner earned a passing grade', blank=True, null=True)
 
+    # Graded percents of the graded subsections, by assignment type, from
+    # which the grade can be updated when a single subsection grade changes
+    section_percents_json = models.TextField(u'Graded subsection percents by assignment type', blank=True, null=True)
+
     _CACHE_NAMESPACE = u"grades.models.PersistentCourseGrade"
 
     def __unicode__(self):
@@ -525,6 +529,18 @@ class PersistentCourseGrade(TimeStampedModel):
             u"passed timestamp: {}".format(self.passed_timestamp),
         ])
 
+    @property
+    def section_percents(self):
+        """
+        Returns the graded percents of the graded subsections, as an ordered
+        dict mapping each assignment type to an ordered dict mapping the
+        subsection usage keys (as strings) to their percents, or None if the
+        grade was saved without them.
+        """
+        if not self.section_percents_json:
+            return None
+        return json.loads(self.section_percents_json, object_pairs_hook=OrderedDict)
+
     @classmethod
     def prefetch(cls, course_id, users):
         """
@@ -566,9 +582,11 @@ class PersistentCourseGrade(TimeStampedModel):
         Returns a PersistedCourseGrade object.
         """
         passed = kwargs.pop('passed')
+        section_percents = kwargs.pop('section_percents', None)
 
         if kwargs.get('course_version', None) is None:
             kwargs['course_version'] = ""
+        kwargs['section_percents_json'] = json.dumps(section_percents) if section_percents is not None else None
 
         grade, _ = cls.objects.update_or_create(
             user_id=user_id,
@@ -236,7 +236,13 @@ def recalculate_course_grade_only(sender, course, course_structure, user, **kwar
     Updates a saved course grade, but does not update the subsection
     grades the user has in this course.
     """
-    CourseGradeFactory().update(user, course=course, course_structure=course_structure)
+    CourseGradeFactory().update(
+        user,
+        course=course,
+        course_structure=course_structure,
+        subsection_grade_factory=kwargs.get('subsection_grade_factory'),
+        subsection_grade=kwargs.get('subsection_grade'),
+    )
 
 
 @receiver(ENROLLMENT_TRACK_UPDATED)
@@ -82,6 +82,7 @@ SUBSECTION_SCORE_CHANGED = Signal(
         'course_structure',  # BlockStructure object
         'user',  # User object
         'subsection_grade',  # SubsectionGrade object
+        'subsection_grade_factory',  # SubsectionGradeFactory that updated the subsection grade (optional)
     ]
 )
 
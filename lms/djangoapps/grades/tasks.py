@@ -329,6 +329,7 @@ def _update_subsection_grades(course_key, scored_block_usage_key, only_if_higher
                     course_structure=course_structure,
                     user=student,
                     subsection_grade=subsection_grade,
+                    subsection_grade_factory=subsection_grade_factory,
                 )
 
 
@@ -17,7 +17,9 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
+from ..models import PersistentCourseGrade
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
+from ..subsection_grade_factory import SubsectionGradeFactory
 from .base import GradeTestBase
 from .utils import mock_get_score
 
@@ -176,6 +178,59 @@ class TestCourseGradeFactory(GradeTestBase):
         self.assertIsInstance(subsection1_grade, ReadSubsectionGrade)
         self.assertIsInstance(subsection2_grade, ZeroSubsectionGrade)
 
+    def test_update_with_subsection_grade_factory(self):
+        grade_factory = CourseGradeFactory()
+        with mock_get_score(1, 2):
+            grade_factory.update(self.request.user, self.course, force_update_subsections=True)
+
+        with mock_get_score(2, 2):
+            self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
+
+        with patch(
+            'lms.djangoapps.grades.course_grade.SubsectionGradeFactory', wraps=SubsectionGradeFactory
+        ) as mock_subsection_grade_factory:
+            course_grade = grade_factory.update(
+                self.request.user, subsection_grade_factory=self.subsection_grade_factory,
+            )
+        self.assertFalse(mock_subsection_grade_factory.called)
+        self.assertEqual(course_grade.percent, 0.75)
+        self.assertEqual(grade_factory.read(self.request.user, self.course).percent, 0.75)
+
+    def test_update_from_subsection_grade(self):
+        grade_factory = CourseGradeFactory()
+        with mock_get_score(1, 2):
+            grade_factory.update(self.request.user, self.course, force_update_subsections=True)
+
+        with mock_get_score(2, 2):
+            subsection_grade = self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
+
+        with patch.object(CourseGrade, '_get_subsection_grade') as mock_get_subsection_grade:
+            course_grade = grade_factory.update(
+                self.request.user,
+                subsection_grade_factory=self.subsection_grade_factory,
+                subsection_grade=subsection_grade,
+            )
+        self.assertFalse(mock_get_subsection_grade.called)
+        self.assertEqual(course_grade.percent, 0.75)
+        self.assertEqual(grade_factory.read(self.request.user, self.course).percent, 0.75)
+
+    def test_update_from_subsection_grade_without_section_percents(self):
+        grade_factory = CourseGradeFactory()
+        with mock_get_score(1, 2):
+            grade_factory.update(self.request.user, self.course, force_update_subsections=True)
+        PersistentCourseGrade.objects.filter(user_id=self.request.user.id).update(section_percents_json=None)
+
+        with mock_get_score(2, 2):
+            subsection_grade = self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
+
+        course_grade = grade_factory.update(
+            self.request.user,
+            subsection_grade_factory=self.subsection_grade_factory,
+            subsection_grade=subsection_grade,
+        )
+        self.assertEqual(course_grade.percent, 0.75)
+        self.assertIsNotNone(PersistentCourseGrade.read(self.request.user.id, self.course.id).section_percents)
+
     @ddt.data(True, False)
     def test_iter_force_update(self, force_update):
         with patch('lms.djangoapps.grades.subsection_grade_factory.SubsectionGradeFactory.update') as mock_update:
@@ -184,6 +239,20 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         self.assertEqual(mock_update.called, force_update)
 
+    def test_iter_force_update_grades_in_bulk(self):
+        users = [self.request.user, UserFactory.create()]
+        with mock_get_score(1, 2):
+            with patch(
+                'lms.djangoapps.grades.course_grade.CourseGrade.bulk_update', wraps=CourseGrade.bulk_update
+            ) as mock_bulk_update:
+                results = list(CourseGradeFactory().iter(users=users, course=self.course, force_update=True))
+        self.assertEqual(mock_bulk_update.call_count, 1)
+        self.assertEqual([result.student for result in results], users)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.course_grade.percent, 0.25)
+            self.assertEqual(CourseGradeFactory().read(result.student, self.course).percent, 0.25)
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
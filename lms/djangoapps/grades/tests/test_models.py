@@ -426,6 +426,21 @@ class PersistentCourseGradesTest(GradesModelTestCase):
         self.assertIsInstance(created_grade.passed_timestamp, datetime)
         self.assertEqual(created_grade, read_grade)
 
+    def test_section_percents(self):
+        grade = PersistentCourseGrade.update_or_create(**self.params)
+        self.assertIsNone(grade.section_percents)
+
+        section_percents = OrderedDict([
+            (u'Lab', OrderedDict([(u'block-v1:edX+Test+Course+type@sequential+block@lab', 0.25)])),
+            (u'Homework', OrderedDict([
+                (u'block-v1:edX+Test+Course+type@sequential+block@hw2', 1.0),
+                (u'block-v1:edX+Test+Course+type@sequential+block@hw1', 0.5),
+            ])),
+        ])
+        PersistentCourseGrade.update_or_create(section_percents=section_percents, **self.params)
+        read_grade = PersistentCourseGrade.read(self.params["user_id"], self.params["course_id"])
+        self.assertEqual(read_grade.section_percents.items(), section_percents.items())
+
     @ddt.data('course_version', 'course_edited_timestamp')
     def test_optional_fields(self, field):
         del self.params[field]
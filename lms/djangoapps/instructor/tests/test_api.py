@@ -47,6 +47,11 @@ from courseware.tests.factories import (
 from courseware.tests.helpers import LoginEnrollmentTestCase
 from django_comment_common.models import FORUM_ROLE_COMMUNITY_TA
 from django_comment_common.utils import seed_permissions_roles
+from instructor_analytics.models import (
+    CourseCertificateStatusCount,
+    CourseEnrollmentDailyCount,
+    CourseGradeHistogramBin
+)
 from lms.djangoapps.instructor.tests.utils import FakeContentTask, FakeEmail, FakeEmailInfo
 from lms.djangoapps.instructor.views.api import (
     _split_input_list,
@@ -162,6 +167,7 @@ EXECUTIVE_SUMMARY_DATA = (
 INSTRUCTOR_GET_ENDPOINTS = set([
     'get_anon_ids',
     'get_coupon_codes',
+    'get_course_summaries',
     'get_issued_certificates',
     'get_sale_order_records',
     'get_sale_records',
@@ -4718,6 +4724,68 @@ class TestCourseIssuedCertificatesData(SharedModuleStoreTestCase):
         )
 
 
+@attr(shard=5)
+@patch.dict(settings.FEATURES, {'ENABLE_COURSE_ANALYTICS_SUMMARIES': True})
+class TestCourseSummariesData(SharedModuleStoreTestCase):
+    """
+    Test the course summaries endpoint.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(TestCourseSummariesData, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(TestCourseSummariesData, self).setUp()
+        self.url = reverse('get_course_summaries', kwargs={'course_id': unicode(self.course.id)})
+        CourseEnrollmentDailyCount.objects.create(
+            course_id=self.course.id, date=datetime.date(2018, 3, 1), mode='audit', count=3, active_count=2
+        )
+        CourseCertificateStatusCount.objects.create(
+            course_id=self.course.id, status=CertificateStatuses.downloadable, mode='honor', count=2
+        )
+        CourseGradeHistogramBin.objects.create(course_id=self.course.id, lower_bound=50, count=4)
+
+    def test_student_forbidden(self):
+        student = UserFactory()
+        CourseEnrollment.enroll(student, self.course.id)
+        self.client.login(username=student.username, password='test')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_staff_allowed(self):
+        staff_member = StaffFactory(course_key=self.course.id)
+        self.client.login(username=staff_member.username, password='test')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_found_when_disabled(self):
+        instructor = InstructorFactory(course_key=self.course.id)
+        self.client.login(username=instructor.username, password='test')
+        with patch.dict(settings.FEATURES, {'ENABLE_COURSE_ANALYTICS_SUMMARIES': False}):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_summaries(self):
+        instructor = InstructorFactory(course_key=self.course.id)
+        self.client.login(username=instructor.username, password='test')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {
+            'course_id': unicode(self.course.id),
+            'enrollment_daily_counts': [
+                {'date': '2018-03-01', 'mode': 'audit', 'count': 3, 'active_count': 2},
+            ],
+            'certificate_status_counts': [
+                {'status': CertificateStatuses.downloadable, 'mode': 'honor', 'count': 2},
+            ],
+            'grade_histogram': [
+                {'lower_bound': lower_bound, 'count': 4 if lower_bound == 50 else 0}
+                for lower_bound in range(0, 100, 10)
+            ],
+        })
+
+
 @attr(shard=5)
 @override_settings(REGISTRATION_CODE_LENGTH=8)
 class TestCourseRegistrationCodes(SharedModuleStoreTestCase):
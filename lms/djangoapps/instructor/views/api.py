@@ -42,6 +42,7 @@ from six import text_type
 import instructor_analytics.basic
 import instructor_analytics.csvs
 import instructor_analytics.distributions
+import instructor_analytics.summaries
 import lms.djangoapps.instructor.enrollment as enrollment
 import lms.djangoapps.instructor_task.api
 from bulk_email.models import BulkEmailFlag, CourseEmail
@@ -1223,6 +1224,37 @@ def get_issued_certificates(request, course_id):
         return JsonResponse(response_payload)
 
 
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+def get_course_summaries(request, course_id):  # pylint: disable=unused-argument
+    """
+    Responds with JSON containing the enrollment counts by day and mode, the
+    certificate counts by status and mode and the grade histogram of the
+    course, read from the instructor analytics summary tables.
+
+    Returns 404 if the summary tables are not maintained.
+    """
+    if not instructor_analytics.summaries.summaries_enabled():
+        return HttpResponseNotFound()
+
+    course_key = CourseKey.from_string(course_id)
+    enrollment_counts = instructor_analytics.summaries.get_enrollment_daily_counts(course_key)
+    for row in enrollment_counts:
+        row['date'] = row['date'].isoformat()
+
+    response_payload = {
+        'course_id': text_type(course_key),
+        'enrollment_daily_counts': enrollment_counts,
+        'certificate_status_counts': instructor_analytics.summaries.get_certificate_status_counts(course_key),
+        'grade_histogram': [
+            {'lower_bound': lower_bound, 'count': count}
+            for lower_bound, count in instructor_analytics.summaries.get_grade_histogram(course_key)
+        ],
+    }
+    return JsonResponse(response_payload)
+
+
 @transaction.non_atomic_requests
 @require_POST
 @ensure_csrf_cookie
@@ -16,6 +16,7 @@ urlpatterns = [
     url(r'^get_grading_config$', api.get_grading_config, name='get_grading_config'),
     url(r'^get_students_features(?P<csv>/csv)?$', api.get_students_features, name='get_students_features'),
     url(r'^get_issued_certificates/$', api.get_issued_certificates, name='get_issued_certificates'),
+    url(r'^get_course_summaries$', api.get_course_summaries, name='get_course_summaries'),
     url(r'^get_students_who_may_enroll$', api.get_students_who_may_enroll, name='get_students_who_may_enroll'),
     url(r'^get_user_invoice_preference$', api.get_user_invoice_preference, name='get_user_invoice_preference'),
     url(r'^get_sale_records(?P<csv>/csv)?$', api.get_sale_records, name='get_sale_records'),
@@ -0,0 +1,22 @@
+"""
+Instructor Analytics Application Configuration
+
+Signal handlers are connected here.
+"""
+
+from django.apps import AppConfig
+
+
+class InstructorAnalyticsConfig(AppConfig):
+    """
+    Application Configuration for Instructor Analytics.
+    """
+    name = u'instructor_analytics'
+
+    def ready(self):
+        """
+        Connect handlers to signals.
+        """
+        # Can't import models at module level in AppConfigs, and models get
+        # included from the signal handlers
+        from . import signals  # pylint: disable=unused-variable
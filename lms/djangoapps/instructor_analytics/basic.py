@@ -5,6 +5,7 @@ Serve miscellaneous course and student data
 """
 import datetime
 import json
+from collections import OrderedDict
 
 from django.conf import settings
 from django.contrib.auth.models import User
@@ -18,7 +19,8 @@ from six import text_type
 
 import xmodule.graders as xmgraders
 from lms.djangoapps.certificates.models import CertificateStatuses, GeneratedCertificate
-from courseware.models import StudentModule
+from courseware.user_state_client import DjangoXBlockUserStateClient
+from instructor_analytics import summaries
 from lms.djangoapps.grades.context import grading_context_for_course
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
@@ -50,6 +52,7 @@ AVAILABLE_FEATURES = STUDENT_FEATURES + PROFILE_FEATURES
 COURSE_REGISTRATION_FEATURES = ('code', 'course_id', 'created_by', 'created_at', 'is_valid')
 COUPON_FEATURES = ('code', 'course_id', 'percentage_discount', 'description', 'expiration_date', 'is_active')
 CERTIFICATE_FEATURES = ('course_id', 'mode', 'status', 'grade', 'created_date', 'is_active', 'error_reason')
+SUMMARY_CERTIFICATE_FEATURES = ('course_id', 'mode', 'status')
 
 UNAVAILABLE = "[unavailable]"
 
@@ -192,10 +195,13 @@ def issued_certificates(course_key, features):
 
     report_run_date = datetime.date.today().strftime("%B %d, %Y")
     certificate_features = [x for x in CERTIFICATE_FEATURES if x in features]
-    generated_certificates = list(GeneratedCertificate.eligible_certificates.filter(
-        course_id=course_key,
-        status=CertificateStatuses.downloadable
-    ).values(*certificate_features).annotate(total_issued_certificate=Count('mode')))
+    if summaries.summaries_enabled() and set(certificate_features) <= set(SUMMARY_CERTIFICATE_FEATURES):
+        generated_certificates = _issued_certificates_from_summary(course_key, certificate_features)
+    else:
+        generated_certificates = list(GeneratedCertificate.eligible_certificates.filter(
+            course_id=course_key,
+            status=CertificateStatuses.downloadable
+        ).values(*certificate_features).annotate(total_issued_certificate=Count('mode')))
 
     # Report run date
     for data in generated_certificates:
@@ -205,6 +211,27 @@ def issued_certificates(course_key, features):
     return generated_certificates
 
 
+def _issued_certificates_from_summary(course_key, certificate_features):
+    """
+    Return the issued certificate counts of the given course grouped by the
+    given features, read from the certificate summary table.
+    """
+    totals = OrderedDict()
+    for row in summaries.get_certificate_status_counts(course_key):
+        if row['status'] != CertificateStatuses.downloadable:
+            continue
+        row['course_id'] = course_key
+        group = tuple(row[feature] for feature in certificate_features)
+        totals[group] = totals.get(group, 0) + row['count']
+
+    generated_certificates = []
+    for group, total in totals.iteritems():
+        data = dict(zip(certificate_features, group))
+        data['total_issued_certificate'] = total
+        generated_certificates.append(data)
+    return generated_certificates
+
+
 def enrolled_students_features(course_key, features):
     """
     Return list of student features as dictionaries.
@@ -432,17 +459,12 @@ def list_problem_responses(course_key, problem_location, limit_responses=None):
     if problem_key.course_key != course_key:
         return []
 
-    smdat = StudentModule.objects.filter(
-        course_id=course_key,
-        module_state_key=problem_key
-    )
-    smdat = smdat.order_by('student')
-    if limit_responses is not None:
-        smdat = smdat[:limit_responses]
-
+    user_state_client = DjangoXBlockUserStateClient()
     return [
-        {'username': response.student.username, 'state': response.state}
-        for response in smdat
+        {'username': username, 'state': state}
+        for username, _, state, _ in user_state_client.iter_serialized_state_for_blocks(
+            [problem_key], limit=limit_responses
+        )
     ]
 
 
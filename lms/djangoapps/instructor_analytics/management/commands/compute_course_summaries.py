@@ -0,0 +1,60 @@
+"""
+Command to rebuild the instructor analytics summary tables.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+
+from instructor_analytics.summaries import recompute_course_summaries
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the enrollment, certificate and grade summary tables of the
+    given courses from the source tables. Run it for all courses before
+    enabling the ENABLE_COURSE_ANALYTICS_SUMMARIES feature, after which the
+    tables are kept up to date in the background.
+
+    Example usage:
+        $ ./manage.py lms compute_course_summaries --all --settings=devstack
+        $ ./manage.py lms compute_course_summaries 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    args = u'<course_id course_id ...>'
+    help = u'Rebuilds the instructor analytics summary tables of one or more courses.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            'course_ids',
+            nargs='*',
+            help=u'Ids of the courses whose summaries to rebuild.',
+        )
+        parser.add_argument(
+            '--all',
+            dest='all_courses',
+            action='store_true',
+            help=u'Rebuild the summaries of all courses.',
+        )
+
+    def handle(self, *args, **options):
+        if options['all_courses']:
+            course_keys = CourseOverview.get_all_course_keys()
+        elif options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(u'Invalid course_key: {}.'.format(text_type(error)))
+        else:
+            raise CommandError(u'At least one course or --all must be specified.')
+
+        for course_key in course_keys:
+            log.info(u'Instructor analytics: rebuilding summaries of course %s', text_type(course_key))
+            recompute_course_summaries(course_key)
@@ -0,0 +1,57 @@
+"""
+Per-course summary tables maintained in the background so that the
+instructor dashboard can read course analytics without scanning the
+enrollment, certificate and grade tables.
+
+The rows are derived data: they are recomputed from the source tables by
+instructor_analytics.summaries and can be rebuilt at any time with the
+compute_course_summaries management command.
+"""
+from django.db import models
+from opaque_keys.edx.django.models import CourseKeyField
+
+
+class CourseEnrollmentDailyCount(models.Model):
+    """
+    The number of enrollments created on a given day in a given mode, and
+    how many of them are still active.
+    """
+    class Meta(object):
+        unique_together = ('course_id', 'date', 'mode')
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    date = models.DateField()
+    mode = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(default=0)
+    active_count = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+
+
+class CourseCertificateStatusCount(models.Model):
+    """
+    The number of generated certificates of a course in a given status and
+    mode.
+    """
+    class Meta(object):
+        unique_together = ('course_id', 'status', 'mode')
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    status = models.CharField(max_length=32)
+    mode = models.CharField(max_length=32)
+    count = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+
+
+class CourseGradeHistogramBin(models.Model):
+    """
+    The number of persisted course grades whose percentage falls within
+    [lower_bound, lower_bound + GRADE_HISTOGRAM_BIN_WIDTH) percent; the top
+    bin also includes grades of exactly 100%.
+    """
+    class Meta(object):
+        unique_together = ('course_id', 'lower_bound')
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    lower_bound = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
@@ -0,0 +1,47 @@
+"""
+Signal handlers that schedule updates of the instructor analytics summary
+tables as enrollments, certificates and grades change.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from pytz import UTC
+
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from student.models import CourseEnrollment
+
+from .summaries import summaries_enabled
+from .tasks import (
+    schedule_update,
+    update_certificate_status_counts,
+    update_enrollment_daily_counts,
+    update_grade_histogram
+)
+
+
+@receiver(post_save, sender=CourseEnrollment, dispatch_uid='instructor_analytics_enrollment_changed')
+def _enrollment_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the enrollment counts of the day the saved enrollment was created.
+    """
+    if summaries_enabled() and instance.created:
+        created_date = instance.created.astimezone(UTC).date()
+        schedule_update(update_enrollment_daily_counts, instance.course_id, created_date.isoformat())
+
+
+@receiver(post_save, sender=GeneratedCertificate, dispatch_uid='instructor_analytics_certificate_changed')
+def _certificate_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the certificate counts of the course of the saved certificate.
+    """
+    if summaries_enabled():
+        schedule_update(update_certificate_status_counts, instance.course_id)
+
+
+@receiver(post_save, sender=PersistentCourseGrade, dispatch_uid='instructor_analytics_grade_changed')
+def _grade_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the grade histogram of the course of the saved grade.
+    """
+    if summaries_enabled():
+        schedule_update(update_grade_histogram, instance.course_id)
@@ -0,0 +1,185 @@
+"""
+Computes and reads the per-course summary tables of instructor analytics.
+
+Each update function recomputes one slice of a summary table (a single day
+of enrollments, or a single course's certificates or grades) from the source
+table with one grouped query, so the summaries can be refreshed as the
+enrollment, certificate and grade signals fire, while the instructor
+dashboard only reads the small summary tables.
+"""
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Value, When
+from pytz import UTC
+
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from student.models import CourseEnrollment
+
+from .models import CourseCertificateStatusCount, CourseEnrollmentDailyCount, CourseGradeHistogramBin
+
+# Width, in percentage points, of the bins of the grade histogram.
+GRADE_HISTOGRAM_BIN_WIDTH = 10
+
+
+def summaries_enabled():
+    """
+    Returns whether the summary tables are maintained and read.
+    """
+    return settings.FEATURES.get('ENABLE_COURSE_ANALYTICS_SUMMARIES', False)
+
+
+def _day_range(date):
+    """
+    Returns the UTC datetimes that start the given day and the next one.
+    """
+    start = datetime.datetime.combine(date, datetime.time.min).replace(tzinfo=UTC)
+    return start, start + datetime.timedelta(days=1)
+
+
+def update_enrollment_daily_counts(course_key, date):
+    """
+    Recomputes the enrollment counts of the enrollments created on the given
+    day in the given course.
+    """
+    start, end = _day_range(date)
+    rows = CourseEnrollment.objects.filter(
+        course_id=course_key,
+        created__gte=start,
+        created__lt=end,
+    ).values('mode', 'is_active').annotate(count=Count('id'))
+
+    counts = defaultdict(lambda: {'count': 0, 'active_count': 0})
+    for row in rows:
+        counts[row['mode']]['count'] += row['count']
+        if row['is_active']:
+            counts[row['mode']]['active_count'] += row['count']
+
+    with transaction.atomic():
+        CourseEnrollmentDailyCount.objects.filter(
+            course_id=course_key, date=date,
+        ).exclude(mode__in=counts.keys()).delete()
+        for mode, values in counts.iteritems():
+            CourseEnrollmentDailyCount.objects.update_or_create(
+                course_id=course_key, date=date, mode=mode, defaults=values,
+            )
+
+
+def update_certificate_status_counts(course_key):
+    """
+    Recomputes the certificate counts of the given course.
+    """
+    rows = GeneratedCertificate.objects.filter(
+        course_id=course_key,
+    ).values('status', 'mode').annotate(count=Count('id'))
+
+    with transaction.atomic():
+        CourseCertificateStatusCount.objects.filter(course_id=course_key).delete()
+        CourseCertificateStatusCount.objects.bulk_create(
+            CourseCertificateStatusCount(course_id=course_key, **row) for row in rows
+        )
+
+
+def _grade_histogram_bin():
+    """
+    Returns a database expression of the lower bound of the histogram bin of
+    the percent_grade column, a fraction between 0 and 1. Grades out of that
+    range are counted in the first or last bin.
+    """
+    # The percentage is rounded to two decimals before it is binned, so that
+    # a bin starts half a hundredth of a percent early.
+    return Case(
+        *[
+            When(
+                percent_grade__lt=(lower_bound + GRADE_HISTOGRAM_BIN_WIDTH - 0.005) / 100,
+                then=Value(lower_bound),
+            )
+            for lower_bound in range(0, 100 - GRADE_HISTOGRAM_BIN_WIDTH, GRADE_HISTOGRAM_BIN_WIDTH)
+        ],
+        default=Value(100 - GRADE_HISTOGRAM_BIN_WIDTH),
+        output_field=IntegerField()
+    )
+
+
+def update_grade_histogram(course_key):
+    """
+    Recomputes the grade histogram of the given course.
+    """
+    rows = PersistentCourseGrade.objects.filter(
+        course_id=course_key,
+    ).annotate(
+        lower_bound=_grade_histogram_bin(),
+    ).order_by().values('lower_bound').annotate(count=Count('id'))
+
+    with transaction.atomic():
+        CourseGradeHistogramBin.objects.filter(course_id=course_key).delete()
+        CourseGradeHistogramBin.objects.bulk_create(
+            CourseGradeHistogramBin(course_id=course_key, **row) for row in rows
+        )
+
+
+def recompute_course_summaries(course_key):
+    """
+    Rebuilds all summary tables of the given course from scratch.
+
+    The enrollment counts of every day are recomputed with a single pass
+    over the course's enrollments; enrollments without a creation date
+    cannot be attributed to a day and are not counted.
+    """
+    counts = defaultdict(lambda: {'count': 0, 'active_count': 0})
+    enrollments = CourseEnrollment.objects.filter(
+        course_id=course_key,
+        created__isnull=False,
+    ).values_list('created', 'mode', 'is_active')
+    for created, mode, is_active in enrollments.iterator():
+        values = counts[(created.astimezone(UTC).date(), mode)]
+        values['count'] += 1
+        if is_active:
+            values['active_count'] += 1
+
+    with transaction.atomic():
+        CourseEnrollmentDailyCount.objects.filter(course_id=course_key).delete()
+        CourseEnrollmentDailyCount.objects.bulk_create(
+            CourseEnrollmentDailyCount(course_id=course_key, date=date, mode=mode, **values)
+            for (date, mode), values in counts.iteritems()
+        )
+
+    update_certificate_status_counts(course_key)
+    update_grade_histogram(course_key)
+
+
+def get_enrollment_daily_counts(course_key):
+    """
+    Returns the enrollment counts of the given course by day and mode, as a
+    list of dicts ordered by day.
+    """
+    return list(CourseEnrollmentDailyCount.objects.filter(
+        course_id=course_key,
+    ).order_by('date', 'mode').values('date', 'mode', 'count', 'active_count'))
+
+
+def get_certificate_status_counts(course_key):
+    """
+    Returns the certificate counts of the given course by status and mode,
+    as a list of dicts.
+    """
+    return list(CourseCertificateStatusCount.objects.filter(
+        course_id=course_key,
+    ).order_by('status', 'mode').values('status', 'mode', 'count'))
+
+
+def get_grade_histogram(course_key):
+    """
+    Returns the grade histogram of the given course as a list of
+    (lower_bound, count) tuples covering every bin.
+    """
+    counts = dict(CourseGradeHistogramBin.objects.filter(
+        course_id=course_key,
+    ).values_list('lower_bound', 'count'))
+    return [
+        (lower_bound, counts.get(lower_bound, 0))
+        for lower_bound in range(0, 100, GRADE_HISTOGRAM_BIN_WIDTH)
+    ]
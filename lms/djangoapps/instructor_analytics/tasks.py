@@ -0,0 +1,77 @@
+"""
+Asynchronous tasks that keep the instructor analytics summary tables up to date.
+"""
+from celery import task
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+
+from instructor_analytics import summaries
+
+# Number of seconds after which a scheduled update no longer prevents
+# scheduling another one, in case the task was lost.
+SUMMARY_UPDATE_PENDING_TIMEOUT = 300
+
+
+def _pending_cache_key(update_task, args):
+    """
+    Returns the cache key marking that the given update is scheduled.
+    """
+    return u'instructor_analytics.pending.{}.{}'.format(update_task.name, u'.'.join(args))
+
+
+def schedule_update(update_task, course_key, *args):
+    """
+    Schedules the given update task for the given course once the current
+    transaction commits, so that the update reads the writes that triggered
+    it, unless the same update is already scheduled and has not started yet.
+    """
+    args = (text_type(course_key),) + args
+
+    def schedule():
+        """
+        Schedules the update, unless it is already scheduled.
+        """
+        if cache.add(_pending_cache_key(update_task, args), True, SUMMARY_UPDATE_PENDING_TIMEOUT):
+            update_task.apply_async(args=args)
+
+    transaction.on_commit(schedule)
+
+
+@task()
+def update_enrollment_daily_counts(course_id, date_string):
+    """
+    Recomputes the enrollment counts of the given course on the given day.
+
+    Args:
+        course_id(str): Id of the course whose counts to update
+        date_string(str): The day, in ISO format
+    """
+    cache.delete(_pending_cache_key(update_enrollment_daily_counts, (course_id, date_string)))
+    summaries.update_enrollment_daily_counts(CourseKey.from_string(course_id), parse_date(date_string))
+
+
+@task()
+def update_certificate_status_counts(course_id):
+    """
+    Recomputes the certificate counts of the given course.
+
+    Args:
+        course_id(str): Id of the course whose counts to update
+    """
+    cache.delete(_pending_cache_key(update_certificate_status_counts, (course_id,)))
+    summaries.update_certificate_status_counts(CourseKey.from_string(course_id))
+
+
+@task()
+def update_grade_histogram(course_id):
+    """
+    Recomputes the grade histogram of the given course.
+
+    Args:
+        course_id(str): Id of the course whose histogram to update
+    """
+    cache.delete(_pending_cache_key(update_grade_histogram, (course_id,)))
+    summaries.update_grade_histogram(CourseKey.from_string(course_id))
@@ -10,7 +10,7 @@ from django.urls import reverse
 from django.db.models import Q
 from edx_proctoring.api import create_exam
 from edx_proctoring.models import ProctoredExamStudentAttempt
-from mock import MagicMock, Mock, patch
+from mock import Mock, patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locator import UsageKey
 from six import text_type
@@ -18,11 +18,11 @@ from six import text_type
 from course_modes.models import CourseMode
 from course_modes.tests.factories import CourseModeFactory
 from courseware.tests.factories import InstructorFactory
+from courseware.user_state_client import DjangoXBlockUserStateClient
 from instructor_analytics.basic import (
     AVAILABLE_FEATURES,
     PROFILE_FEATURES,
     STUDENT_FEATURES,
-    StudentModule,
     coupon_codes_features,
     course_registration_features,
     enrolled_students_features,
@@ -74,16 +74,6 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             )
 
     def test_list_problem_responses(self):
-        def result_factory(result_id):
-            """
-            Return a dummy StudentModule object that can be queried for
-            relevant info (student.username and state).
-            """
-            result = Mock(spec=['student', 'state'])
-            result.student.username.return_value = u'user{}'.format(result_id)
-            result.state.return_value = u'state{}'.format(result_id)
-            return result
-
         # Ensure that UsageKey.from_string returns a problem key that list_problem_responses can work with
         # (even when called with a dummy location):
         mock_problem_key = Mock(return_value=u'')
@@ -91,29 +81,25 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
         with patch.object(UsageKey, 'from_string') as patched_from_string:
             patched_from_string.return_value = mock_problem_key
 
-            # Ensure that StudentModule.objects.filter returns a result set that list_problem_responses can work with
+            # Ensure that the user state client returns rows that list_problem_responses can work with
             # (this keeps us from having to create fixtures for this test):
-            mock_results = MagicMock(return_value=[result_factory(n) for n in range(5)])
-            with patch.object(StudentModule, 'objects') as patched_manager:
-                patched_manager.filter.return_value = mock_results
+            mock_rows = [(u'user{}'.format(n), mock_problem_key, u'state{}'.format(n), None) for n in range(5)]
+            with patch.object(DjangoXBlockUserStateClient, 'iter_serialized_state_for_blocks') as patched_iter:
+                patched_iter.return_value = iter(mock_rows)
 
                 mock_problem_location = ''
                 problem_responses = list_problem_responses(self.course_key, problem_location=mock_problem_location)
 
                 # Check if list_problem_responses called UsageKey.from_string to look up problem key:
                 patched_from_string.assert_called_once_with(mock_problem_location)
-                # Check if list_problem_responses called StudentModule.objects.filter to obtain relevant records:
-                patched_manager.filter.assert_called_once_with(
-                    course_id=self.course_key, module_state_key=mock_problem_key
-                )
+                # Check if list_problem_responses read the state of the problem through the user state client:
+                patched_iter.assert_called_once_with([mock_problem_key], limit=None)
 
                 # Check if list_problem_responses returned expected results:
-                self.assertEqual(len(problem_responses), len(mock_results))
-                for mock_result in mock_results:
-                    self.assertIn(
-                        {'username': mock_result.student.username, 'state': mock_result.state},
-                        problem_responses
-                    )
+                self.assertEqual(
+                    problem_responses,
+                    [{'username': username, 'state': state} for username, _, state, _ in mock_rows]
+                )
 
     def test_enrolled_students_features_username(self):
         self.assertIn('username', AVAILABLE_FEATURES)
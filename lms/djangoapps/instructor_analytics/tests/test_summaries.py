@@ -0,0 +1,140 @@
+"""
+Tests for instructor_analytics.summaries
+"""
+import datetime
+
+from django.core.management import call_command
+from freezegun import freeze_time
+from mock import patch
+from nose.plugins.attrib import attr
+
+from instructor_analytics.basic import issued_certificates
+from instructor_analytics.summaries import (
+    get_certificate_status_counts,
+    get_enrollment_daily_counts,
+    get_grade_histogram
+)
+from lms.djangoapps.certificates.models import CertificateStatuses
+from lms.djangoapps.certificates.tests.factories import GeneratedCertificateFactory
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+@attr(shard=3)
+class TestCourseSummaries(SharedModuleStoreTestCase):
+    """
+    Tests that the course summary tables follow enrollment, certificate and
+    grade changes, and can be rebuilt.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(TestCourseSummaries, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(TestCourseSummaries, self).setUp()
+        self.users = [UserFactory.create() for _ in range(4)]
+
+    def _enroll(self, day):
+        """
+        Enrolls the first three users on the given day, the last of them as
+        verified, and unenrolls the second one.
+        """
+        with freeze_time(day):
+            CourseEnrollment.enroll(self.users[0], self.course.id, mode='audit')
+            CourseEnrollment.enroll(self.users[1], self.course.id, mode='audit')
+            CourseEnrollment.enroll(self.users[2], self.course.id, mode='verified')
+        CourseEnrollment.unenroll(self.users[1], self.course.id)
+
+    def _create_certificates(self):
+        """
+        Creates certificates in various statuses and modes.
+        """
+        for user, status, mode in (
+                (self.users[0], CertificateStatuses.downloadable, 'honor'),
+                (self.users[1], CertificateStatuses.downloadable, 'verified'),
+                (self.users[2], CertificateStatuses.downloadable, 'verified'),
+                (self.users[3], CertificateStatuses.notpassing, 'honor'),
+        ):
+            GeneratedCertificateFactory.create(user=user, course_id=self.course.id, status=status, mode=mode)
+
+    def _create_grades(self):
+        """
+        Persists course grades of the users.
+        """
+        for user, percent_grade in zip(self.users, (0.05, 0.55, 0.59, 1.0)):
+            PersistentCourseGrade.update_or_create(
+                user_id=user.id,
+                course_id=self.course.id,
+                percent_grade=percent_grade,
+                letter_grade='',
+                grading_policy_hash='hash',
+                passed=False,
+            )
+
+    def _assert_summaries(self, day):
+        """
+        Asserts that the summary tables match the data created by the
+        helpers above.
+        """
+        self.assertEqual(get_enrollment_daily_counts(self.course.id), [
+            {'date': day, 'mode': 'audit', 'count': 2, 'active_count': 1},
+            {'date': day, 'mode': 'verified', 'count': 1, 'active_count': 1},
+        ])
+        self.assertEqual(get_certificate_status_counts(self.course.id), [
+            {'status': CertificateStatuses.downloadable, 'mode': 'honor', 'count': 1},
+            {'status': CertificateStatuses.downloadable, 'mode': 'verified', 'count': 2},
+            {'status': CertificateStatuses.notpassing, 'mode': 'honor', 'count': 1},
+        ])
+        self.assertEqual(get_grade_histogram(self.course.id), [
+            (0, 1), (10, 0), (20, 0), (30, 0), (40, 0), (50, 2), (60, 0), (70, 0), (80, 0), (90, 1),
+        ])
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_ANALYTICS_SUMMARIES': True})
+    @patch('instructor_analytics.tasks.transaction.on_commit', side_effect=lambda func: func())
+    def test_updated_by_signals(self, _mock_on_commit):
+        day = datetime.date(2018, 3, 1)
+        self._enroll(day)
+        self._create_certificates()
+        self._create_grades()
+        self._assert_summaries(day)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_ANALYTICS_SUMMARIES': True})
+    @patch('instructor_analytics.tasks.update_grade_histogram.apply_async')
+    @patch('instructor_analytics.tasks.transaction.on_commit')
+    def test_updates_scheduled_on_commit(self, mock_on_commit, mock_apply_async):
+        self._create_grades()
+        self.assertFalse(mock_apply_async.called)
+
+        for (callback,), __ in mock_on_commit.call_args_list:
+            callback()
+        mock_apply_async.assert_called_with(args=(unicode(self.course.id),))
+
+    def test_not_updated_when_disabled(self):
+        self._enroll(datetime.date(2018, 3, 1))
+        self._create_certificates()
+        self._create_grades()
+        self.assertEqual(get_enrollment_daily_counts(self.course.id), [])
+        self.assertEqual(get_certificate_status_counts(self.course.id), [])
+        self.assertEqual(get_grade_histogram(self.course.id), [(lower_bound, 0) for lower_bound in range(0, 100, 10)])
+
+    def test_recompute_command(self):
+        day = datetime.date(2018, 3, 1)
+        self._enroll(day)
+        self._create_certificates()
+        self._create_grades()
+        call_command('compute_course_summaries', unicode(self.course.id))
+        self._assert_summaries(day)
+
+    def test_issued_certificates(self):
+        self._create_certificates()
+        features = ['course_id', 'mode', 'total_issued_certificate', 'report_run_date']
+        expected = issued_certificates(self.course.id, features)
+        call_command('compute_course_summaries', unicode(self.course.id))
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_ANALYTICS_SUMMARIES': True}):
+            with self.assertNumQueries(1):
+                summarized = issued_certificates(self.course.id, features)
+        self.assertItemsEqual(summarized, expected)
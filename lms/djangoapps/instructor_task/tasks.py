@@ -44,6 +44,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
 )
 from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     delete_problem_module_state,
+    perform_module_state_subtask,
     perform_module_state_update,
     override_score_module_state,
     rescore_problem_module_state,
@@ -77,10 +78,30 @@ def rescore_problem(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    def create_subtask_fcn(first_id, last_id, initial_subtask_status):
+        """
+        Creates a subtask that rescores the student modules with ids between first_id and last_id.
+        """
+        return rescore_problem_subtask.subtask(
+            (entry_id, xmodule_instance_args, first_id, last_id, initial_subtask_status.to_dict()),
+            task_id=initial_subtask_status.task_id,
+        )
+
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, create_subtask_fcn=create_subtask_fcn)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task()
+def rescore_problem_subtask(entry_id, xmodule_instance_args, first_id, last_id, subtask_status_dict):
+    """
+    Rescores the student modules with ids between `first_id` and `last_id` as part of the
+    rescore_problem InstructorTask `entry_id`, which queues these subtasks when
+    settings.RESCORE_STUDENT_MODULES_PER_TASK is set.
+    """
+    update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
+    return perform_module_state_subtask(update_fcn, None, entry_id, first_id, last_id, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def override_problem_score(entry_id, xmodule_instance_args):
     """
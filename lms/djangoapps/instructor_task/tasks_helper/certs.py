@@ -6,13 +6,17 @@ from time import time
 from django.contrib.auth.models import User
 from django.db.models import Q
 
-from lms.djangoapps.certificates.api import generate_user_certificates
+from lms.djangoapps.certificates.api import generate_user_certificates_in_bulk
 from lms.djangoapps.certificates.models import CertificateStatuses, GeneratedCertificate
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from student.models import CourseEnrollment
 from xmodule.modulestore.django import modulestore
 
 from .runner import TaskProgress
 
+# Number of students whose certificates are generated together.
+STUDENT_BATCH_SIZE = 100
+
 
 def generate_students_certificates(
         _xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -71,19 +75,25 @@ def generate_students_certificates(
     task_progress.update_task_state(extra_meta=current_step)
 
     course = modulestore().get_course(course_id, depth=0)
-    # Generate certificate for each student
-    for student in students_require_certs:
-        task_progress.attempted += 1
-        status = generate_user_certificates(
-            student,
+    # Grade all students with the same version of the course
+    course_structure = get_course_in_cache(course_id)
+    # Generate certificates for each batch of students
+    students_require_certs = list(students_require_certs)
+    for index in range(0, len(students_require_certs), STUDENT_BATCH_SIZE):
+        students = students_require_certs[index:index + STUDENT_BATCH_SIZE]
+        statuses = generate_user_certificates_in_bulk(
+            students,
             course_id,
-            course=course
+            course=course,
+            collected_block_structure=course_structure,
         )
 
-        if CertificateStatuses.is_passing_status(status):
-            task_progress.succeeded += 1
-        else:
-            task_progress.failed += 1
+        for student in students:
+            task_progress.attempted += 1
+            if CertificateStatuses.is_passing_status(statuses.get(student.id)):
+                task_progress.succeeded += 1
+            else:
+                task_progress.failed += 1
 
     return task_progress.update_task_state(extra_meta=current_step)
 
@@ -30,7 +30,7 @@ from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.course_groups.cohorts import bulk_cache_cohorts, get_cohort, is_course_cohorted
 from openedx.core.djangoapps.user_api.course_tag.api import BulkCourseTags
-from student.models import CourseEnrollment
+from student.models import CourseEnrollment, anonymous_ids_for_users
 from student.roles import BulkRoleCache
 from xmodule.modulestore.django import modulestore
 from xmodule.partitions.partitions_service import PartitionService
@@ -192,6 +192,9 @@ class _CourseGradeBulkContext(object):
         BulkRoleCache.prefetch(users)
         PersistentCourseGrade.prefetch(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
+        # Grading reads submission scores by anonymous id; compute the ids
+        # up front so that grading does not look them up for each user.
+        anonymous_ids_for_users(users, context.course_id, save=False)
 
 
 class CourseGradeReport(object):
@@ -308,25 +311,33 @@ class CourseGradeReport(object):
         users = users.select_related('profile')
         return grouper(users)
 
-    def _user_grades(self, course_grade, context):
+    def _users_grades(self, course_grades, context):
         """
-        Returns a list of grade results for the given course_grade corresponding
-        to the headers for this report.
+        Returns a list with the grade results of each of the given course_grades
+        corresponding to the headers for this report.
         """
-        grade_results = []
+        users_grade_results = [[] for __ in course_grades]
         for assignment_type, assignment_info in context.graded_assignments.iteritems():
+            users_subsection_grades = []
+            for course_grade, grade_results in izip(course_grades, users_grade_results):
+                subsection_grades, subsection_grades_results = self._user_subsection_grades(
+                    course_grade,
+                    assignment_info['subsection_headers'],
+                )
+                grade_results.extend(subsection_grades_results)
+                users_subsection_grades.append(subsection_grades)
 
-            subsection_grades, subsection_grades_results = self._user_subsection_grades(
-                course_grade,
-                assignment_info['subsection_headers'],
+            assignment_averages = self._users_assignment_averages(
+                course_grades, users_subsection_grades, assignment_info,
             )
-            grade_results.extend(subsection_grades_results)
+            if assignment_averages is not None:
+                for grade_results, assignment_average in izip(users_grade_results, assignment_averages):
+                    grade_results.append([assignment_average])
 
-            assignment_average = self._user_assignment_average(course_grade, subsection_grades, assignment_info)
-            if assignment_average is not None:
-                grade_results.append([assignment_average])
-
-        return [course_grade.percent] + _flatten(grade_results)
+        return [
+            [course_grade.percent] + _flatten(grade_results)
+            for course_grade, grade_results in izip(course_grades, users_grade_results)
+        ]
 
     def _user_subsection_grades(self, course_grade, subsection_headers):
         """
@@ -345,18 +356,22 @@ class CourseGradeReport(object):
             subsection_grades.append(subsection_grade)
         return subsection_grades, grade_results
 
-    def _user_assignment_average(self, course_grade, subsection_grades, assignment_info):
+    def _users_assignment_averages(self, course_grades, users_subsection_grades, assignment_info):
+        """
+        Returns the assignment averages of the given course_grades, computed
+        with one call to the assignment type's grader, or None if the report
+        has no separate average column for the assignment type.
+        """
         if assignment_info['separate_subsection_avg_headers']:
             if assignment_info['grader']:
-                if course_grade.attempted:
-                    subsection_breakdown = [
-                        {'percent': subsection_grade.percent_graded}
-                        for subsection_grade in subsection_grades
-                    ]
-                    assignment_average, _ = assignment_info['grader'].total_with_drops(subsection_breakdown)
-                else:
-                    assignment_average = 0.0
-                return assignment_average
+                totals = assignment_info['grader'].totals_with_drops([
+                    [subsection_grade.percent_graded for subsection_grade in subsection_grades]
+                    for subsection_grades in users_subsection_grades
+                ])
+                return [
+                    float(total) if course_grade.attempted else 0.0
+                    for course_grade, total in izip(course_grades, totals)
+                ]
 
     def _user_cohort_group_names(self, user, context):
         """
@@ -458,6 +473,7 @@ class CourseGradeReport(object):
             bulk_context = _CourseGradeBulkContext(context, users)
 
             success_rows, error_rows = [], []
+            graded_users, course_grades = [], []
             for user, course_grade, error in CourseGradeFactory().iter(
                 users,
                 course=context.course,
@@ -468,17 +484,23 @@ class CourseGradeReport(object):
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, text_type(error)])
                 else:
-                    success_rows.append(
-                        [user.id, user.email, user.username] +
-                        self._user_grades(course_grade, context) +
-                        self._user_cohort_group_names(user, context) +
-                        self._user_experiment_group_names(user, context) +
-                        self._user_team_names(user, bulk_context.teams) +
-                        self._user_edraak_university_id(user, context) +
-                        self._user_verification_mode(user, context, bulk_context.enrollments) +
-                        self._user_certificate_info(user, context, course_grade, bulk_context.certs) +
-                        [_user_enrollment_status(user, context.course_id)]
-                    )
+                    graded_users.append(user)
+                    course_grades.append(course_grade)
+
+            # The assignment averages of the whole batch are computed together.
+            users_grades = self._users_grades(course_grades, context)
+            for user, course_grade, user_grades in izip(graded_users, course_grades, users_grades):
+                success_rows.append(
+                    [user.id, user.email, user.username] +
+                    user_grades +
+                    self._user_cohort_group_names(user, context) +
+                    self._user_experiment_group_names(user, context) +
+                    self._user_team_names(user, bulk_context.teams) +
+                    self._user_edraak_university_id(user, context) +
+                    self._user_verification_mode(user, context, bulk_context.enrollments) +
+                    self._user_certificate_info(user, context, course_grade, bulk_context.certs) +
+                    [_user_enrollment_status(user, context.course_id)]
+                )
             return success_rows, error_rows
 
 
@@ -508,9 +530,9 @@ class ProblemGradeReport(object):
         error_rows = [list(header_row.values()) + ['error_msg']]
         current_step = {'step': 'Calculating Grades'}
 
-        # Bulk fetch and cache enrollment states so we can efficiently determine
-        # whether each user is currently enrolled in the course.
-        CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
+        # Load and cache the enrollment states of the whole course so we can
+        # efficiently determine whether each user is currently enrolled in it.
+        CourseEnrollment.warm_enrollment_state_cache(course_id)
 
         for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
             student_fields = [getattr(student, field_name) for field_name in header_row]
@@ -648,11 +670,17 @@ class ProblemResponses(object):
                 block = store.get_item(block_key)
                 generated_report_data = {}
 
+                responses = list_problem_responses(course_key, block_key, max_count)
+
                 # Blocks can implement the generate_report_data method to provide their own
                 # human-readable formatting for user state.
                 if hasattr(block, 'generate_report_data'):
                     try:
-                        user_state_iterator = user_state_client.iter_all_for_block(block_key)
+                        # Only the state of the users whose responses are included is needed.
+                        user_state_iterator = user_state_client.iter_all_for_blocks(
+                            [block_key],
+                            usernames=[response['username'] for response in responses] if max_count else None,
+                        )
                         generated_report_data = {
                             username: state
                             for username, state in
@@ -661,8 +689,6 @@ class ProblemResponses(object):
                     except NotImplementedError:
                         pass
 
-                responses = list_problem_responses(course_key, block_key, max_count)
-
                 student_data += responses
                 for response in responses:
                     response['title'] = title
@@ -9,15 +9,19 @@ from datetime import datetime
 from time import time
 
 import unicodecsv
-from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
 from django.core.files.storage import DefaultStorage
 from openassessment.data import OraAggregateData
 from pytz import UTC
 
 from instructor_analytics.basic import get_proctored_exam_results
 from instructor_analytics.csvs import format_dictlist
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.cohorts import (
+    COHORT_ASSIGNMENT_ADDED,
+    COHORT_ASSIGNMENT_INVALID_EMAIL,
+    COHORT_ASSIGNMENT_PREASSIGNED,
+    COHORT_ASSIGNMENT_USER_NOT_FOUND,
+    add_users_to_cohorts
+)
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from survey.models import SurveyAnswer
 from util.file import UniversalNewlineIterator
@@ -142,78 +146,66 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     start_time = time()
     start_date = datetime.now(UTC)
 
-    # Iterate through rows to get total assignments for task progress
     with DefaultStorage().open(task_input['file_name']) as f:
-        total_assignments = 0
-        for _line in unicodecsv.DictReader(UniversalNewlineIterator(f)):
-            total_assignments += 1
+        rows = list(unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'))
 
-    task_progress = TaskProgress(action_name, total_assignments, start_time)
+    task_progress = TaskProgress(action_name, len(rows), start_time)
     current_step = {'step': 'Cohorting Students'}
     task_progress.update_task_state(extra_meta=current_step)
 
     # cohorts_status is a mapping from cohort_name to metadata about
     # that cohort.  The metadata will include information about users
-    # successfully added to the cohort, users not found, Preassigned
-    # users, and a cached reference to the corresponding cohort object
-    # to prevent redundant cohort queries.
+    # successfully added to the cohort, users not found and Preassigned
+    # users.  All cohorts of the course are fetched at once.
     cohorts_status = {}
+    cohorts = {
+        cohort.name: cohort
+        for cohort in CourseUserGroup.objects.filter(course_id=course_id, group_type=CourseUserGroup.COHORT)
+    }
+
+    assignments = []
+    for row in rows:
+        # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
+        username_or_email = row.get('email') or row.get('username')
+        cohort_name = row.get('cohort') or ''
+        task_progress.attempted += 1
+
+        if not cohorts_status.get(cohort_name):
+            cohorts_status[cohort_name] = {
+                'Cohort Name': cohort_name,
+                'Exists': cohort_name in cohorts,
+                'Learners Added': 0,
+                'Learners Not Found': set(),
+                'Invalid Email Addresses': set(),
+                'Preassigned Learners': set()
+            }
 
-    with DefaultStorage().open(task_input['file_name']) as f:
-        for row in unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'):
-            # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
-            username_or_email = row.get('email') or row.get('username')
-            cohort_name = row.get('cohort') or ''
-            task_progress.attempted += 1
-
-            if not cohorts_status.get(cohort_name):
-                cohorts_status[cohort_name] = {
-                    'Cohort Name': cohort_name,
-                    'Learners Added': 0,
-                    'Learners Not Found': set(),
-                    'Invalid Email Addresses': set(),
-                    'Preassigned Learners': set()
-                }
-                try:
-                    cohorts_status[cohort_name]['cohort'] = CourseUserGroup.objects.get(
-                        course_id=course_id,
-                        group_type=CourseUserGroup.COHORT,
-                        name=cohort_name
-                    )
-                    cohorts_status[cohort_name]["Exists"] = True
-                except CourseUserGroup.DoesNotExist:
-                    cohorts_status[cohort_name]["Exists"] = False
-
-            if not cohorts_status[cohort_name]['Exists']:
-                task_progress.failed += 1
-                continue
-
-            try:
-                # If add_user_to_cohort successfully adds a user, a user object is returned.
-                # If a user is preassigned to a cohort, no user object is returned (we already have the email address).
-                (user, previous_cohort, preassigned) = add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                if preassigned:
-                    cohorts_status[cohort_name]['Preassigned Learners'].add(username_or_email)
-                    task_progress.preassigned += 1
-                else:
-                    cohorts_status[cohort_name]['Learners Added'] += 1
-                    task_progress.succeeded += 1
-            except User.DoesNotExist:
-                # Raised when a user with the username could not be found, and the email is not valid
-                cohorts_status[cohort_name]['Learners Not Found'].add(username_or_email)
-                task_progress.failed += 1
-            except ValidationError:
-                # Raised when a user with the username could not be found, and the email is not valid,
-                # but the entered string contains an "@"
-                # Since there is no way to know if the entered string is an invalid username or an invalid email,
-                # assume that a string with the "@" symbol in it is an attempt at entering an email
-                cohorts_status[cohort_name]['Invalid Email Addresses'].add(username_or_email)
-                task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
-                task_progress.skipped += 1
-
-            task_progress.update_task_state(extra_meta=current_step)
+        if not cohorts_status[cohort_name]['Exists']:
+            task_progress.failed += 1
+            continue
+
+        assignments.append((cohorts[cohort_name], username_or_email))
+
+    results = add_users_to_cohorts(assignments)
+    for (cohort, username_or_email), result in zip(assignments, results):
+        cohort_status = cohorts_status[cohort.name]
+        if result == COHORT_ASSIGNMENT_ADDED:
+            cohort_status['Learners Added'] += 1
+            task_progress.succeeded += 1
+        elif result == COHORT_ASSIGNMENT_PREASSIGNED:
+            cohort_status['Preassigned Learners'].add(username_or_email)
+            task_progress.preassigned += 1
+        elif result == COHORT_ASSIGNMENT_USER_NOT_FOUND:
+            cohort_status['Learners Not Found'].add(username_or_email)
+            task_progress.failed += 1
+        elif result == COHORT_ASSIGNMENT_INVALID_EMAIL:
+            # Since there is no way to know if the entered string is an invalid username or an invalid email,
+            # assume that a string with the "@" symbol in it is an attempt at entering an email
+            cohort_status['Invalid Email Addresses'].add(username_or_email)
+            task_progress.failed += 1
+        else:
+            # The user is already in the given cohort
+            task_progress.skipped += 1
 
     current_step['step'] = 'Uploading CSV'
     task_progress.update_task_state(extra_meta=current_step)
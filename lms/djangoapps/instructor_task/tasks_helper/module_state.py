@@ -5,6 +5,8 @@ import json
 import logging
 from time import time
 
+from celery.states import FAILURE, SUCCESS
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.utils.translation import ugettext_noop
 from opaque_keys.edx.keys import UsageKey
@@ -24,13 +26,16 @@ from xblock.runtime import KvsFieldData
 from xblock.scorable import Score
 from xmodule.modulestore.django import modulestore
 from ..exceptions import UpdateProblemModuleStateError
+from ..models import InstructorTask
+from ..subtasks import SubtaskStatus, check_subtask_is_valid, queue_subtasks_for_query, update_subtask_status
 from .runner import TaskProgress
 from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED, UPDATE_STATUS_SUCCEEDED
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+def perform_module_state_update(update_fcn, filter_fcn, entry_id, course_id, task_input, action_name,
+                                create_subtask_fcn=None):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -42,6 +47,11 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    If `create_subtask_fcn` is provided, the update is for all students and there are more student
+    modules than settings.RESCORE_STUDENT_MODULES_PER_TASK, the student modules are instead split into
+    ranges of consecutive ids that are updated by subtasks.  `create_subtask_fcn` is called with the
+    first and last id of each range and the SubtaskStatus of the subtask, and returns the subtask to queue.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -59,31 +69,22 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     """
     start_time = time()
-    usage_keys = []
-    problem_url = task_input.get('problem_url')
-    entrance_exam_url = task_input.get('entrance_exam_url')
     student_identifier = task_input.get('student')
     override_score_task = action_name == ugettext_noop('overridden')
-    problems = {}
-
-    # if problem_url is present make a usage key from it
-    if problem_url:
-        usage_key = UsageKey.from_string(problem_url).map_into_course(course_id)
-        usage_keys.append(usage_key)
-
-        # find the problem descriptor:
-        problem_descriptor = modulestore().get_item(usage_key)
-        problems[unicode(usage_key)] = problem_descriptor
-
-    # if entrance_exam is present grab all problems in it
-    if entrance_exam_url:
-        problems = get_problems_in_section(entrance_exam_url)
-        usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
+    usage_keys, problems = _get_problems_to_update(course_id, task_input)
 
     modules_to_update = _get_modules_to_update(
         course_id, usage_keys, student_identifier, filter_fcn, override_score_task
     )
 
+    items_per_task = settings.RESCORE_STUDENT_MODULES_PER_TASK
+    if create_subtask_fcn is not None and student_identifier is None and items_per_task:
+        total_num_modules = modules_to_update.count()
+        if total_num_modules > items_per_task:
+            return _queue_module_state_subtasks(
+                entry_id, action_name, create_subtask_fcn, modules_to_update, items_per_task, total_num_modules
+            )
+
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
@@ -108,6 +109,89 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     return task_progress.update_task_state()
 
 
+def _queue_module_state_subtasks(
+    entry_id, action_name, create_subtask_fcn, modules_to_update, items_per_task, total_num_modules
+):
+    """
+    Queues subtasks that each update a range of at most `items_per_task` consecutive
+    student module ids, and returns the task progress stored in the InstructorTask.
+    """
+    def _create_subtask(item_list, initial_subtask_status):
+        """
+        Creates the subtask updating the student modules between the first and last items.
+        """
+        return create_subtask_fcn(item_list[0]['pk'], item_list[-1]['pk'], initial_subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_subtask,
+        [modules_to_update.order_by('id')],
+        [],
+        items_per_task,
+        total_num_modules,
+    )
+
+
+def perform_module_state_subtask(update_fcn, filter_fcn, entry_id, first_id, last_id, subtask_status_dict):
+    """
+    Performs the update of the InstructorTask `entry_id` on the student modules whose ids are
+    between `first_id` and `last_id`, as a subtask queued by perform_module_state_update.
+
+    The problem descriptors and the course are loaded once for the whole range.  The counts of
+    updated student modules are added to the InstructorTask's progress when the subtask is done.
+
+    Returns the final status of the subtask, as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    task_input = json.loads(entry.task_input)
+    usage_keys, problems = _get_problems_to_update(course_id, task_input)
+
+    modules_to_update = StudentModule.get_state_by_params(course_id, usage_keys).filter(
+        id__gte=first_id,
+        id__lte=last_id,
+    ).select_related('student').order_by('id')
+    if filter_fcn is not None:
+        modules_to_update = filter_fcn(modules_to_update)
+    modules_to_update = list(modules_to_update)
+
+    num_remaining = len(modules_to_update)
+    try:
+        with modulestore().bulk_operations(course_id):
+            for module_to_update in modules_to_update:
+                module_descriptor = problems[unicode(module_to_update.module_state_key)]
+                update_status = update_fcn(module_descriptor, module_to_update, task_input)
+                num_remaining -= 1
+                if update_status == UPDATE_STATUS_SUCCEEDED:
+                    subtask_status.increment(succeeded=1)
+                elif update_status == UPDATE_STATUS_FAILED:
+                    subtask_status.increment(failed=1)
+                elif update_status == UPDATE_STATUS_SKIPPED:
+                    # Unlike skipped emails, skipped student modules were attempted, as they
+                    # are when the task updates them all itself (see perform_module_state_update).
+                    subtask_status.increment(skipped=1)
+                    subtask_status.attempted += 1
+                else:
+                    raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+    except Exception:
+        # Count the student modules that were not updated as having failed, so that the
+        # counts of the InstructorTask stay consistent, and record that the subtask failed.
+        TASK_LOG.exception(u"Subtask %s of instructor task %d failed unexpectedly", current_task_id, entry_id)
+        subtask_status.increment(failed=num_remaining, state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 @outer_atomic
 def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
     '''
@@ -387,6 +471,33 @@ def _get_task_id_from_xmodule_args(xmodule_instance_args):
         return xmodule_instance_args.get('task_id', UNKNOWN_TASK_ID)
 
 
+def _get_problems_to_update(course_id, task_input):
+    """
+    Returns the usage keys of the problems to update, as given by the `problem_url` or the
+    `entrance_exam_url` of `task_input`, and a dict of their descriptors by usage key string.
+    """
+    usage_keys = []
+    problems = {}
+    problem_url = task_input.get('problem_url')
+    entrance_exam_url = task_input.get('entrance_exam_url')
+
+    # if problem_url is present make a usage key from it
+    if problem_url:
+        usage_key = UsageKey.from_string(problem_url).map_into_course(course_id)
+        usage_keys.append(usage_key)
+
+        # find the problem descriptor:
+        problem_descriptor = modulestore().get_item(usage_key)
+        problems[unicode(usage_key)] = problem_descriptor
+
+    # if entrance_exam is present grab all problems in it
+    if entrance_exam_url:
+        problems = get_problems_in_section(entrance_exam_url)
+        usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
+
+    return usage_keys, problems
+
+
 def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn, override_score_task=False):
     """
     Fetches a StudentModule instances for a given `course_id`, `student` object, and `usage_keys`.
@@ -13,6 +13,7 @@ from collections import namedtuple
 import ddt
 from celery.states import FAILURE, SUCCESS
 from django.contrib.auth.models import User
+from django.test.utils import override_settings
 from django.urls import reverse
 from mock import patch
 from nose.plugins.attrib import attr
@@ -218,6 +219,24 @@ class TestRescoringTask(TestIntegrationTask):
             problem_edit, new_expected_scores, new_expected_max, rescore_if_higher=False,
         )
 
+    @override_settings(RESCORE_STUDENT_MODULES_PER_TASK=3)
+    def test_rescoring_in_subtasks(self):
+        """
+        Rescoring for all students is split into subtasks of at most
+        RESCORE_STUDENT_MODULES_PER_TASK student modules.
+        """
+        self.verify_rescore_results(
+            dict(correct_answer=OPTION_2), (0, 1, 1, 2), 2, rescore_if_higher=False,
+        )
+
+        instructor_task = InstructorTask.objects.order_by('-id')[0]
+        self.assertEqual(instructor_task.task_state, SUCCESS)
+        self.assertEqual(json.loads(instructor_task.subtasks)['total'], 2)
+        task_output = json.loads(instructor_task.task_output)
+        self.assertEqual(task_output['total'], 4)
+        self.assertEqual(task_output['attempted'], 4)
+        self.assertEqual(task_output['succeeded'], 4)
+
     @ddt.data(
         RescoreTestData(edit=dict(), new_expected_scores=(2, 1, 1, 0), new_expected_max=2),
         RescoreTestData(edit=dict(correct_answer=OPTION_2), new_expected_scores=(2, 1, 1, 2), new_expected_max=2),
@@ -2165,7 +2165,7 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             'failed': 3,
             'skipped': 2
         }
-        with self.assertNumQueries(122):
+        with self.assertNumQueries(55):
             self.assertCertificatesGenerated(task_input, expected_results)
 
         expected_results = {
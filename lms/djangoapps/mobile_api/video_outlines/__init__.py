@@ -1,3 +1,9 @@
 """
 Video outline API
 """
+from openedx.core.djangoapps.waffle_utils import WaffleSwitch, WaffleSwitchNamespace
+
+WAFFLE_SWITCH_NAMESPACE = WaffleSwitchNamespace(name='mobile_api_video_outlines')
+
+# Builds video outlines from the collected course block structure instead of binding modules.
+USE_BLOCK_STRUCTURE_FOR_VIDEO_OUTLINES = WaffleSwitch(WAFFLE_SWITCH_NAMESPACE, 'use_block_structure')
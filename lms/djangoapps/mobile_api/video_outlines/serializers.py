@@ -1,16 +1,32 @@
 """
 Serializer for video outline
 """
+import json
+
+from django.conf import settings
 from edxval.api import ValInternalError, get_video_info_for_course_and_profiles
+from opaque_keys.edx.block_types import BlockTypeKeyV1
 from rest_framework.reverse import reverse
+from xblock.core import XBlock
 
 from courseware.access import has_access
 from courseware.courses import get_course_by_id
 from courseware.model_data import FieldDataCache
+from courseware.models import XModuleStudentPrefsField
 from courseware.module_render import get_module_for_descriptor
+from lms.djangoapps.course_blocks.api import get_course_block_access_transformers, get_course_blocks
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from util.module_utils import get_dynamic_descriptor_children
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
+from xmodule.video_module.transcripts_utils import (
+    add_val_transcript_languages,
+    clean_video_id,
+    get_available_transcript_languages_for_videos,
+    get_default_transcript_language
+)
+
+from .transformers import VideoOutlineTransformer, get_video_outline_data
 
 
 class BlockOutline(object):
@@ -96,6 +112,87 @@ class BlockOutline(object):
                         child_to_parent[block] = curr_block
 
 
+class CollectedBlockOutline(object):
+    """
+    Serializes course videos, pulling data from VAL and the collected course
+    block structure, without binding any modules.
+
+    Summary functions in `block_types` are called with the block structure
+    and the key of the block to summarize.
+    """
+    def __init__(self, course_id, block_types, request, video_profiles):
+        self.block_types = block_types
+        self.course_id = course_id
+        self.request = request  # needed for making full URLS
+        self.local_cache = {
+            'transcript_language': _preferred_transcript_language(request.user),
+        }
+        try:
+            self.local_cache['course_videos'] = get_video_info_for_course_and_profiles(
+                unicode(course_id), video_profiles
+            )
+        except ValInternalError:  # pragma: nocover
+            self.local_cache['course_videos'] = {}
+
+    def __iter__(self):
+        transformers = BlockStructureTransformers(
+            get_course_block_access_transformers(self.request.user) + [VideoOutlineTransformer()]
+        )
+        block_structure = get_course_blocks(
+            self.request.user,
+            modulestore().make_course_usage_key(self.course_id),
+            transformers,
+        )
+        self.local_cache['val_transcript_languages'] = get_available_transcript_languages_for_videos(
+            block_structure.get_transformer_block_field(
+                block_key, VideoOutlineTransformer, VideoOutlineTransformer.VIDEO_DATA
+            ).get('edx_video_id')
+            for block_key in block_structure if block_key.block_type == 'video'
+        )
+
+        child_to_parent = {}
+        stack = [block_structure.root_block_usage_key]
+        while stack:
+            block_key = stack.pop()
+
+            if block_structure.get_xblock_field(block_key, 'hide_from_toc'):
+                # See BlockOutline for why hidden blocks are not traversed.
+                continue
+
+            if block_key.block_type in self.block_types:
+                summary_fn = self.block_types[block_key.block_type]
+                block_path = list(collected_path(block_structure, block_key, child_to_parent))
+                unit_url, section_url = find_collected_urls(
+                    self.course_id, block_structure, block_key, child_to_parent, self.request
+                )
+
+                yield {
+                    "path": block_path,
+                    "named_path": [b["name"] for b in block_path],
+                    "unit_url": unit_url,
+                    "section_url": section_url,
+                    "summary": summary_fn(self.course_id, block_structure, block_key, self.request, self.local_cache)
+                }
+
+            for child_key in reversed(block_structure.get_children(block_key)):
+                if child_key.block_type in self.block_types or child_key.block_type in BLOCK_TYPES_WITH_CHILDREN:
+                    stack.append(child_key)
+                    child_to_parent[child_key] = block_key
+
+
+def _preferred_transcript_language(user):
+    """
+    Returns the user's preferred transcript language for videos, as set in
+    the video player, or the field's default.
+    """
+    value = XModuleStudentPrefsField.objects.filter(
+        student=user.pk,
+        module_type=BlockTypeKeyV1(XBlock.entry_point, 'video'),
+        field_name='transcript_language',
+    ).values_list('value', flat=True).first()
+    return json.loads(value) if value is not None else u'en'
+
+
 def path(block, child_to_parent, start_block):
     """path for block"""
     block_path = []
@@ -111,6 +208,22 @@ def path(block, child_to_parent, start_block):
     return reversed(block_path)
 
 
+def collected_path(block_structure, block_key, child_to_parent):
+    """path for block, read from the collected block structure"""
+    block_path = []
+    while block_key in child_to_parent:
+        block_key = child_to_parent[block_key]
+        if block_key != block_structure.root_block_usage_key:
+            block_path.append({
+                'name': block_structure.get_transformer_block_field(
+                    block_key, VideoOutlineTransformer, VideoOutlineTransformer.DISPLAY_NAME
+                ),
+                'category': block_key.block_type,
+                'id': unicode(block_key)
+            })
+    return reversed(block_path)
+
+
 def find_urls(course_id, block, child_to_parent, request):
     """
     Find the section and unit urls for a block.
@@ -140,17 +253,55 @@ def find_urls(course_id, block, child_to_parent, request):
                 break
             position += 1
 
+    return _courseware_urls(course_id, chapter_id, section.url_name if section else None, position, request)
+
+
+def find_collected_urls(course_id, block_structure, block_key, child_to_parent, request):
+    """
+    Find the section and unit urls for a block, reading the block's
+    ancestry from the collected block structure.
+
+    Returns:
+        unit_url, section_url: See find_urls.
+    """
+    block_path = []
+    while block_key in child_to_parent:
+        block_key = child_to_parent[block_key]
+        block_path.append(block_key)
+
+    block_list = list(reversed(block_path))
+    block_count = len(block_list)
+
+    chapter_id = block_list[1].block_id if block_count > 1 else None
+    section_key = block_list[2] if block_count > 2 else None
+    position = None
+
+    if block_count > 3:
+        positions = block_structure.get_transformer_block_field(
+            block_list[3], VideoOutlineTransformer, VideoOutlineTransformer.POSITIONS, {}
+        )
+        position = positions.get(section_key, len(block_structure.get_children(section_key)) + 1)
+
+    return _courseware_urls(
+        course_id, chapter_id, section_key.block_id if section_key else None, position, request
+    )
+
+
+def _courseware_urls(course_id, chapter_id, section_url_name, position, request):
+    """
+    Returns the unit and section urls for the given courseware location.
+    """
     kwargs = {'course_id': unicode(course_id)}
     if chapter_id is None:
         course_url = reverse("courseware", kwargs=kwargs, request=request)
         return course_url, course_url
 
     kwargs['chapter'] = chapter_id
-    if section is None:
+    if section_url_name is None:
         chapter_url = reverse("courseware_chapter", kwargs=kwargs, request=request)
         return chapter_url, chapter_url
 
-    kwargs['section'] = section.url_name
+    kwargs['section'] = section_url_name
     section_url = reverse("courseware_section", kwargs=kwargs, request=request)
     if position is None:
         return section_url, section_url
@@ -164,16 +315,68 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
     """
     returns summary dict for the given video module
     """
+    video_data = get_video_outline_data(video_descriptor)
+    language, transcript_languages = None, []
+    if not video_descriptor.only_on_web:
+        transcripts_info = video_descriptor.get_transcripts_info()
+        language = video_descriptor.get_default_transcript_language(transcripts_info)
+        transcript_languages = video_descriptor.available_translations(transcripts=transcripts_info)
+    return _video_summary(
+        video_profiles, course_id, video_descriptor.scope_ids.usage_id, video_data,
+        language, transcript_languages, request, local_cache
+    )
+
+
+def collected_video_summary(video_profiles, course_id, block_structure, video_key, request, local_cache):
+    """
+    returns summary dict for the given video, from the collected block structure
+    """
+    video_data = block_structure.get_transformer_block_field(
+        video_key, VideoOutlineTransformer, VideoOutlineTransformer.VIDEO_DATA
+    )
+    language, transcript_languages = None, []
+    if not video_data['only_on_web']:
+        transcripts_info, transcript_languages = _collected_transcripts(video_data, local_cache)
+        language = get_default_transcript_language(transcripts_info, local_cache['transcript_language'])
+    return _video_summary(
+        video_profiles, course_id, video_key, video_data, language, transcript_languages, request, local_cache
+    )
+
+
+def _collected_transcripts(video_data, local_cache):
+    """
+    Returns the transcripts info and the available transcript languages of
+    the given collected video, adding the video's edx-val transcripts the way
+    VideoTranscriptsMixin.get_transcripts_info and available_translations do.
+    """
+    val_languages = local_cache['val_transcript_languages'].get(clean_video_id(video_data['edx_video_id']), [])
+    transcripts_info = add_val_transcript_languages(video_data['transcripts_info'], val_languages)
+
+    if settings.FEATURES.get('FALLBACK_TO_ENGLISH_TRANSCRIPTS'):
+        transcript_languages = list(transcripts_info['transcripts'])
+        if not transcript_languages or transcripts_info['sub']:
+            transcript_languages.append('en')
+    else:
+        transcript_languages = video_data['contentstore_transcript_languages'] + val_languages
+
+    return transcripts_info, list(set(transcript_languages))
+
+
+def _video_summary(video_profiles, course_id, usage_key, video_data, language, transcript_languages,
+                   request, local_cache):
+    """
+    returns summary dict for the video with the given outline data, see get_video_outline_data
+    """
     always_available_data = {
-        "name": video_descriptor.display_name,
-        "category": video_descriptor.category,
-        "id": unicode(video_descriptor.scope_ids.usage_id),
-        "only_on_web": video_descriptor.only_on_web,
+        "name": video_data['display_name'],
+        "category": usage_key.block_type,
+        "id": unicode(usage_key),
+        "only_on_web": video_data['only_on_web'],
     }
 
     all_sources = []
 
-    if video_descriptor.only_on_web:
+    if video_data['only_on_web']:
         ret = {
             "video_url": None,
             "video_thumbnail_url": None,
@@ -187,48 +390,45 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
         return ret
 
     # Get encoded videos
-    video_data = local_cache['course_videos'].get(video_descriptor.edx_video_id, {})
+    val_video_data = local_cache['course_videos'].get(video_data['edx_video_id'], {})
 
     # Get highest priority video to populate backwards compatible field
     default_encoded_video = {}
 
-    if video_data:
+    if val_video_data:
         for profile in video_profiles:
-            default_encoded_video = video_data['profiles'].get(profile, {})
+            default_encoded_video = val_video_data['profiles'].get(profile, {})
             if default_encoded_video:
                 break
 
     if default_encoded_video:
         video_url = default_encoded_video['url']
     # Then fall back to VideoDescriptor fields for video URLs
-    elif video_descriptor.html5_sources:
-        video_url = video_descriptor.html5_sources[0]
-        all_sources = video_descriptor.html5_sources
+    elif video_data['html5_sources']:
+        video_url = video_data['html5_sources'][0]
+        all_sources = list(video_data['html5_sources'])
     else:
-        video_url = video_descriptor.source
+        video_url = video_data['source']
 
-    if video_descriptor.source:
-        all_sources.append(video_descriptor.source)
+    if video_data['source']:
+        all_sources.append(video_data['source'])
 
     # Get duration/size, else default
-    duration = video_data.get('duration', None)
+    duration = val_video_data.get('duration', None)
     size = default_encoded_video.get('file_size', 0)
 
     # Transcripts...
-    transcripts_info = video_descriptor.get_transcripts_info()
-    transcript_langs = video_descriptor.available_translations(transcripts=transcripts_info)
-
     transcripts = {
         lang: reverse(
             'video-transcripts-detail',
             kwargs={
                 'course_id': unicode(course_id),
-                'block_id': video_descriptor.scope_ids.usage_id.block_id,
+                'block_id': usage_key.block_id,
                 'lang': lang
             },
             request=request,
         )
-        for lang in transcript_langs
+        for lang in transcript_languages
     }
 
     ret = {
@@ -237,8 +437,8 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
         "duration": duration,
         "size": size,
         "transcripts": transcripts,
-        "language": video_descriptor.get_default_transcript_language(transcripts_info),
-        "encoded_videos": video_data.get('profiles'),
+        "language": language,
+        "encoded_videos": val_video_data.get('profiles'),
         "all_sources": all_sources,
     }
     ret.update(always_available_data)
@@ -11,6 +11,7 @@ from mock import Mock
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.files.base import ContentFile
 from edxval import api
 from milestones.tests.utils import MilestonesTestCaseMixin
 from mock import patch
@@ -18,6 +19,7 @@ from nose.plugins.attrib import attr
 
 from mobile_api.models import MobileApiConfig
 from mobile_api.testutils import MobileAPITestCase, MobileAuthTestMixin, MobileCourseAccessTestMixin
+from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, remove_user_from_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
@@ -26,6 +28,8 @@ from xmodule.modulestore.tests.factories import ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
 from xmodule.video_module import transcripts_utils
 
+from . import USE_BLOCK_STRUCTURE_FOR_VIDEO_OUTLINES
+
 
 class TestVideoAPITestCase(MobileAPITestCase):
     """
@@ -922,9 +926,8 @@ class TestVideoSummaryList(TestVideoAPITestCase, MobileAuthTestMixin, MobileCour
         ({'uk': 1, 'de': 1}, 'en-subs', ['de', 'en'], ['en', 'uk', 'de']),
     )
     @ddt.unpack
-    @patch('xmodule.video_module.transcripts_utils.edxval_api.get_available_transcript_languages')
     def test_val_transcripts_with_feature_enabled(self, transcripts, english_sub, val_transcripts,
-                                                  expected_transcripts, mock_get_transcript_languages):
+                                                  expected_transcripts):
         self.login_and_enroll()
         video = ItemFactory.create(
             parent=self.nameless_unit,
@@ -933,7 +936,8 @@ class TestVideoSummaryList(TestVideoAPITestCase, MobileAuthTestMixin, MobileCour
             display_name=u"test draft video omega 2 \u03a9"
         )
 
-        mock_get_transcript_languages.return_value = val_transcripts
+        for language_code in val_transcripts:
+            self._create_val_transcript(language_code)
         video.transcripts = transcripts
         video.sub = english_sub
         modulestore().update_item(video, self.user.id)
@@ -942,6 +946,66 @@ class TestVideoSummaryList(TestVideoAPITestCase, MobileAuthTestMixin, MobileCour
         self.assertEqual(len(course_outline), 1)
         self.assertItemsEqual(course_outline[0]['summary']['transcripts'].keys(), expected_transcripts)
 
+    def _create_val_transcript(self, language_code):
+        """
+        Creates an edx-val transcript in the given language for the test video.
+        """
+        api.create_video_transcript(
+            video_id=self.edx_video_id,
+            language_code=language_code,
+            file_format='srt',
+            content=ContentFile('0\n00:00:00,010 --> 00:00:00,100\nHi, welcome to Edx.\n\n'),
+        )
+
+
+class CollectedVideoOutlineMixin(object):
+    """
+    Mixin for running the video outline tests against the outline built
+    from the collected course block structure.
+    """
+    def setUp(self):
+        super(CollectedVideoOutlineMixin, self).setUp()
+        patcher = patch.object(USE_BLOCK_STRUCTURE_FOR_VIDEO_OUTLINES, 'is_enabled', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def api_response(self, *args, **kwargs):
+        # Tests modify the course without sending publish signals, so make
+        # sure each request collects the current version of the course.
+        clear_course_from_cache(self.course.id)
+        return super(CollectedVideoOutlineMixin, self).api_response(*args, **kwargs)
+
+
+@attr(shard=9)
+class TestCollectedNonStandardCourseStructure(CollectedVideoOutlineMixin, TestNonStandardCourseStructure):
+    """
+    Tests the block structure based video outline with no course set
+    """
+    pass
+
+
+@attr(shard=9)
+class TestCollectedVideoSummaryList(CollectedVideoOutlineMixin, TestVideoSummaryList):
+    """
+    Tests the block structure based video outline
+    """
+    def test_val_transcripts_not_collected(self):
+        self.login_and_enroll()
+        ItemFactory.create(
+            parent=self.nameless_unit,
+            category="video",
+            edx_video_id=self.edx_video_id,
+            display_name=u"test draft video omega 2 \u03a9"
+        )
+        course_outline = self.api_response().data
+        self.assertItemsEqual(course_outline[0]['summary']['transcripts'].keys(), ['en'])
+
+        # edx-val transcripts are added without a course publish, so they must
+        # show up without collecting the course again.
+        self._create_val_transcript('de')
+        course_outline = super(CollectedVideoOutlineMixin, self).api_response().data
+        self.assertItemsEqual(course_outline[0]['summary']['transcripts'].keys(), ['en', 'de'])
+
 
 @attr(shard=9)
 class TestTranscriptsDetail(TestVideoAPITestCase, MobileAuthTestMixin, MobileCourseAccessTestMixin,
@@ -0,0 +1,105 @@
+"""
+Video Outline Transformer
+"""
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from xmodule.exceptions import NotFoundError
+from xmodule.video_module.transcripts_utils import Transcript, get_transcript_from_contentstore
+
+
+def get_video_outline_data(video):
+    """
+    Returns the data of the given video block that the video outline needs,
+    independent of the user requesting it.
+
+    Transcripts uploaded to edx-val can change without a course publish, so
+    `transcripts_info` only holds the transcripts set in the video's fields.
+    """
+    video_outline_data = {
+        'display_name': video.display_name,
+        'only_on_web': video.only_on_web,
+    }
+    if video.only_on_web:
+        return video_outline_data
+
+    video_outline_data.update({
+        'edx_video_id': video.edx_video_id,
+        'html5_sources': list(video.html5_sources),
+        'source': video.source,
+        'transcripts_info': video.get_transcripts_info(include_val_transcripts=False),
+    })
+    return video_outline_data
+
+
+def get_contentstore_transcript_languages(video, transcripts_info):
+    """
+    Returns the languages of the given video's field transcripts that are
+    found in the contentstore.
+    """
+    languages = set(transcripts_info['transcripts'])
+    if transcripts_info['sub']:
+        languages.add('en')
+
+    available_languages = []
+    for language in languages:
+        try:
+            get_transcript_from_contentstore(video, language, Transcript.SRT, transcripts_info)
+        except NotFoundError:
+            continue
+        available_languages.append(language)
+    return available_languages
+
+
+class VideoOutlineTransformer(BlockStructureTransformer):
+    """
+    Collects the data needed to serialize the mobile video outline, so that
+    it can be built from the block structure without binding any modules:
+    the display name of each parent block, the position of each block
+    within its parents, and the outline data of each video.
+
+    Only data that changes with a course publish is collected; the edx-val
+    transcripts of the videos are looked up by the serializer per request.
+    """
+    WRITE_VERSION = 2
+    READ_VERSION = 2
+    DISPLAY_NAME = 'display_name_with_default_escaped'
+    POSITIONS = 'positions'
+    VIDEO_DATA = 'video_data'
+
+    @classmethod
+    def name(cls):
+        return "mobile_api:video_outline"
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the video outline data for each block.
+        """
+        block_structure.request_xblock_fields('hide_from_toc')
+
+        for block_key in block_structure.topological_traversal():
+            block = block_structure.get_xblock(block_key)
+
+            children = block_structure.get_children(block_key)
+            if children:
+                block_structure.set_transformer_block_field(
+                    block_key, cls, cls.DISPLAY_NAME, block.display_name_with_default_escaped
+                )
+                for position, child_key in enumerate(children, start=1):
+                    positions = block_structure.get_transformer_block_field(child_key, cls, cls.POSITIONS, {})
+                    positions[block_key] = position
+                    block_structure.set_transformer_block_field(child_key, cls, cls.POSITIONS, positions)
+
+            if block_key.block_type == 'video':
+                video_data = get_video_outline_data(block)
+                if not video_data['only_on_web']:
+                    video_data['contentstore_transcript_languages'] = get_contentstore_transcript_languages(
+                        block, video_data['transcripts_info']
+                    )
+                block_structure.set_transformer_block_field(block_key, cls, cls.VIDEO_DATA, video_data)
+
+    def transform(self, usage_info, block_structure):
+        """
+        No transformation is needed; the collected data is read by the
+        video outline serializer.
+        """
+        pass
@@ -25,7 +25,8 @@ from xmodule.video_module.transcripts_utils import (
 )
 
 from ..decorators import mobile_course_access, mobile_view
-from .serializers import BlockOutline, video_summary
+from . import USE_BLOCK_STRUCTURE_FOR_VIDEO_OUTLINES
+from .serializers import BlockOutline, CollectedBlockOutline, collected_video_summary, video_summary
 
 
 @mobile_view()
@@ -80,8 +81,32 @@ class VideoSummaryList(generics.ListAPIView):
               Management System.
     """
 
+    def list(self, request, *args, **kwargs):
+        if USE_BLOCK_STRUCTURE_FOR_VIDEO_OUTLINES.is_enabled():
+            return self._list_from_block_structure(request, *args, **kwargs)
+        return self._list_from_modules(request, *args, **kwargs)
+
+    @mobile_course_access()
+    def _list_from_block_structure(self, request, course, *args, **kwargs):
+        """
+        Lists the course's videos from its collected block structure.
+        """
+        video_profiles = MobileApiConfig.get_video_profiles()
+        video_outline = list(
+            CollectedBlockOutline(
+                course.id,
+                {"video": partial(collected_video_summary, video_profiles)},
+                request,
+                video_profiles,
+            )
+        )
+        return Response(video_outline)
+
     @mobile_course_access(depth=None)
-    def list(self, request, course, *args, **kwargs):
+    def _list_from_modules(self, request, course, *args, **kwargs):
+        """
+        Lists the course's videos by binding each of its modules.
+        """
         video_profiles = MobileApiConfig.get_video_profiles()
         video_outline = list(
             BlockOutline(
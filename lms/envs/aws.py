@@ -653,6 +653,10 @@ GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
 
+RESCORE_STUDENT_MODULES_PER_TASK = ENV_TOKENS.get(
+    'RESCORE_STUDENT_MODULES_PER_TASK', RESCORE_STUDENT_MODULES_PER_TASK
+)
+
 # Queue to use for updating grades due to grading policy change
 POLICY_CHANGE_GRADES_ROUTING_KEY = ENV_TOKENS.get(
     'POLICY_CHANGE_GRADES_ROUTING_KEY', LOW_PRIORITY_QUEUE,
@@ -178,6 +178,11 @@ FEATURES = {
     # Enable instructor dash to submit background tasks
     'ENABLE_INSTRUCTOR_BACKGROUND_TASKS': True,
 
+    # Maintain per-course enrollment, certificate and grade summary tables in
+    # the background and serve instructor analytics from them. Run the
+    # compute_course_summaries management command before enabling.
+    'ENABLE_COURSE_ANALYTICS_SUMMARIES': False,
+
     # Enable instructor to assign individual due dates
     # Note: In order for this feature to work, you must also add
     # 'courseware.student_field_overrides.IndividualStudentOverrideProvider' to
@@ -1962,6 +1967,14 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     # Maximum number of retries per task.
     TASK_MAX_RETRIES=5,
 
+    # Time, in seconds, after which a lock held by a worker collecting
+    # a block structure expires if it is never released.
+    COLLECTION_LOCK_TIMEOUT=300,
+
+    # Time, in seconds, a request waits for another worker to finish
+    # collecting a block structure before collecting it itself.
+    COLLECTION_WAIT_TIMEOUT=10,
+
     # Backend storage options
     PRUNING_ACTIVE=False,
 )
@@ -2114,6 +2127,7 @@ INSTALLED_APPS = [
     'lms.djangoapps.certificates.apps.CertificatesConfig',
     'dashboard',
     'lms.djangoapps.instructor_task',
+    'instructor_analytics.apps.InstructorAnalyticsConfig',
     'openedx.core.djangoapps.course_groups',
     'bulk_email',
     'branding',
@@ -2652,6 +2666,11 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+###################### Problem Rescoring ######################
+# Number of student modules rescored by each subtask when a problem is
+# rescored for all learners. If None, a single task rescores all of them.
+RESCORE_STUDENT_MODULES_PER_TASK = None
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-financial-reports',
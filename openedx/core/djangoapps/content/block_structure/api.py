@@ -29,7 +29,7 @@ def update_course_in_cache(course_key):
     return get_block_structure_manager(course_key).update_collected_if_needed()
 
 
-def clear_course_from_cache(course_key):
+def clear_course_from_cache(course_key, keep_stale=False):
     """
     A higher order function implemented on top of the
     block_structure.clear_block_cache function that clears the block
@@ -39,8 +39,11 @@ def clear_course_from_cache(course_key):
     implemented, this implementation should still be valid since the
     entire block structure of the course is cached, even though
     arbitrary access to an intermediate block will be supported.
+
+    When keep_stale is True, the cleared block structure may still be
+    served as a stale copy until it is re-collected.
     """
-    get_block_structure_manager(course_key).clear()
+    get_block_structure_manager(course_key).clear(keep_stale=keep_stale)
 
 
 def get_block_structure_manager(course_key):
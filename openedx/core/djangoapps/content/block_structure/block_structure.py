@@ -8,7 +8,6 @@ The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
     _BlockData - Data structure for a single block's data.
 """
-from copy import deepcopy
 from functools import partial
 from logging import getLogger
 
@@ -24,11 +23,22 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 TRANSFORMER_VERSION_KEY = '_version'
 
 
+def _intern_field_name(field_name):
+    """
+    Returns the interned version of the given field name, so that all
+    blocks of a structure share a single copy of each of their field
+    names, both in memory and in the pickled structure.
+    """
+    return intern(field_name) if type(field_name) is str else field_name
+
+
 class _BlockRelations(object):
     """
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
     """
+    __slots__ = ('parents', 'children')
+
     def __init__(self):
 
         # List of usage keys of this block's parents.
@@ -39,6 +49,23 @@ class _BlockRelations(object):
         # list [UsageKey]
         self.children = []
 
+    def copy(self):
+        """
+        Returns a new _BlockRelations with copies of this block's
+        parents and children lists.
+        """
+        relations = _BlockRelations()
+        relations.parents = list(self.parents)
+        relations.children = list(self.children)
+        return relations
+
+    def __getstate__(self):
+        return {'parents': self.parents, 'children': self.children}
+
+    def __setstate__(self, state):
+        self.parents = state['parents']
+        self.children = state['children']
+
 
 class BlockStructure(object):
     """
@@ -280,7 +307,14 @@ class BlockStructure(object):
 class FieldData(object):
     """
     Data structure to encapsulate collected fields.
+
+    Instances use __slots__ rather than a per-instance __dict__, since a
+    collected course holds thousands of them.  The pickled state is
+    still a dict of the class fields, so it is compatible with data
+    stored by earlier versions of this class.
     """
+    __slots__ = ('fields',)
+
     def class_field_names(self):
         """
         Returns list of names of fields that are defined directly
@@ -306,7 +340,24 @@ class FieldData(object):
         if self._is_own_field(field_name):
             return super(FieldData, self).__setattr__(field_name, field_value)
         else:
-            self.fields[field_name] = field_value
+            self.fields[_intern_field_name(field_name)] = field_value
+
+    def __getstate__(self):
+        return {field_name: getattr(self, field_name) for field_name in self.class_field_names()}
+
+    def __setstate__(self, state):
+        for field_name, field_value in state.iteritems():
+            super(FieldData, self).__setattr__(field_name, field_value)
+
+    def copy(self):
+        """
+        Returns a shallow copy of this object: its fields dict is
+        copied, while the field values themselves are shared.
+        """
+        field_data = self.__class__.__new__(self.__class__)
+        field_data.__setstate__(self.__getstate__())
+        field_data.fields = dict(self.fields)
+        return field_data
 
     def __delattr__(self, field_name):
         if self._is_own_field(field_name):
@@ -326,7 +377,7 @@ class TransformerData(FieldData):
     """
     Data structure to encapsulate collected data for a transformer.
     """
-    pass
+    __slots__ = ()
 
 
 class TransformerDataMap(dict):
@@ -347,6 +398,16 @@ class TransformerDataMap(dict):
         key = self._translate_key(key)
         dict.__delitem__(self, key)
 
+    def copy(self):
+        """
+        Returns a new TransformerDataMap with shallow copies of each
+        of this map's TransformerData.
+        """
+        return TransformerDataMap(
+            (transformer_name, transformer_data.copy())
+            for transformer_name, transformer_data in self.iteritems()
+        )
+
     def get_or_create(self, key):
         """
         Returns the TransformerData associated with the given
@@ -379,6 +440,8 @@ class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
     """
+    __slots__ = ('location', 'transformer_data')
+
     def class_field_names(self):
         return super(BlockData, self).class_field_names() + ['location', 'transformer_data']
 
@@ -391,6 +454,15 @@ class BlockData(FieldData):
         # Map of transformer name to its block-specific data.
         self.transformer_data = TransformerDataMap()
 
+    def copy(self):
+        """
+        Returns a shallow copy of this block's data, including
+        shallow copies of its transformer data.
+        """
+        block_data = super(BlockData, self).copy()
+        block_data.transformer_data = self.transformer_data.copy()
+        return block_data
+
 
 class BlockStructureBlockData(BlockStructure):
     """
@@ -414,18 +486,37 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Set of usage keys whose BlockData is shared with another
+        # copy of this structure and so must be copied before being
+        # modified.
+        # set(UsageKey)
+        self._shared_block_keys = set()
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
-        deep-copy of this instance's contents.
+        copy-on-write copy of this instance's contents.
+
+        The block relations and structure-wide transformer data are
+        copied right away.  The BlockData of each block is shared by
+        both structures until either one modifies it through this
+        class's methods, at which point that structure gets its own
+        copy of the block's data.  Collected field values themselves
+        are never copied and must not be mutated in place.
         """
         from .factory import BlockStructureFactory
-        return BlockStructureFactory.create_new(
+        block_structure = BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
-            deepcopy(self.transformer_data),
-            deepcopy(self._block_data_map),
+            {
+                block_key: relations.copy()
+                for block_key, relations in self._block_relations.iteritems()
+            },
+            self.transformer_data.copy(),
+            dict(self._block_data_map),
         )
+        self._shared_block_keys = set(self._block_data_map)
+        block_structure._shared_block_keys = set(self._block_data_map)  # pylint: disable=protected-access
+        return block_structure
 
     def iteritems(self):
         """
@@ -479,7 +570,7 @@ class BlockStructureBlockData(BlockStructure):
 
             override_data (object) - The data you want to set
         """
-        block_data = self._block_data_map.get(usage_key)
+        block_data = self._get_block_for_update(usage_key)
         setattr(block_data, field_name, override_data)
 
     def get_transformer_data(self, transformer, key, default=None):
@@ -593,7 +684,7 @@ class BlockStructureBlockData(BlockStructure):
                 whose data entry is to be deleted.
         """
         try:
-            transformer_block_data = self.get_transformer_block_data(usage_key, transformer)
+            transformer_block_data = self._get_block_for_update(usage_key).transformer_data[transformer]
             delattr(transformer_block_data, key)
         except (AttributeError, KeyError):
             pass
@@ -632,6 +723,7 @@ class BlockStructureBlockData(BlockStructure):
         # Remove block.
         self._block_relations.pop(usage_key, None)
         self._block_data_map.pop(usage_key, None)
+        self._shared_block_keys.discard(usage_key)
 
         # Recreate the graph connections if descendants are to be kept.
         if keep_descendants:
@@ -752,16 +844,27 @@ class BlockStructureBlockData(BlockStructure):
 
     def _get_or_create_block(self, usage_key):
         """
-        Returns the BlockData associated with the given usage_key.
-        If not found, creates and returns a new BlockData and
-        maps it to the given key.
+        Returns the BlockData associated with the given usage_key,
+        ready to be modified. If not found, creates and returns a new
+        BlockData and maps it to the given key.
         """
-        try:
-            return self._block_data_map[usage_key]
-        except KeyError:
+        block_data = self._get_block_for_update(usage_key)
+        if block_data is None:
             block_data = BlockData(usage_key)
             self._block_data_map[usage_key] = block_data
-            return block_data
+        return block_data
+
+    def _get_block_for_update(self, usage_key):
+        """
+        Returns the BlockData associated with the given usage_key,
+        first replacing it with a copy if it is shared with another
+        copy of this structure. Returns None if not found.
+        """
+        if usage_key in self._shared_block_keys:
+            self._shared_block_keys.discard(usage_key)
+            if usage_key in self._block_data_map:
+                self._block_data_map[usage_key] = self._block_data_map[usage_key].copy()
+        return self._block_data_map.get(usage_key)
 
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
@@ -3,6 +3,10 @@ Top-level module for the Block Structure framework with a class for managing
 BlockStructures.
 """
 from contextlib import contextmanager
+from logging import getLogger
+from time import sleep, time
+
+from django.conf import settings
 
 from . import config
 from .exceptions import UsageKeyNotInBlockStructure, TransformerDataIncompatible, BlockStructureNotFound
@@ -11,6 +15,13 @@ from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
 
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+COLLECT_LOCK = u'collect'
+REFRESH_LOCK = u'refresh'
+WAIT_FOR_COLLECTED_INTERVAL = 0.2
+
+
 class BlockStructureManager(object):
     """
     Top-level class for managing Block Structures.
@@ -85,23 +96,29 @@ class BlockStructureManager(object):
         the modulestore is accessed if needed (at cache miss), and the
         transformers data is collected if needed.
 
+        Only one worker at a time collects a missing or incompatible Block
+        Structure; concurrent callers wait for it to be stored instead of
+        collecting it again.  When the serve_stale_while_revalidate switch
+        is enabled, a stale copy of a missing Block Structure is returned
+        right away while a background task re-collects it.
+
         Returns:
             BlockStructureBlockData - A collected block structure,
                 starting at root_block_usage_key, with collected data
                 from each registered transformer.
         """
         try:
-            block_structure = BlockStructureFactory.create_from_store(
-                self.root_block_usage_key,
-                self.store,
-            )
-            BlockStructureTransformers.verify_versions(block_structure)
+            block_structure = self._get_from_store()
 
-        except (BlockStructureNotFound, TransformerDataIncompatible):
+        except (BlockStructureNotFound, TransformerDataIncompatible) as exc:
             if config.waffle().is_enabled(config.RAISE_ERROR_WHEN_NOT_FOUND):
                 raise
+
+            block_structure = self._get_stale() if isinstance(exc, BlockStructureNotFound) else None
+            if block_structure:
+                self._enqueue_update_collected()
             else:
-                block_structure = self._update_collected()
+                block_structure = self._update_collected_once()
 
         return block_structure
 
@@ -128,12 +145,85 @@ class BlockStructureManager(object):
             self.store.add(block_structure)
             return block_structure
 
-    def clear(self):
+    def clear(self, keep_stale=False):
         """
         Removes data for the block structure associated with the given
         root block key.
+
+        Arguments:
+            keep_stale (boolean) - Whether the removed block structure may
+                still be served as a stale copy until it is re-collected.
+        """
+        self.store.delete(self.root_block_usage_key, keep_stale=keep_stale)
+
+    def _get_from_store(self):
+        """
+        Returns the block structure from the store, verifying that its
+        collected data is compatible with the registered transformers.
+
+        Raises:
+            BlockStructureNotFound, TransformerDataIncompatible
+        """
+        block_structure = BlockStructureFactory.create_from_store(
+            self.root_block_usage_key,
+            self.store,
+        )
+        BlockStructureTransformers.verify_versions(block_structure)
+        return block_structure
+
+    def _get_stale(self):
+        """
+        Returns the stale copy of the block structure if one is available
+        and still compatible with the registered transformers, else None.
+        """
+        try:
+            block_structure = self.store.get_stale(self.root_block_usage_key)
+            BlockStructureTransformers.verify_versions(block_structure)
+        except (BlockStructureNotFound, TransformerDataIncompatible):
+            return None
+        return block_structure
+
+    def _enqueue_update_collected(self):
+        """
+        Enqueues a task that re-collects the block structure, unless one
+        was already enqueued within the collection lock timeout.
         """
-        self.store.delete(self.root_block_usage_key)
+        # Imported here since the tasks module depends on this one through the api.
+        from .tasks import update_course_in_cache_v2
+
+        if self.store.add_lock(self.root_block_usage_key, REFRESH_LOCK, _collect_lock_timeout()):
+            update_course_in_cache_v2.apply_async(
+                kwargs=dict(course_id=unicode(self.root_block_usage_key.course_key)),
+            )
+
+    def _update_collected_once(self):
+        """
+        Collects the block structure, making sure that only one worker
+        at a time does so.  Workers that don't get the collection lock
+        wait for the collected block structure to be stored, and only
+        collect it themselves if it doesn't show up in time.
+        """
+        if self.store.add_lock(self.root_block_usage_key, COLLECT_LOCK, _collect_lock_timeout()):
+            try:
+                # Another worker may have stored it since our cache miss.
+                return self._get_from_store()
+            except (BlockStructureNotFound, TransformerDataIncompatible):
+                return self._update_collected()
+            finally:
+                self.store.delete_lock(self.root_block_usage_key, COLLECT_LOCK)
+
+        deadline = time() + settings.BLOCK_STRUCTURES_SETTINGS.get('COLLECTION_WAIT_TIMEOUT', 10)
+        while time() < deadline:
+            sleep(WAIT_FOR_COLLECTED_INTERVAL)
+            try:
+                return self._get_from_store()
+            except (BlockStructureNotFound, TransformerDataIncompatible):
+                pass
+
+        logger.warning(
+            "BlockStructure: Timed out waiting for collection by another worker; %s.", self.root_block_usage_key
+        )
+        return self._update_collected()
 
     @contextmanager
     def _bulk_operations(self):
@@ -146,3 +236,11 @@ class BlockStructureManager(object):
             course_key = None
         with self.modulestore.bulk_operations(course_key):
             yield
+
+
+def _collect_lock_timeout():
+    """
+    Returns the number of seconds after which an unreleased collection
+    lock expires.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('COLLECTION_LOCK_TIMEOUT', 300)
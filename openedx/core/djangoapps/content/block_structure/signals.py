@@ -24,7 +24,7 @@ def update_block_structure_on_course_publish(sender, course_key, **kwargs):  # p
         return
 
     if config.waffle().is_enabled(config.INVALIDATE_CACHE_ON_PUBLISH):
-        clear_course_from_cache(course_key)
+        clear_course_from_cache(course_key, keep_stale=True)
 
     update_course_in_cache_v2.apply_async(
         kwargs=dict(course_id=unicode(course_key)),
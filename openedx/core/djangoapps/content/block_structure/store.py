@@ -66,6 +66,13 @@ class BlockStructureStore(object):
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
 
+        if _is_serve_stale_enabled():
+            self._cache.set(
+                self._encode_stale_cache_key(block_structure.root_block_usage_key),
+                serialized_data,
+                timeout=config.cache_timeout_in_seconds(),
+            )
+
     def get(self, root_block_usage_key):
         """
         Deserializes and returns the block structure starting at
@@ -97,7 +104,29 @@ class BlockStructureStore(object):
 
         return self._deserialize(serialized_data, root_block_usage_key)
 
-    def delete(self, root_block_usage_key):
+    def get_stale(self, root_block_usage_key):
+        """
+        Deserializes and returns the most recently added block structure
+        starting at root_block_usage_key, even if it has since been
+        deleted with keep_stale.  Only available when the
+        serve_stale_while_revalidate switch is enabled.
+
+        Raises:
+            BlockStructureNotFound if no stale copy is cached.
+        """
+        if not _is_serve_stale_enabled():
+            raise BlockStructureNotFound(root_block_usage_key)
+
+        serialized_data = self._cache.get(self._encode_stale_cache_key(root_block_usage_key))
+        if not serialized_data:
+            raise BlockStructureNotFound(root_block_usage_key)
+
+        logger.info(
+            "BlockStructure: Read stale copy from cache; %s, size: %d", root_block_usage_key, len(serialized_data)
+        )
+        return self._deserialize(serialized_data, root_block_usage_key)
+
+    def delete(self, root_block_usage_key, keep_stale=False):
         """
         Deletes the block structure for the given root_block_usage_key
         from the cache and storage.
@@ -105,12 +134,34 @@ class BlockStructureStore(object):
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
                 of the block structure that is to be removed.
+
+            keep_stale (boolean) - Whether the stale copy of the block
+                structure is kept to be served until it is collected again.
         """
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
+        if not keep_stale:
+            self._cache.delete(self._encode_stale_cache_key(root_block_usage_key))
         bs_model.delete()
         logger.info("BlockStructure: Deleted from cache and store; %s.", bs_model)
 
+    def add_lock(self, root_block_usage_key, name, timeout):
+        """
+        Atomically adds the named lock for the given root_block_usage_key
+        to the cache, expiring after timeout seconds.
+
+        Returns:
+            Whether the lock was acquired, that is, whether it was not
+            already held.
+        """
+        return self._cache.add(self._encode_lock_cache_key(root_block_usage_key, name), True, timeout)
+
+    def delete_lock(self, root_block_usage_key, name):
+        """
+        Releases the named lock for the given root_block_usage_key.
+        """
+        self._cache.delete(self._encode_lock_cache_key(root_block_usage_key, name))
+
     def is_up_to_date(self, root_block_usage_key, modulestore):
         """
         Returns whether the data in storage for the given key is
@@ -227,6 +278,29 @@ class BlockStructureStore(object):
                 root_usage_key=unicode(bs_model.data_usage_key),
             )
 
+    @staticmethod
+    def _encode_stale_cache_key(root_block_usage_key):
+        """
+        Returns the cache key for the stale copy of the block structure
+        starting at the given root_block_usage_key.
+        """
+        return "v{version}.stale.root.key.{root_usage_key}".format(
+            version=unicode(BlockStructureBlockData.VERSION),
+            root_usage_key=unicode(root_block_usage_key),
+        )
+
+    @staticmethod
+    def _encode_lock_cache_key(root_block_usage_key, name):
+        """
+        Returns the cache key for the named lock of the block structure
+        starting at the given root_block_usage_key.
+        """
+        return "v{version}.{name}.lock.{root_usage_key}".format(
+            version=unicode(BlockStructureBlockData.VERSION),
+            name=name,
+            root_usage_key=unicode(root_block_usage_key),
+        )
+
     @staticmethod
     def _version_data_of_block(root_block):
         """
@@ -256,3 +330,11 @@ def _is_storage_backing_enabled():
     Returns whether storage backing for Block Structures is enabled.
     """
     return config.waffle().is_enabled(config.STORAGE_BACKING_FOR_CACHE)
+
+
+def _is_serve_stale_enabled():
+    """
+    Returns whether stale Block Structures may be served while they are
+    being re-collected.
+    """
+    return config.waffle().is_enabled(config.SERVE_STALE_WHILE_REVALIDATE)
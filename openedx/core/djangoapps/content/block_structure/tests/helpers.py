@@ -134,11 +134,22 @@ class MockCache(object):
         """
         return self.map.get(key, default)
 
+    def add(self, key, val, timeout):
+        """
+        Associates the given key with the given value in the cache, only
+        if the key is not already present.  Returns whether it was added.
+        """
+        if key in self.map:
+            return False
+        self.map[key] = val
+        self.timeout_from_last_call = timeout
+        return True
+
     def delete(self, key):
         """
-        Deletes the given key from the cache.
+        Deletes the given key from the cache, if present.
         """
-        del self.map[key]
+        self.map.pop(key, None)
 
 
 class MockModulestoreFactory(object):
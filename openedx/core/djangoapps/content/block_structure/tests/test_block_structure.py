@@ -7,6 +7,7 @@ from collections import namedtuple
 from copy import deepcopy
 import ddt
 import itertools
+import pickle
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
@@ -308,3 +309,42 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEquals(_get_value(block_structure), 'edit1')
         self.assertEquals(_get_value(new_copy), 'edit2')
+
+    def test_copy_on_write(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        for block_key in block_structure:
+            block_structure._get_or_create_block(block_key)
+        block_structure.set_transformer_block_field(1, 'transformer', 'test_key', 'original_value')
+        block_structure.override_xblock_field(2, 'test_field', 'original_value')
+
+        # block data is shared until modified
+        new_copy = block_structure.copy()
+        self.assertIs(block_structure[1], new_copy[1])
+        self.assertIs(block_structure[2], new_copy[2])
+
+        new_copy.override_xblock_field(2, 'test_field', 'edit')
+        self.assertIsNot(block_structure[2], new_copy[2])
+        self.assertEquals(block_structure.get_xblock_field(2, 'test_field'), 'original_value')
+        self.assertEquals(new_copy.get_xblock_field(2, 'test_field'), 'edit')
+
+        new_copy.remove_transformer_block_field(1, 'transformer', 'test_key')
+        self.assertIsNone(new_copy.get_transformer_block_field(1, 'transformer', 'test_key'))
+        self.assertEquals(
+            block_structure.get_transformer_block_field(1, 'transformer', 'test_key'),
+            'original_value',
+        )
+        self.assertIs(block_structure[3], new_copy[3])
+
+    def test_pickle_block_data(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        block_structure.set_transformer_block_field(1, 'transformer', 'test_key', 'test_value')
+        block_structure.override_xblock_field(1, 'test_field', 'test_value')
+
+        block_relations, block_data_map = pickle.loads(
+            pickle.dumps((block_structure._block_relations, block_structure._block_data_map), pickle.HIGHEST_PROTOCOL)
+        )
+        self.assertEquals(block_relations[0].children, block_structure.get_children(0))
+        self.assertEquals(block_relations[1].parents, block_structure.get_parents(1))
+        self.assertEquals(block_data_map[1].location, 1)
+        self.assertEquals(block_data_map[1].test_field, 'test_value')
+        self.assertEquals(block_data_map[1].transformer_data['transformer'].test_key, 'test_value')
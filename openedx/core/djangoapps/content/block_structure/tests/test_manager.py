@@ -2,13 +2,15 @@
 Tests for manager.py
 """
 import ddt
+from django.conf import settings
 from django.test import TestCase
+from mock import patch
 from nose.plugins.attrib import attr
 
 from ..block_structure import BlockStructureBlockData
-from ..config import RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import RAISE_ERROR_WHEN_NOT_FOUND, SERVE_STALE_WHILE_REVALIDATE, STORAGE_BACKING_FOR_CACHE, waffle
 from ..exceptions import UsageKeyNotInBlockStructure, BlockStructureNotFound
-from ..manager import BlockStructureManager
+from ..manager import BlockStructureManager, COLLECT_LOCK
 from ..transformers import BlockStructureTransformers
 from .helpers import (
     MockModulestoreFactory, MockCache, MockTransformer,
@@ -219,3 +221,42 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+    @patch('openedx.core.djangoapps.content.block_structure.manager.sleep')
+    def test_get_collected_waits_for_lock_holder(self, mock_sleep):
+        self.bs_manager.store.add_lock(self.block_key_factory(0), COLLECT_LOCK, 10)
+
+        # another worker holding the lock stores the collected structure while we wait
+        other_manager = BlockStructureManager(self.block_key_factory(0), self.modulestore, self.cache)
+        mock_sleep.side_effect = lambda _: other_manager._update_collected()  # pylint: disable=protected-access
+
+        self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
+        self.assertEquals(mock_sleep.call_count, 1)
+        self.assertEquals(TestTransformer1.collect_call_count, 1)
+
+    @patch.dict(settings.BLOCK_STRUCTURES_SETTINGS, {'COLLECTION_WAIT_TIMEOUT': 0})
+    def test_get_collected_lock_wait_timeout(self):
+        self.bs_manager.store.add_lock(self.block_key_factory(0), COLLECT_LOCK, 10)
+        self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
+        self.assertEquals(TestTransformer1.collect_call_count, 1)
+
+    def test_get_collected_releases_lock(self):
+        self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
+        self.assertTrue(self.bs_manager.store.add_lock(self.block_key_factory(0), COLLECT_LOCK, 10))
+
+    @ddt.data(True, False)
+    @patch('openedx.core.djangoapps.content.block_structure.tasks.update_course_in_cache_v2.apply_async')
+    def test_get_collected_stale(self, keep_stale, mock_update):
+        with waffle().override(SERVE_STALE_WHILE_REVALIDATE, active=True):
+            with mock_registered_transformers(self.registered_transformers):
+                self.bs_manager.get_collected()
+                self.bs_manager.clear(keep_stale=keep_stale)
+
+                # the stale copy is served until the enqueued task re-collects it
+                for _ in range(2):
+                    block_structure = self.bs_manager.get_collected()
+                    self.assert_block_structure(block_structure, self.children_map)
+                    TestTransformer1.assert_collected(block_structure)
+
+        self.assertEquals(mock_update.call_count, 1 if keep_stale else 0)
+        self.assertEquals(TestTransformer1.collect_call_count, 1 if keep_stale else 2)
@@ -7,7 +7,7 @@ from unittest import TestCase
 
 from ..block_structure import BlockStructureModulestoreData
 from ..exceptions import TransformerException, TransformerDataIncompatible
-from ..transformers import BlockStructureTransformers
+from ..transformers import BlockStructureTransformers, transformer_metric_name
 from .helpers import (
     ChildrenMapTestMixin, MockTransformer, MockFilteringTransformer, mock_registered_transformers
 )
@@ -71,6 +71,24 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
             self.transformers.transform(block_structure=MagicMock())
             self.assertTrue(mock_transform_call.called)
 
+    @patch('openedx.core.djangoapps.content.block_structure.transformers.monitoring_utils.accumulate')
+    def test_transform_metrics(self, mock_accumulate):
+        self.add_mock_transformer()
+        block_structure = self.create_block_structure(
+            self.SIMPLE_CHILDREN_MAP,
+            BlockStructureModulestoreData
+        )
+        self.transformers.transform(block_structure)
+
+        accumulated = {call[0][0]: call[0][1] for call in mock_accumulate.call_args_list}
+        for step_name in ('MockTransformer', 'MockFilteringTransformer', 'filters'):
+            self.assertIn(transformer_metric_name('transform', step_name, 'duration_ms'), accumulated)
+            self.assertEquals(
+                accumulated[transformer_metric_name('transform', step_name, 'num_blocks')],
+                len(self.SIMPLE_CHILDREN_MAP),
+            )
+            self.assertEquals(accumulated[transformer_metric_name('transform', step_name, 'num_blocks_removed')], 0)
+
     def test_verify_versions(self):
         block_structure = self.create_block_structure(
             self.SIMPLE_CHILDREN_MAP,
@@ -2,7 +2,11 @@
 Module for a collection of BlockStructureTransformers.
 """
 import functools
+from contextlib import contextmanager
 from logging import getLogger
+from time import time
+
+from openedx.core.djangoapps import monitoring_utils
 
 from .exceptions import TransformerException, TransformerDataIncompatible
 from .transformer import FilteringTransformerMixin
@@ -11,6 +15,39 @@ from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
+METRICS_PREFIX = u'block_structure'
+
+
+def transformer_metric_name(phase, step_name, measure):
+    """
+    Returns the name of the monitoring custom metric in which the given
+    measure for a collect or transform step is accumulated.  For example:
+    'block_structure.transform.visibility.duration_ms'.
+    """
+    return u'.'.join([METRICS_PREFIX, phase, step_name, measure])
+
+
+@contextmanager
+def _transformer_metrics(phase, step_name, block_structure):
+    """
+    Traces the wrapped collect or transform step and accumulates its
+    duration and the number of blocks it saw and removed into the
+    monitoring custom metrics for the current request.
+    """
+    num_blocks_before = len(block_structure)
+    start_time = time()
+    with monitoring_utils.function_trace(u'.'.join([METRICS_PREFIX, phase, step_name])):
+        yield
+    duration_ms = (time() - start_time) * 1000
+    num_blocks_after = len(block_structure)
+
+    monitoring_utils.accumulate(transformer_metric_name(phase, step_name, u'duration_ms'), duration_ms)
+    monitoring_utils.accumulate(transformer_metric_name(phase, step_name, u'num_blocks'), num_blocks_before)
+    monitoring_utils.accumulate(
+        transformer_metric_name(phase, step_name, u'num_blocks_removed'),
+        max(num_blocks_before - num_blocks_after, 0),
+    )
+
 
 class BlockStructureTransformers(object):
     """
@@ -22,6 +59,12 @@ class BlockStructureTransformers(object):
 
     Clients are expected to access the list of transformers through the
     class' interface rather than directly.
+
+    The duration of each transformer's collect and transform steps, along
+    with the number of blocks it was given and removed, is reported through
+    monitoring_utils under 'block_structure.<phase>.<transformer name>'.
+    Filtering transformers additionally report the combined traversal under
+    'block_structure.transform.filters'.
     """
     def __init__(self, transformers=None, usage_info=None):
         """
@@ -77,7 +120,8 @@ class BlockStructureTransformers(object):
         """
         for transformer in TransformerRegistry.get_registered_transformers():
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
-            transformer.collect(block_structure)
+            with _transformer_metrics(u'collect', transformer.name(), block_structure):
+                transformer.collect(block_structure)
 
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
@@ -128,14 +172,16 @@ class BlockStructureTransformers(object):
 
         filters = []
         for transformer in self._transformers['supports_filter']:
-            filters.extend(transformer.transform_block_filters(self.usage_info, block_structure))
+            with _transformer_metrics(u'transform', transformer.name(), block_structure):
+                filters.extend(transformer.transform_block_filters(self.usage_info, block_structure))
 
         combined_filters = functools.reduce(
             self._filter_chain,
             filters,
             block_structure.create_universal_filter()
         )
-        block_structure.filter_topological_traversal(combined_filters)
+        with _transformer_metrics(u'transform', u'filters', block_structure):
+            block_structure.filter_topological_traversal(combined_filters)
 
     def _filter_chain(self, accumulated, additional):
         """
@@ -150,4 +196,5 @@ class BlockStructureTransformers(object):
         method from the given transformers.
         """
         for transformer in self._transformers['no_filter']:
-            transformer.transform(self.usage_info, block_structure)
+            with _transformer_metrics(u'transform', transformer.name(), block_structure):
+                transformer.transform(self.usage_info, block_structure)
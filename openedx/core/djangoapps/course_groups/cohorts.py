@@ -4,21 +4,26 @@ forums, and to the cohort admin views.
 """
 
 import logging
+import operator
 import random
+from collections import OrderedDict, defaultdict
 
 from courseware import courses
+from django.apps import apps
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import IntegrityError, transaction
-from django.db.models.signals import m2m_changed, post_save
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import ugettext as _
 from eventtracking import tracker
 from openedx.core.djangoapps.request_cache import clear_cache, get_cache
 from openedx.core.djangoapps.request_cache.middleware import request_cached
-from student.models import get_user_by_username_or_email
+from student.models import get_user_by_username_or_email, strip_if_string
 
 from .models import (
     CohortMembership,
@@ -86,6 +91,19 @@ def _cohort_membership_changed(sender, **kwargs):
         tracker.emit(event_name, event)
 
 
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def _cohort_membership_saved_or_deleted(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidates the user's cohort membership index chunk each time a membership is modified"""
+    invalidate_cohort_membership_index(instance.course_id, instance.user_id)
+
+
+@receiver(COHORT_MEMBERSHIP_UPDATED)
+def _cohort_membership_updated(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """Invalidates the user's cohort membership index chunk each time cohort membership is updated"""
+    invalidate_cohort_membership_index(course_key, user.id)
+
+
 # A 'default cohort' is an auto-cohort that is automatically created for a course if no cohort with automatic
 # assignment have been specified. It is intended to be used in a cohorted course for users who have yet to be assigned
 # to a cohort, if the course staff have not explicitly created a cohort of type "RANDOM".
@@ -176,22 +194,120 @@ def bulk_cache_cohorts(course_key, users):
     # before populating the cache with another bulk set of data,
     # remove previously cached entries to keep memory usage low.
     clear_cache(COHORT_CACHE_NAMESPACE)
-    cache = get_cache(COHORT_CACHE_NAMESPACE)
+    cohort_cache = get_cache(COHORT_CACHE_NAMESPACE)
 
-    if is_course_cohorted(course_key):
-        cohorts_by_user = {
-            membership.user: membership
-            for membership in
-            CohortMembership.objects.filter(user__in=users, course_id=course_key).select_related('user')
-        }
-        for user, membership in cohorts_by_user.iteritems():
-            cache[_cohort_cache_key(user.id, course_key)] = membership.course_user_group
-        uncohorted_users = filter(lambda u: u not in cohorts_by_user, users)
-    else:
-        uncohorted_users = users
+    cohort_ids = get_cohort_ids_for_users(course_key, [user.id for user in users])
+    cohorts_by_id = CourseUserGroup.objects.in_bulk(
+        {cohort_id for cohort_id in cohort_ids.itervalues() if cohort_id is not None}
+    )
+    for user in users:
+        cohort_cache[_cohort_cache_key(user.id, course_key)] = cohorts_by_id.get(cohort_ids[user.id])
+
+
+COHORT_MEMBERSHIP_INDEX_NAMESPACE = u"cohorts.membership_index"
+COHORT_MEMBERSHIP_INDEX_TIMEOUT = 24 * 60 * 60
+# The membership index of a course is cached in chunks of consecutive user ids, so
+# that each cached value stays well below memcached's 1MB limit in any course.
+COHORT_MEMBERSHIP_INDEX_CHUNK_SIZE = 10000
+
+
+def _cohort_membership_index_chunk(user_id):
+    """
+    Returns the cohort membership index chunk that holds the given user_id.
+    """
+    return user_id // COHORT_MEMBERSHIP_INDEX_CHUNK_SIZE
+
+
+def _cohort_membership_index_cache_key(course_key, chunk):
+    """
+    Returns the cache key for the given chunk of the cohort membership index of the given course_key.
+    """
+    return u"{}.{}.{}".format(COHORT_MEMBERSHIP_INDEX_NAMESPACE, course_key, chunk)
+
+
+def _get_cohort_membership_index_chunks(course_key, chunks):
+    """
+    Returns a dict mapping each of the given chunks of the course's cohort
+    membership index to a dict that maps the ids of the chunk's users who are
+    assigned to a cohort to their cohort ids.
+
+    Chunks are memoized for the duration of the request and shared across
+    processes through the django cache. All the chunks missing from both
+    are loaded with a single query.
+    """
+    request_cache = get_cache(COHORT_MEMBERSHIP_INDEX_NAMESPACE)
+    cache_keys = {chunk: _cohort_membership_index_cache_key(course_key, chunk) for chunk in chunks}
+    index_chunks = {
+        chunk: request_cache[cache_key] for chunk, cache_key in cache_keys.iteritems() if cache_key in request_cache
+    }
+
+    missing_chunks = set(cache_keys) - set(index_chunks)
+    if missing_chunks:
+        cached_chunks = cache.get_many([cache_keys[chunk] for chunk in missing_chunks])
+        for chunk in missing_chunks:
+            if cache_keys[chunk] in cached_chunks:
+                index_chunks[chunk] = cached_chunks[cache_keys[chunk]]
+        missing_chunks -= set(index_chunks)
+
+    if missing_chunks:
+        loaded_chunks = {chunk: {} for chunk in missing_chunks}
+        user_id_ranges = reduce(operator.or_, (
+            Q(
+                user_id__gte=chunk * COHORT_MEMBERSHIP_INDEX_CHUNK_SIZE,
+                user_id__lt=(chunk + 1) * COHORT_MEMBERSHIP_INDEX_CHUNK_SIZE,
+            )
+            for chunk in missing_chunks
+        ))
+        memberships = CohortMembership.objects.filter(user_id_ranges, course_id=course_key).values_list(
+            'user_id', 'course_user_group_id'
+        )
+        for user_id, cohort_id in memberships:
+            loaded_chunks[_cohort_membership_index_chunk(user_id)][user_id] = cohort_id
+        cache.set_many(
+            {cache_keys[chunk]: index_chunk for chunk, index_chunk in loaded_chunks.iteritems()},
+            COHORT_MEMBERSHIP_INDEX_TIMEOUT
+        )
+        index_chunks.update(loaded_chunks)
+
+    for chunk, index_chunk in index_chunks.iteritems():
+        request_cache[cache_keys[chunk]] = index_chunk
+    return index_chunks
 
-    for user in uncohorted_users:
-        cache[_cohort_cache_key(user.id, course_key)] = None
+
+def invalidate_cohort_membership_index(course_key, user_id):
+    """
+    Removes the cohort membership index chunk of the given course_key that
+    holds the given user_id from the request cache and the django cache.
+
+    The chunk is removed from the django cache again once the current
+    transaction commits, so that a concurrent request can not cache the
+    memberships it read before the commit.
+    """
+    cache_key = _cohort_membership_index_cache_key(course_key, _cohort_membership_index_chunk(user_id))
+    get_cache(COHORT_MEMBERSHIP_INDEX_NAMESPACE).pop(cache_key, None)
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+def get_cohort_ids_for_users(course_key, user_ids):
+    """
+    Returns a dict that maps each of the given user ids to the id of the
+    cohort that user is assigned to in the given course, or None if they
+    don't have one or the course is not cohorted.
+
+    The cohorts are read from the course's cohort membership index, so
+    looking up many users costs at most one query. Users are never
+    assigned to a cohort as a side effect of this call.
+    """
+    if not is_course_cohorted(course_key):
+        return dict.fromkeys(user_ids)
+    index_chunks = _get_cohort_membership_index_chunks(
+        course_key, {_cohort_membership_index_chunk(user_id) for user_id in user_ids}
+    )
+    return {
+        user_id: index_chunks[_cohort_membership_index_chunk(user_id)].get(user_id)
+        for user_id in user_ids
+    }
 
 
 def get_cohort(user, course_key, assign=True, use_cached=False):
@@ -215,18 +331,18 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
     Raises:
        ValueError if the CourseKey doesn't exist.
     """
-    cache = get_cache(COHORT_CACHE_NAMESPACE)
+    cohort_cache = get_cache(COHORT_CACHE_NAMESPACE)
     cache_key = _cohort_cache_key(user.id, course_key)
 
-    if use_cached and cache_key in cache:
-        return cache[cache_key]
+    if use_cached and cache_key in cohort_cache:
+        return cohort_cache[cache_key]
 
-    cache.pop(cache_key, None)
+    cohort_cache.pop(cache_key, None)
 
     # First check whether the course is cohorted (users shouldn't be in a cohort
     # in non-cohorted courses, but settings can change after course starts)
     if not is_course_cohorted(course_key):
-        return cache.setdefault(cache_key, None)
+        return cohort_cache.setdefault(cache_key, None)
 
     # If course is cohorted, check if the user already has a cohort.
     try:
@@ -234,7 +350,7 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
             course_id=course_key,
             user_id=user.id,
         )
-        return cache.setdefault(cache_key, membership.course_user_group)
+        return cohort_cache.setdefault(cache_key, membership.course_user_group)
     except CohortMembership.DoesNotExist:
         # Didn't find the group. If we do not want to assign, return here.
         if not assign:
@@ -261,7 +377,7 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
                 course_user_group=course_user_group,
             )
 
-            return cache.setdefault(cache_key, membership.course_user_group)
+            return cohort_cache.setdefault(cache_key, membership.course_user_group)
     except IntegrityError as integrity_error:
         # An IntegrityError is raised when multiple workers attempt to
         # create the same row in one of the cohort model entries:
@@ -502,6 +618,271 @@ def add_user_to_cohort(cohort, username_or_email):
                 raise ex
 
 
+# Results of the assignments of add_users_to_cohorts.
+COHORT_ASSIGNMENT_ADDED = 'added'
+COHORT_ASSIGNMENT_PREASSIGNED = 'preassigned'
+COHORT_ASSIGNMENT_ALREADY_PRESENT = 'already_present'
+COHORT_ASSIGNMENT_USER_NOT_FOUND = 'user_not_found'
+COHORT_ASSIGNMENT_INVALID_EMAIL = 'invalid_email'
+
+# Number of values passed to each IN query of add_users_to_cohorts.
+BULK_COHORT_QUERY_CHUNK_SIZE = 1000
+# Number of times add_users_to_cohorts computes and saves the changes when
+# concurrent requests modify the memberships of its users.
+BULK_COHORT_ASSIGNMENT_ATTEMPTS = 3
+
+
+def _chunks(items, chunk_size=BULK_COHORT_QUERY_CHUNK_SIZE):
+    """
+    Yields the values from items in chunks of size chunk_size.
+    """
+    items = list(items)
+    return (items[index:index + chunk_size] for index in xrange(0, len(items), chunk_size))
+
+
+def _get_users_by_username_or_email(usernames_or_emails):
+    """
+    Returns a dict that maps each of the given usernames or emails to its
+    user, looking them up like get_user_by_username_or_email does.  Values
+    that match no user, more than one user, or a user who requested
+    retirement by username are left out.
+    """
+    UserRetirementRequest = apps.get_model('user_api', 'UserRetirementRequest')  # pylint: disable=invalid-name
+
+    matches = {}
+    for chunk in _chunks(usernames_or_emails):
+        for user in User.objects.filter(Q(email__in=chunk) | Q(username__in=chunk)):
+            for key in {user.email.lower(), user.username.lower()}:
+                matches.setdefault(key, {})[user.id] = user
+
+    users = {}
+    for username_or_email in usernames_or_emails:
+        matching_users = matches.get(username_or_email.lower(), {}).values()
+        if len(matching_users) == 1:
+            users[username_or_email] = matching_users[0]
+
+    retired_user_ids = set()
+    for chunk in _chunks({user.id for username, user in users.iteritems() if user.username == username}):
+        retired_user_ids.update(
+            UserRetirementRequest.objects.filter(user_id__in=chunk).values_list('user_id', flat=True)
+        )
+    return {
+        username_or_email: user for username_or_email, user in users.iteritems()
+        if not (user.username == username_or_email and user.id in retired_user_ids)
+    }
+
+
+def add_users_to_cohorts(assignments):
+    """
+    Adds users to cohorts of a course in bulk.
+
+    The (cohort, username_or_email) assignments are applied in turn with the
+    same outcome as calling add_user_to_cohort for each of them, but the
+    users and their current cohorts are looked up with a few IN queries,
+    the membership changes are written with bulk inserts, updates and
+    deletes in a single transaction, and the tracking events and
+    COHORT_MEMBERSHIP_UPDATED signals are sent once the changes are saved.
+
+    The current memberships of the users are locked while the changes are
+    written. If a concurrent request, such as get_cohort assigning a cohort
+    to one of the users, creates a membership after they were read, the
+    changes are computed again from the current memberships.
+
+    Arguments:
+        assignments: list of (CourseUserGroup, string) tuples, all for
+            cohorts of the same course.  Strings are treated as emails if
+            they have an '@'.
+
+    Returns:
+        A list with the result of each assignment, one of the
+        COHORT_ASSIGNMENT_* values.
+    """
+    if not assignments:
+        return []
+    course_key = assignments[0][0].course_id
+
+    usernames_or_emails = [strip_if_string(username_or_email) for __, username_or_email in assignments]
+    users = _get_users_by_username_or_email(set(usernames_or_emails))
+
+    for attempt in range(1, BULK_COHORT_ASSIGNMENT_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                initial_cohort_ids = {}
+                for chunk in _chunks({user.id for user in users.itervalues()}):
+                    initial_cohort_ids.update(CohortMembership.objects.select_for_update().filter(
+                        course_id=course_key, user_id__in=chunk,
+                    ).values_list('user_id', 'course_user_group_id'))
+
+                results, added, preassigned, cohort_ids = _apply_cohort_assignments(
+                    assignments, usernames_or_emails, users, initial_cohort_ids
+                )
+                moved_user_ids = {
+                    user_id for user_id, cohort_id in cohort_ids.iteritems()
+                    if cohort_id != initial_cohort_ids.get(user_id)
+                }
+                _save_cohort_memberships(course_key, cohort_ids, initial_cohort_ids, moved_user_ids)
+                _save_unregistered_learner_assignments(course_key, preassigned)
+            break
+        except IntegrityError:
+            if attempt == BULK_COHORT_ASSIGNMENT_ATTEMPTS:
+                raise
+            log.info(
+                "Cohort memberships of course %s changed while adding users to cohorts, retrying.", course_key
+            )
+
+    _emit_cohort_assignment_events(added, preassigned)
+    for user, __, __ in added:
+        if user.id in moved_user_ids:
+            moved_user_ids.remove(user.id)
+            COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=user, course_key=course_key)
+    return results
+
+
+def _apply_cohort_assignments(assignments, usernames_or_emails, users, initial_cohort_ids):
+    """
+    Applies the given assignments in turn to the users' cohort ids.
+
+    Returns:
+        A (results, added, preassigned, cohort_ids) tuple, holding the
+        result of each assignment, the (user, cohort, previous cohort id)
+        tuples of the users that were added to a cohort, the cohorts of the
+        preassigned emails and the resulting cohort ids of the users.
+    """
+    cohort_ids = dict(initial_cohort_ids)
+    results = []
+    added = []
+    preassigned = OrderedDict()
+    for (cohort, username_or_email), stripped_username_or_email in zip(assignments, usernames_or_emails):
+        user = users.get(stripped_username_or_email)
+        if user is not None:
+            if cohort_ids.get(user.id) == cohort.id:
+                results.append(COHORT_ASSIGNMENT_ALREADY_PRESENT)
+            else:
+                added.append((user, cohort, cohort_ids.get(user.id)))
+                cohort_ids[user.id] = cohort.id
+                results.append(COHORT_ASSIGNMENT_ADDED)
+            continue
+
+        try:
+            validate_email(username_or_email)
+        except ValidationError:
+            results.append(
+                COHORT_ASSIGNMENT_INVALID_EMAIL if '@' in username_or_email else COHORT_ASSIGNMENT_USER_NOT_FOUND
+            )
+            continue
+        preassigned[username_or_email] = cohort
+        results.append(COHORT_ASSIGNMENT_PREASSIGNED)
+    return results, added, preassigned, cohort_ids
+
+
+def _save_cohort_memberships(course_key, cohort_ids, initial_cohort_ids, moved_user_ids):
+    """
+    Moves the given users to the cohorts in cohort_ids, updating both the
+    CohortMembership rows and the users of the CourseUserGroups.
+    """
+    UserGroup = CourseUserGroup.users.through  # pylint: disable=invalid-name
+
+    for chunk in _chunks(moved_user_ids):
+        UserGroup.objects.filter(
+            user_id__in=chunk,
+            courseusergroup__course_id=course_key,
+            courseusergroup__group_type=CourseUserGroup.COHORT,
+        ).delete()
+
+    existing_user_ids_by_cohort = defaultdict(list)
+    new_memberships = []
+    for user_id in moved_user_ids:
+        if user_id in initial_cohort_ids:
+            existing_user_ids_by_cohort[cohort_ids[user_id]].append(user_id)
+        else:
+            new_memberships.append(
+                CohortMembership(course_user_group_id=cohort_ids[user_id], user_id=user_id, course_id=course_key)
+            )
+    for cohort_id, user_ids in existing_user_ids_by_cohort.iteritems():
+        for chunk in _chunks(user_ids):
+            CohortMembership.objects.filter(
+                course_id=course_key, user_id__in=chunk,
+            ).update(course_user_group_id=cohort_id)
+    CohortMembership.objects.bulk_create(new_memberships, batch_size=BULK_COHORT_QUERY_CHUNK_SIZE)
+
+    UserGroup.objects.bulk_create(
+        [UserGroup(courseusergroup_id=cohort_ids[user_id], user_id=user_id) for user_id in moved_user_ids],
+        batch_size=BULK_COHORT_QUERY_CHUNK_SIZE,
+    )
+
+
+def _save_unregistered_learner_assignments(course_key, preassigned):
+    """
+    Saves the assignments of the given emails to cohorts, for when the
+    learners register.
+    """
+    existing_emails = set()
+    for chunk in _chunks(preassigned):
+        existing_emails.update(UnregisteredLearnerCohortAssignments.objects.filter(
+            course_id=course_key, email__in=chunk,
+        ).values_list('email', flat=True))
+
+    existing_emails_by_cohort = defaultdict(list)
+    new_assignments = []
+    for email, cohort in preassigned.iteritems():
+        if email in existing_emails:
+            existing_emails_by_cohort[cohort.id].append(email)
+        else:
+            new_assignments.append(
+                UnregisteredLearnerCohortAssignments(course_user_group=cohort, email=email, course_id=course_key)
+            )
+    for cohort_id, emails in existing_emails_by_cohort.iteritems():
+        for chunk in _chunks(emails):
+            UnregisteredLearnerCohortAssignments.objects.filter(
+                course_id=course_key, email__in=chunk,
+            ).update(course_user_group_id=cohort_id)
+    UnregisteredLearnerCohortAssignments.objects.bulk_create(
+        new_assignments, batch_size=BULK_COHORT_QUERY_CHUNK_SIZE,
+    )
+
+
+def _emit_cohort_assignment_events(added, preassigned):
+    """
+    Emits the tracking events that add_user_to_cohort emits, and that the
+    membership changes emit through the m2m_changed signal, for the given
+    additions and preassignments.
+    """
+    previous_cohorts = CourseUserGroup.objects.in_bulk(
+        {previous_cohort_id for __, __, previous_cohort_id in added if previous_cohort_id is not None}
+    )
+    for user, cohort, previous_cohort_id in added:
+        previous_cohort = previous_cohorts.get(previous_cohort_id)
+        if previous_cohort is not None:
+            tracker.emit(
+                "edx.cohort.user_removed",
+                {"cohort_id": previous_cohort.id, "cohort_name": previous_cohort.name, "user_id": user.id}
+            )
+        tracker.emit(
+            "edx.cohort.user_added",
+            {"cohort_id": cohort.id, "cohort_name": cohort.name, "user_id": user.id}
+        )
+        tracker.emit(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": user.id,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+                "previous_cohort_id": previous_cohort_id,
+                "previous_cohort_name": previous_cohort.name if previous_cohort is not None else None,
+            }
+        )
+
+    for email, cohort in preassigned.iteritems():
+        tracker.emit(
+            "edx.cohort.email_address_preassigned",
+            {
+                "user_email": email,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+            }
+        )
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
@@ -514,21 +895,21 @@ def get_group_info_for_cohort(cohort, use_cached=False):
     use_cached=True to use the cached value instead of fetching from the
     database.
     """
-    cache = get_cache(u"cohorts.get_group_info_for_cohort")
+    group_info_cache = get_cache(u"cohorts.get_group_info_for_cohort")
     cache_key = unicode(cohort.id)
 
-    if use_cached and cache_key in cache:
-        return cache[cache_key]
+    if use_cached and cache_key in group_info_cache:
+        return group_info_cache[cache_key]
 
-    cache.pop(cache_key, None)
+    group_info_cache.pop(cache_key, None)
 
     try:
         partition_group = CourseUserGroupPartitionGroup.objects.get(course_user_group=cohort)
-        return cache.setdefault(cache_key, (partition_group.group_id, partition_group.partition_id))
+        return group_info_cache.setdefault(cache_key, (partition_group.group_id, partition_group.partition_id))
     except CourseUserGroupPartitionGroup.DoesNotExist:
         pass
 
-    return cache.setdefault(cache_key, (None, None))
+    return group_info_cache.setdefault(cache_key, (None, None))
 
 
 def set_assignment_type(user_group, assignment_type):
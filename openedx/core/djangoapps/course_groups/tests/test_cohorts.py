@@ -23,7 +23,7 @@ from xmodule.modulestore.tests.factories import ToyCourseFactory
 
 from .. import cohorts
 from ..models import (
-    CourseCohort, CourseUserGroup, CourseUserGroupPartitionGroup,
+    CohortMembership, CourseCohort, CourseUserGroup, CourseUserGroupPartitionGroup,
     UnregisteredLearnerCohortAssignments
 )
 from ..tests.helpers import CohortFactory, CourseCohortFactory, config_course_cohorts, config_course_cohorts_legacy
@@ -678,6 +678,118 @@ class TestCohorts(ModuleStoreTestCase):
             lambda: cohorts.add_user_to_cohort(first_cohort, "non_existent_username")
         )
 
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    @patch("openedx.core.djangoapps.course_groups.cohorts.COHORT_MEMBERSHIP_UPDATED")
+    def test_add_users_to_cohorts(self, mock_signal, mock_tracker):
+        """
+        Make sure cohorts.add_users_to_cohorts() has the outcome of adding
+        each user with cohorts.add_user_to_cohort().
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        moved_user = UserFactory(username="moved", email="moved@example.com")
+        kept_user = UserFactory(username="kept", email="kept@example.com")
+        new_user = UserFactory(username="new", email="new@example.com")
+        for user in (moved_user, kept_user, new_user):
+            CourseEnrollment.enroll(user, self.toy_course_key)
+        cohorts.add_user_to_cohort(first_cohort, "moved")
+        cohorts.add_user_to_cohort(second_cohort, "kept")
+        mock_signal.reset_mock()
+        mock_tracker.reset_mock()
+
+        results = cohorts.add_users_to_cohorts([
+            (second_cohort, "moved"),
+            (second_cohort, " kept@example.com"),
+            (first_cohort, "new@example.com"),
+            (second_cohort, "new"),
+            (first_cohort, "unregistered@example.com"),
+            (first_cohort, "non_existent_username"),
+            (first_cohort, "invalid@email@example.com"),
+        ])
+
+        self.assertEqual(results, [
+            cohorts.COHORT_ASSIGNMENT_ADDED,
+            cohorts.COHORT_ASSIGNMENT_ALREADY_PRESENT,
+            cohorts.COHORT_ASSIGNMENT_ADDED,
+            cohorts.COHORT_ASSIGNMENT_ADDED,
+            cohorts.COHORT_ASSIGNMENT_PREASSIGNED,
+            cohorts.COHORT_ASSIGNMENT_USER_NOT_FOUND,
+            cohorts.COHORT_ASSIGNMENT_INVALID_EMAIL,
+        ])
+        for user, cohort in ((moved_user, second_cohort), (kept_user, second_cohort), (new_user, second_cohort)):
+            self.assertEqual(
+                CohortMembership.objects.get(user=user, course_id=self.toy_course_key).course_user_group, cohort
+            )
+        self.assertEqual(list(first_cohort.users.all()), [])
+        self.assertEqual(set(second_cohort.users.all()), {moved_user, kept_user, new_user})
+        self.assertEqual(
+            UnregisteredLearnerCohortAssignments.objects.get(email="unregistered@example.com").course_user_group,
+            first_cohort
+        )
+
+        self.assertItemsEqual(
+            mock_signal.send.call_args_list,
+            [
+                call(sender=None, user=moved_user, course_key=self.toy_course_key),
+                call(sender=None, user=new_user, course_key=self.toy_course_key),
+            ]
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": new_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.email_address_preassigned",
+            {
+                "user_email": "unregistered@example.com",
+                "cohort_id": first_cohort.id,
+                "cohort_name": first_cohort.name,
+            }
+        )
+
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_add_users_to_cohorts_integrity_error(self, mock_tracker):
+        """
+        Make sure cohorts.add_users_to_cohorts() computes and saves the changes again when
+        a concurrent request creates one of the memberships it is about to create.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        cohort = CohortFactory(course_id=course.id, name="Cohort")
+        user = UserFactory(username="user", email="user@example.com")
+        CourseEnrollment.enroll(user, self.toy_course_key)
+        save_cohort_memberships = cohorts._save_cohort_memberships  # pylint: disable=protected-access
+        mock_tracker.reset_mock()
+        attempts = []
+
+        def save_after_conflict(*args):
+            """Fails like a conflicting insert on the first attempt only."""
+            attempts.append(args)
+            if len(attempts) == 1:
+                raise IntegrityError
+            return save_cohort_memberships(*args)
+
+        with patch(
+            "openedx.core.djangoapps.course_groups.cohorts._save_cohort_memberships",
+            side_effect=save_after_conflict,
+        ):
+            results = cohorts.add_users_to_cohorts([(cohort, "user")])
+
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(results, [cohorts.COHORT_ASSIGNMENT_ADDED])
+        self.assertEqual(
+            CohortMembership.objects.get(user=user, course_id=self.toy_course_key).course_user_group, cohort
+        )
+        self.assertEqual(
+            [args[0] for args, __ in mock_tracker.emit.call_args_list].count("edx.cohort.user_add_requested"), 1
+        )
+
     @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
     def add_user_to_cohorts_race_condition(self, mock_tracker):
         """
@@ -728,6 +840,65 @@ class TestCohorts(ModuleStoreTestCase):
 
         self.assertEqual("Cohorted must be a boolean", text_type(value_error.exception))
 
+    def test_get_cohort_ids_for_users(self):
+        """
+        Make sure cohorts.get_cohort_ids_for_users() maps users to their cohorts, and is kept
+        up to date when memberships change.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        user1 = UserFactory(username="test", email="a@b.com")
+        user2 = UserFactory(username="test2", email="a2@b.com")
+        user3 = UserFactory(username="test3", email="a3@b.com")
+        cohort1 = CohortFactory(course_id=course.id, name="TestCohort1", users=[user1])
+        cohort2 = CohortFactory(course_id=course.id, name="TestCohort2", users=[user2])
+        user_ids = [user1.id, user2.id, user3.id]
+
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, user_ids),
+            {user1.id: cohort1.id, user2.id: cohort2.id, user3.id: None}
+        )
+        with self.assertNumQueries(0):
+            cohorts.get_cohort_ids_for_users(course.id, user_ids)
+
+        cohorts.add_user_to_cohort(cohort1, user2.username)
+        cohorts.remove_user_from_cohort(cohort1, user1.username)
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, user_ids),
+            {user1.id: None, user2.id: cohort1.id, user3.id: None}
+        )
+
+        config_course_cohorts(course, is_cohorted=False)
+        self.assertEqual(
+            cohorts.get_cohort_ids_for_users(course.id, [user2.id]),
+            {user2.id: None}
+        )
+
+    @patch('openedx.core.djangoapps.course_groups.cohorts.COHORT_MEMBERSHIP_INDEX_CHUNK_SIZE', 1)
+    def test_get_cohort_ids_for_users_in_several_chunks(self):
+        """
+        Make sure cohorts.get_cohort_ids_for_users() loads all the missing chunks of the
+        membership index with one query, and only invalidates the chunk of a modified membership.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        users = [UserFactory() for _ in range(3)]
+        cohort = CohortFactory(course_id=course.id, users=users[:2])
+        user_ids = [user.id for user in users]
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                cohorts.get_cohort_ids_for_users(course.id, user_ids),
+                {users[0].id: cohort.id, users[1].id: cohort.id, users[2].id: None}
+            )
+
+        cohorts.remove_user_from_cohort(cohort, users[0].username)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                cohorts.get_cohort_ids_for_users(course.id, user_ids),
+                {users[0].id: None, users[1].id: cohort.id, users[2].id: None}
+            )
+
 
 @attr(shard=2)
 @ddt.ddt
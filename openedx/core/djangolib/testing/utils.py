@@ -20,6 +20,7 @@ from django.db import DEFAULT_DB_ALIAS, connections
 from django.test import RequestFactory, TestCase, override_settings
 from django.test.utils import CaptureQueriesContext
 from openedx.core.djangoapps.request_cache.middleware import RequestCache
+from openedx.core.lib.cache_utils import LRUCache
 
 
 class CacheIsolationMixin(object):
@@ -120,6 +121,9 @@ class CacheIsolationMixin(object):
 
         RequestCache.clear_request_cache()
 
+        # Process-level caches may hold data about rows of earlier tests.
+        LRUCache.clear_all()
+
 
 class CacheIsolationTestCase(CacheIsolationMixin, TestCase):
     """
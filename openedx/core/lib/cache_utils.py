@@ -4,6 +4,8 @@ Utilities related to caching.
 import collections
 import cPickle as pickle
 import functools
+import threading
+import weakref
 import zlib
 
 from xblock.core import XBlock
@@ -84,6 +86,62 @@ class memoized(object):  # pylint: disable=invalid-name
         return functools.partial(self.__call__, obj)
 
 
+class LRUCache(object):
+    """
+    A thread-safe mapping holding at most `maxsize` entries, which evicts
+    the least recently used entry when full.
+    """
+    # Every instance, so that tests can clear all of them.
+    _instances = weakref.WeakSet()
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        LRUCache._instances.add(self)
+
+    @classmethod
+    def clear_all(cls):
+        """
+        Removes all entries of every instance.
+        """
+        for instance in list(cls._instances):
+            instance.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for the key, or the default if there is none.
+        """
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                return default
+            self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Stores the value for the key, evicting the least recently used entry
+        if the cache is full.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+            self._entries[key] = value
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
 def hashvalue(arg):
     """
     If arg is an xblock, use its location. otherwise just turn it into a string